@@ -0,0 +1,58 @@
+"""
+Latência da busca de jogadores por nome.
+
+Monta o índice sobre N nomes sintéticos (com acentos) e mede o tempo médio por
+consulta para buscas por prefixo, substring e com erro de digitação.
+
+Uso:
+    python -m benchmarks.bench_search --players 11000 110000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.search import PlayerSearchIndex
+
+SILABAS = ["ba", "ro", "mü", "ler", "san", "tos", "gi", "ova", "ni", "ço", "dé", "ka",
+           "lo", "pe", "zi", "ña", "vic", "ha", "el", "jo", "ma", "ri", "an", "ton"]
+
+CONSULTAS = ["mu", "muller", "santos", "anto", "rovic", "ronald", "sanots", "gionva", "ka lo"]
+
+
+def synthetic_players(n, seed=0):
+    rng = np.random.default_rng(seed)
+    partes = rng.choice(SILABAS, size=(n, 5))
+    tamanhos = rng.integers(2, 4, size=(n, 2))
+    nomes = [
+        f"{''.join(p[:a]).capitalize()} {''.join(p[a:a + b]).capitalize()}"
+        for p, (a, b) in zip(partes, tamanhos)
+    ]
+    return pd.DataFrame({"player_api_id": np.arange(n), "player_name": nomes})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, nargs="+", default=[11000, 110000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for n in args.players:
+        players = synthetic_players(n)
+        inicio = time.perf_counter()
+        index = PlayerSearchIndex(players)
+        construcao = time.perf_counter() - inicio
+
+        print(f"{n} jogadores (índice construído em {construcao:.2f}s)")
+        for consulta in CONSULTAS:
+            inicio = time.perf_counter()
+            for _ in range(args.repeat):
+                resultado = index.search(consulta)
+            media = (time.perf_counter() - inicio) / args.repeat
+            print(f"  {consulta!r:>10}: {media * 1e6:8.1f} µs  ({len(resultado)} resultados)")
+
+
+if __name__ == "__main__":
+    main()
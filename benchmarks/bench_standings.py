@@ -0,0 +1,112 @@
+"""
+Benchmark da tabela de classificação e do ranking por faixa de gols.
+
+Compara a versão antiga da página (um loop por time, duas máscaras por
+iteração) com as funções vetorizadas de ``dashboard.stats`` numa seleção de
+"todas as temporadas" de uma ou mais ligas do banco sintético compartilhado
+(``benchmarks.synthetic``), com as faixas de gols de ``dashboard.stats.FAIXAS``.
+
+Uso:
+    python -m benchmarks.bench_standings --leagues 1 --seasons 8
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+
+from benchmarks.run import database
+from benchmarks.synthetic import LIGAS_BASE
+from dashboard.data import MATCH_QUERY, TEAM_QUERY, add_team_names
+from dashboard.schema import apply_schema
+from dashboard.stats import FAIXAS, goal_bands_ranking, standings_table
+
+
+def load_league_matches(leagues=1, seasons=8):
+    """
+    Partidas das ``leagues`` primeiras ligas do banco sintético compartilhado
+    (``benchmarks.synthetic``, gerado uma vez em ``data/bench/``), com os tipos
+    e nomes de times das páginas.
+    """
+    escala = -(-leagues // LIGAS_BASE)
+    engine = create_engine(f"sqlite:///{database(escala, seasons=seasons)}")
+    teams = apply_schema(pd.read_sql(TEAM_QUERY, engine))
+    matches = add_team_names(apply_schema(pd.read_sql(MATCH_QUERY, engine)), teams)
+    engine.dispose()
+    ligas = np.sort(matches["league_id"].unique())[:leagues]
+    return matches[matches["league_id"].isin(ligas)].reset_index(drop=True)
+
+
+def legacy_standings(league_matches):
+    table = []
+    for team in pd.unique(league_matches[["team_home", "team_away"]].values.ravel("K")):
+        home_matches = league_matches[league_matches["team_home"] == team]
+        away_matches = league_matches[league_matches["team_away"] == team]
+        partidas_jogadas = len(home_matches) + len(away_matches)
+        vitorias = (home_matches["home_team_goal"] > home_matches["away_team_goal"]).sum() + \
+                   (away_matches["away_team_goal"] > away_matches["home_team_goal"]).sum()
+        empates = (home_matches["home_team_goal"] == home_matches["away_team_goal"]).sum() + \
+                  (away_matches["away_team_goal"] == away_matches["home_team_goal"]).sum()
+        gols_marcados = home_matches["home_team_goal"].sum() + away_matches["away_team_goal"].sum()
+        gols_sofridos = home_matches["away_team_goal"].sum() + away_matches["home_team_goal"].sum()
+        table.append({
+            "Time": team, "PJ": partidas_jogadas, "V": vitorias, "E": empates,
+            "D": partidas_jogadas - vitorias - empates, "GM": gols_marcados, "GS": gols_sofridos,
+            "SG": gols_marcados - gols_sofridos, "Pts": vitorias * 3 + empates,
+        })
+    standings = pd.DataFrame(table)
+    return standings.sort_values(by=["Pts", "SG", "GM"], ascending=[False, False, False]).reset_index(drop=True)
+
+
+def legacy_goal_bands(league_matches):
+    league_matches = league_matches.assign(
+        total_gols=league_matches["home_team_goal"] + league_matches["away_team_goal"]
+    )
+    ranking = []
+    for team in pd.unique(league_matches[["team_home", "team_away"]].values.ravel("K")):
+        df_team = league_matches[(league_matches["team_home"] == team) | (league_matches["team_away"] == team)]
+        for f in FAIXAS:
+            partidas_acima = (df_team["total_gols"] > f).sum()
+            ranking.append({
+                "Time": team,
+                "Faixa de Gols": f">{f} gols",
+                "Total Partidas Acima": partidas_acima,
+                "Percentual": partidas_acima / len(df_team) * 100,
+            })
+    return pd.DataFrame(ranking)
+
+
+def best_of(func, *args, repeat=5):
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        func(*args)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leagues", type=int, default=1)
+    parser.add_argument("--seasons", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    matches = load_league_matches(args.leagues, args.seasons)
+    print(f"{len(matches)} partidas, {args.leagues} liga(s) × {args.seasons} temporada(s)")
+
+    casos = [
+        ("classificação", legacy_standings, standings_table),
+        ("faixas de gols", legacy_goal_bands, lambda m: goal_bands_ranking(m, FAIXAS)),
+    ]
+    for nome, antigo, novo in casos:
+        t_antigo = best_of(antigo, matches, repeat=args.repeat)
+        t_novo = best_of(novo, matches, repeat=args.repeat)
+        print(f"{nome:>15}: loop {t_antigo * 1000:8.1f} ms | vetorizado {t_novo * 1000:8.1f} ms "
+              f"| {t_antigo / t_novo:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
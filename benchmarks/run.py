@@ -0,0 +1,165 @@
+"""
+Suíte de benchmarks do pipeline de cálculo das páginas.
+
+Para cada escala gera (ou reaproveita) um banco sintético com
+``benchmarks.synthetic`` e mede, em cada etapa, o melhor tempo de N execuções e
+o pico de memória alocada (tracemalloc, numa execução à parte). Cada escala
+roda num processo próprio: se ele morrer (falta de memória), a escala é
+reportada como falha e as seguintes continuam.
+
+Etapas:
+
+- join de partidas: ``MATCH_QUERY`` + tipos compactos + nomes dos times
+- consulta de uma liga/temporada (caminho das páginas, com índice)
+- ``team_stats``, classificação e agregados por rodada sobre todas as partidas
+- índice de busca, busca por nome e atributos mais recentes de jogadores
+
+Uso:
+    python -m benchmarks.run --scales 1 10 100
+    python -m benchmarks.run --scales 1 --repeat 3 --json bench.json
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, create_engine, text
+
+from benchmarks.synthetic import generate
+from dashboard.data import MATCH_QUERY, PLAYER_QUERY, TEAM_QUERY, add_team_names, ensure_indexes
+from dashboard.schema import PLAYER_ATTRIBUTE_COLUMNS, apply_schema
+from dashboard.search import PlayerSearchIndex
+from dashboard.stats import FAIXAS, round_stats, standings_table, team_stats
+
+DATA_DIR = "data/bench"
+
+CONSULTAS = ["mu", "santos", "rovic", "ba ro", "sanots"]
+
+LEAGUE_SEASON_QUERY = text(MATCH_QUERY + "WHERE M.league_id = :league_id AND M.season IN :seasons").bindparams(
+    bindparam("seasons", expanding=True)
+)
+
+LATEST_QUERY = text(f"""
+SELECT player_api_id, date, {", ".join(PLAYER_ATTRIBUTE_COLUMNS)}
+FROM Player_Attributes
+WHERE player_api_id = :player_api_id
+ORDER BY date DESC
+LIMIT 1
+""")
+
+
+def measure(func, repeat=3):
+    """Melhor tempo (s) de ``repeat`` execuções e pico de memória (MB) de uma execução extra."""
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tempos), pico / 1024 ** 2
+
+
+def database(scale, data_dir=DATA_DIR, seasons=8):
+    """Caminho do banco sintético da escala, gerado na primeira vez (sem XML de eventos)."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"synthetic_{scale}x_{seasons}s.sqlite")
+    if not os.path.exists(path):
+        inicio = time.perf_counter()
+        generate(path + ".tmp", scale=scale, seasons=seasons, events=False)
+        os.replace(path + ".tmp", path)
+        print(f"  banco {path} gerado em {time.perf_counter() - inicio:.1f}s")
+    return path
+
+
+def run_scale(path, repeat=3):
+    """Executa todas as etapas sobre o banco ``path``; devolve uma linha por etapa."""
+    engine = create_engine(f"sqlite:///{path}")
+    ensure_indexes(engine)
+    teams = apply_schema(pd.read_sql(TEAM_QUERY, engine))
+
+    def join():
+        return add_team_names(apply_schema(pd.read_sql(MATCH_QUERY, engine)), teams)
+
+    matches = join()
+    league_id = int(matches["league_id"].iloc[-1])
+    season = str(matches["season"].iloc[-1])
+    players = apply_schema(pd.read_sql(PLAYER_QUERY, engine))
+    index = PlayerSearchIndex(players)
+    amostra = np.random.default_rng(0).choice(players["player_api_id"].to_numpy(), size=50)
+
+    def league_season():
+        params = {"league_id": league_id, "seasons": [season]}
+        return add_team_names(apply_schema(pd.read_sql(LEAGUE_SEASON_QUERY, engine, params=params)), teams)
+
+    def search():
+        for consulta in CONSULTAS:
+            index.search(consulta)
+
+    def latest_attributes():
+        with engine.connect() as con:
+            for player_api_id in amostra.tolist():
+                con.execute(LATEST_QUERY, {"player_api_id": player_api_id}).fetchall()
+
+    etapas = [
+        ("join de partidas", join, len(matches)),
+        ("liga/temporada (SQL)", league_season, None),
+        ("team_stats", lambda: team_stats(matches), len(matches)),
+        ("classificação", lambda: standings_table(matches, by=["league_id", "season"]), len(matches)),
+        ("agregados por rodada", lambda: round_stats(matches, FAIXAS, by=["league_id", "season"]), len(matches)),
+        ("índice de jogadores", lambda: PlayerSearchIndex(players), len(players)),
+        (f"busca ({len(CONSULTAS)} consultas)", search, len(players)),
+        (f"atributos ({len(amostra)} jogadores)", latest_attributes, None),
+    ]
+    linhas = []
+    for nome, func, linhas_entrada in etapas:
+        tempo, pico = measure(func, repeat)
+        linhas.append({"etapa": nome, "linhas": linhas_entrada, "tempo_ms": tempo * 1000, "pico_mb": pico})
+    engine.dispose()
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--seasons", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=DATA_DIR, help="onde os bancos sintéticos ficam guardados")
+    parser.add_argument("--json", help="grava os resultados também em JSON")
+    args = parser.parse_args()
+
+    resultados = []
+    for scale in args.scales:
+        print(f"escala {scale}x")
+        path = database(scale, args.data_dir, args.seasons)
+        try:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                linhas = pool.submit(run_scale, path, args.repeat).result()
+        except BrokenProcessPool:
+            print("  falhou: o processo foi encerrado (provavelmente falta de memória)")
+            continue
+        for linha in linhas:
+            resultados.append({"escala": scale, **linha})
+            print(f"  {linha['etapa']:>26}: {linha['tempo_ms']:10.1f} ms | pico {linha['pico_mb']:8.1f} MB")
+
+    if len({linha["escala"] for linha in resultados}) > 1:
+        tabela = pd.DataFrame(resultados)
+        print()
+        print(tabela.pivot(index="etapa", columns="escala", values="tempo_ms").round(1)
+              .reindex(tabela["etapa"].unique()).to_string())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
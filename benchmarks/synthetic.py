@@ -0,0 +1,247 @@
+"""
+Gerador de bancos sintéticos compatíveis com o European Soccer Database.
+
+Escreve um arquivo SQLite com as tabelas e colunas usadas pelo dashboard
+(League, Team, Match, Player, Player_Attributes, Team_Attributes). ``scale``
+multiplica o número de ligas (e com elas times, partidas e jogadores);
+``seasons`` define quantas temporadas cada liga tem. Em ``scale=1`` o volume é
+próximo ao da base original: 11 ligas × 8 temporadas, ~33 mil partidas.
+
+Uso:
+    python -m benchmarks.synthetic data/synthetic_10x.sqlite --scale 10
+"""
+
+import argparse
+import sqlite3
+from datetime import date, timedelta
+
+import numpy as np
+
+from dashboard.schema import BOOKMAKERS, PLAYER_ATTRIBUTE_COLUMNS, TEAM_ATTRIBUTE_COLUMNS
+
+LIGAS_BASE = 11
+TIMES_POR_LIGA = 20
+TEMPORADAS_BASE = 8
+JOGADORES_POR_TIME = 30
+SNAPSHOTS_POR_TEMPORADA = 2
+
+# Atributos técnicos (sem overall_rating e potential, que são derivados)
+ATRIBUTOS = PLAYER_ATTRIBUTE_COLUMNS[2:]
+
+EVENTOS = ["goal", "shoton", "shotoff", "foulcommit", "card", "cross", "corner"]
+
+SCHEMA = f"""
+CREATE TABLE League (id INTEGER PRIMARY KEY, country_id INTEGER, name TEXT UNIQUE);
+CREATE TABLE Team (
+    id INTEGER PRIMARY KEY, team_api_id INTEGER UNIQUE, team_fifa_api_id INTEGER,
+    team_long_name TEXT, team_short_name TEXT
+);
+CREATE TABLE Player (
+    id INTEGER PRIMARY KEY, player_api_id INTEGER UNIQUE, player_name TEXT,
+    player_fifa_api_id INTEGER UNIQUE, birthday TEXT, height INTEGER, weight INTEGER
+);
+CREATE TABLE Player_Attributes (
+    id INTEGER PRIMARY KEY, player_fifa_api_id INTEGER, player_api_id INTEGER, date TEXT,
+    overall_rating INTEGER, potential INTEGER, preferred_foot TEXT,
+    attacking_work_rate TEXT, defensive_work_rate TEXT,
+    {", ".join(f"{c} INTEGER" for c in ATRIBUTOS)}
+);
+CREATE TABLE Team_Attributes (
+    id INTEGER PRIMARY KEY, team_fifa_api_id INTEGER, team_api_id INTEGER, date TEXT,
+    {", ".join(f"{c} INTEGER" for c in TEAM_ATTRIBUTE_COLUMNS)}
+);
+CREATE TABLE Match (
+    id INTEGER PRIMARY KEY, country_id INTEGER, league_id INTEGER, season TEXT,
+    stage INTEGER, date TEXT, match_api_id INTEGER UNIQUE,
+    home_team_api_id INTEGER, away_team_api_id INTEGER,
+    home_team_goal INTEGER, away_team_goal INTEGER,
+    {", ".join(f"home_player_{i} INTEGER" for i in range(1, 12))},
+    {", ".join(f"away_player_{i} INTEGER" for i in range(1, 12))},
+    goal TEXT, shoton TEXT, shotoff TEXT, foulcommit TEXT, card TEXT,
+    "cross" TEXT, corner TEXT, possession TEXT,
+    {", ".join(f"{b}{r} NUMERIC" for b in BOOKMAKERS for r in "HDA")}
+);
+"""
+
+SILABAS = np.array([
+    "ba", "ro", "mü", "ler", "san", "tos", "gi", "ova", "ni", "ço", "dé", "ka", "lo", "pe",
+    "zi", "ña", "vic", "ha", "el", "jo", "ma", "ri", "an", "ton", "sé", "ku", "ber", "li",
+])
+
+
+def _nomes(rng, n, silabas):
+    partes = rng.choice(SILABAS, size=(n, silabas))
+    return ["".join(p).capitalize() for p in partes]
+
+
+def _round_robin(n):
+    """Turno e returno pelo método do círculo: lista de rodadas com pares (mandante, visitante)."""
+    times = list(range(n))
+    rodadas = []
+    for r in range(n - 1):
+        jogos = [(times[i], times[n - 1 - i]) for i in range(n // 2)]
+        rodadas.append([(a, b) if r % 2 == 0 else (b, a) for a, b in jogos])
+        times = [times[0], times[-1], *times[1:-1]]
+    rodadas += [[(b, a) for a, b in jogos] for jogos in rodadas]
+    stage = np.repeat(np.arange(1, len(rodadas) + 1), n // 2)
+    pares = np.array([par for jogos in rodadas for par in jogos])
+    return stage, pares[:, 0], pares[:, 1]
+
+
+def _eventos_xml(rng, tipo, quantidade, home, away, jogadores_home, jogadores_away):
+    """XML no formato da base original: <tipo><value>...</value>...</tipo>."""
+    lado = rng.random(quantidade) < 0.5
+    minuto = rng.integers(1, 91, size=quantidade)
+    escolha = rng.integers(0, 11, size=quantidade)
+    valores = []
+    for casa, m, j in zip(lado.tolist(), minuto.tolist(), escolha.tolist()):
+        time, jogador = (home, jogadores_home[j]) if casa else (away, jogadores_away[j])
+        if tipo == "card":
+            extra = "<card_type>y</card_type>" if j else "<card_type>r</card_type>"
+        elif tipo == "goal":
+            extra = "<goal_type>n</goal_type>"
+        else:
+            extra = f"<subtype>{('shot', 'header', 'distance')[j % 3]}</subtype>"
+        valores.append(
+            f"<value><elapsed>{m}</elapsed><player1>{jogador}</player1>"
+            f"<team>{time}</team><type>{tipo}</type>{extra}</value>"
+        )
+    return f"<{tipo}>{''.join(valores)}</{tipo}>"
+
+
+def _posse_xml(casa):
+    valores = "".join(
+        f"<value><elapsed>{m}</elapsed><subtype>possession</subtype>"
+        f"<homepos>{casa}</homepos><awaypos>{100 - casa}</awaypos></value>"
+        for m in (45, 90)
+    )
+    return f"<possession>{valores}</possession>"
+
+
+def _insert(con, tabela, linhas):
+    if len(linhas):
+        marcadores = ", ".join("?" * len(linhas[0]))
+        con.executemany(f"INSERT INTO {tabela} VALUES ({marcadores})", linhas)
+
+
+def generate(path, scale=1, seasons=TEMPORADAS_BASE, seed=42, events=True):
+    """Gera o banco sintético em ``path``."""
+    rng = np.random.default_rng(seed)
+    n_ligas = LIGAS_BASE * scale
+    stage, idx_home, idx_away = _round_robin(TIMES_POR_LIGA)
+    n_partidas = len(stage)
+
+    con = sqlite3.connect(path)
+    con.executescript(SCHEMA)
+    _insert(con, "League", [
+        (i, i, f"Liga {nome} {i}") for i, nome in enumerate(_nomes(rng, n_ligas, 2), start=1)
+    ])
+
+    match_id = 1
+    pa_id = 1
+    ta_id = 1
+    for liga in range(1, n_ligas + 1):
+        # Times e elencos
+        times = 1000 + (liga - 1) * TIMES_POR_LIGA + np.arange(TIMES_POR_LIGA)
+        _insert(con, "Team", [
+            (int(t), int(t), int(t), f"{nome} {t}", nome[:3].upper())
+            for t, nome in zip(times, _nomes(rng, TIMES_POR_LIGA, 3))
+        ])
+        forca = rng.normal(1.35, 0.35, size=TIMES_POR_LIGA).clip(0.4, 2.6)
+
+        n_jogadores = TIMES_POR_LIGA * JOGADORES_POR_TIME
+        jogadores = 100000 + (liga - 1) * n_jogadores + np.arange(n_jogadores)
+        elenco = jogadores.reshape(TIMES_POR_LIGA, JOGADORES_POR_TIME)
+        nascimento = rng.integers(0, 9000, size=n_jogadores)
+        nomes = [f"{a} {b}" for a, b in zip(_nomes(rng, n_jogadores, 2), _nomes(rng, n_jogadores, 3))]
+        _insert(con, "Player", [
+            (int(p), int(p), nome, int(p), f"{date(1975, 1, 1) + timedelta(days=int(d))} 00:00:00", int(h), int(w))
+            for p, nome, d, h, w in zip(
+                jogadores, nomes, nascimento,
+                rng.integers(165, 200, size=n_jogadores), rng.integers(140, 210, size=n_jogadores),
+            )
+        ])
+
+        # Snapshots de atributos dos jogadores e dos times
+        base = rng.integers(35, 90, size=(n_jogadores, len(ATRIBUTOS)))
+        for s in range(seasons):
+            for k in range(SNAPSHOTS_POR_TEMPORADA):
+                dia = f"{date(2008 + s, 8 + 3 * k, 1)} 00:00:00"
+                valores = (base + rng.integers(-3, 4, size=base.shape)).clip(1, 99)
+                overall = valores[:, :26].mean(axis=1).astype(int) + 5
+                potencial = overall + rng.integers(0, 8, size=n_jogadores)
+                ids = np.arange(pa_id, pa_id + n_jogadores)
+                pa_id += n_jogadores
+                _insert(con, "Player_Attributes", [
+                    (i, p, p, dia, o, pt, "right", "medium", "medium", *linha)
+                    for i, p, o, pt, linha in zip(
+                        ids.tolist(), jogadores.tolist(), overall.tolist(), potencial.tolist(), valores.tolist()
+                    )
+                ])
+            tatico = rng.integers(20, 80, size=(TIMES_POR_LIGA, len(TEAM_ATTRIBUTE_COLUMNS)))
+            _insert(con, "Team_Attributes", [
+                (ta_id + i, int(t), int(t), f"{date(2008 + s, 9, 1)} 00:00:00", *linha)
+                for i, (t, linha) in enumerate(zip(times, tatico.tolist()))
+            ])
+            ta_id += TIMES_POR_LIGA
+
+        # Partidas: todas as de uma temporada geradas de uma vez
+        for s in range(seasons):
+            temporada = f"{2008 + s}/{2009 + s}"
+            inicio = date(2008 + s, 8, 10)
+            datas = [f"{inicio + timedelta(days=7 * (int(e) - 1))} 00:00:00" for e in stage]
+            gols_casa = rng.poisson(forca[idx_home] * 1.1)
+            gols_fora = rng.poisson(forca[idx_away] * 0.9)
+
+            # Escalações: 11 dos 30 jogadores de cada elenco
+            sorteio = np.argsort(rng.random((n_partidas, 2, JOGADORES_POR_TIME)), axis=2)[:, :, :11]
+            escalacao_casa = elenco[idx_home[:, None], sorteio[:, 0]]
+            escalacao_fora = elenco[idx_away[:, None], sorteio[:, 1]]
+
+            # Odds com margem e ruído por casa de apostas
+            p_casa = forca[idx_home] / (forca[idx_home] + forca[idx_away])
+            probs = np.stack([p_casa * 0.75, np.full(n_partidas, 0.27), (1 - p_casa) * 0.75], axis=1)
+            probs /= probs.sum(axis=1, keepdims=True)
+            ruido = probs[:, None, :] * rng.uniform(0.92, 1.08, size=(n_partidas, len(BOOKMAKERS), 3))
+            margem = 1 + rng.uniform(0.03, 0.09, size=(n_partidas, len(BOOKMAKERS), 1))
+            odds = np.round(1 / (ruido / ruido.sum(axis=2, keepdims=True) * margem), 2)
+            odds = odds.reshape(n_partidas, -1)
+
+            linhas = []
+            for i in range(n_partidas):
+                home, away = int(times[idx_home[i]]), int(times[idx_away[i]])
+                gh, ga = int(gols_casa[i]), int(gols_fora[i])
+                ph, pa = escalacao_casa[i].tolist(), escalacao_fora[i].tolist()
+                if events:
+                    quantidades = [gh + ga, *rng.integers([4, 4, 10, 0, 10, 4], [14, 14, 30, 7, 30, 14])]
+                    xml = [
+                        _eventos_xml(rng, tipo, int(q), home, away, ph, pa)
+                        for tipo, q in zip(EVENTOS, quantidades)
+                    ]
+                    xml.append(_posse_xml(int(rng.integers(35, 66))))
+                else:
+                    xml = [None] * 8
+                linhas.append((
+                    match_id, liga, liga, temporada, int(stage[i]), datas[i], 500000 + match_id,
+                    home, away, gh, ga, *ph, *pa, *xml, *odds[i].tolist(),
+                ))
+                match_id += 1
+            _insert(con, "Match", linhas)
+        con.commit()
+
+    con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="arquivo SQLite de saída")
+    parser.add_argument("--scale", type=int, default=1, help="multiplicador do número de ligas")
+    parser.add_argument("--seasons", type=int, default=TEMPORADAS_BASE, help="temporadas por liga")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-events", action="store_true", help="não gera as colunas XML de eventos")
+    args = parser.parse_args()
+    generate(args.path, scale=args.scale, seasons=args.seasons, seed=args.seed, events=not args.no_events)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Camada de dados e cálculos compartilhada pelas páginas do dashboard."""
@@ -0,0 +1,143 @@
+"""
+Download do banco de dados na primeira execução.
+
+O arquivo é baixado em blocos para ``database.sqlite.part`` (sem carregar tudo
+em memória), retomado com HTTP Range se um download anterior foi interrompido,
+conferido (cabeçalho SQLite e, se configurado, SHA-256) e só então renomeado
+para ``database.sqlite``. Um lock de arquivo garante que apenas um processo
+baixa por vez; os outros esperam e reaproveitam o resultado.
+
+Configuração por variáveis de ambiente: ``DASHBOARD_DB_URL`` e
+``DASHBOARD_DB_SHA256`` (opcional).
+"""
+
+import hashlib
+import os
+from contextlib import contextmanager
+
+import requests
+
+DB_URL = os.environ.get(
+    "DASHBOARD_DB_URL",
+    "https://drive.google.com/uc?export=download&confirm=t&id=14koOa6FWE6PVaAIMTAJUy3IlWkZgFxJd",
+)
+DB_SHA256 = os.environ.get("DASHBOARD_DB_SHA256")
+
+CHUNK_SIZE = 1 << 20
+TIMEOUT = 30
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+
+class DownloadError(RuntimeError):
+    """O arquivo baixado não é um banco válido."""
+
+
+@contextmanager
+def file_lock(path: str):
+    """Lock exclusivo entre processos, mantido enquanto o bloco ``with`` executa."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def download(url: str, path: str, progress=None) -> None:
+    """
+    Baixa ``url`` para ``path`` em blocos, continuando de onde parou se ``path``
+    já tiver parte do arquivo. ``progress(baixados, total)`` é chamado a cada bloco
+    (``total`` é ``None`` se o servidor não informar o tamanho).
+    """
+    inicio = os.path.getsize(path) if os.path.exists(path) else 0
+    headers = {"Range": f"bytes={inicio}-"} if inicio else {}
+
+    with requests.get(url, headers=headers, stream=True, timeout=TIMEOUT) as r:
+        if r.status_code == 416:
+            # O pedaço local já é o arquivo inteiro
+            return
+        r.raise_for_status()
+        if r.status_code != 206:
+            # Servidor ignorou o Range: recomeça do zero
+            inicio = 0
+
+        tamanho = r.headers.get("Content-Length")
+        total = inicio + int(tamanho) if tamanho is not None else None
+        baixados = inicio
+        with open(path, "ab" if inicio else "wb") as f:
+            for bloco in r.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(bloco)
+                baixados += len(bloco)
+                if progress:
+                    progress(baixados, total)
+
+
+def verify(path: str, sha256: str = None) -> None:
+    """Confere o cabeçalho SQLite e, se informado, o SHA-256 do arquivo."""
+    with open(path, "rb") as f:
+        if f.read(len(SQLITE_HEADER)) != SQLITE_HEADER:
+            raise DownloadError(f"{path} não é um banco SQLite")
+        if sha256:
+            f.seek(0)
+            digest = hashlib.sha256()
+            for bloco in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(bloco)
+            if digest.hexdigest() != sha256.lower():
+                raise DownloadError(f"SHA-256 de {path} não confere")
+
+
+def ensure_database(path: str, url: str = DB_URL, sha256: str = DB_SHA256, progress=None) -> bool:
+    """
+    Garante que o banco existe em ``path``, baixando se preciso.
+
+    Devolve ``True`` se o download aconteceu nesta chamada.
+    """
+    if os.path.exists(path):
+        return False
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with file_lock(f"{path}.lock"):
+        # Outro processo pode ter terminado o download enquanto esperávamos o lock
+        if os.path.exists(path):
+            return False
+
+        parcial = f"{path}.part"
+        download(url, parcial, progress)
+        try:
+            verify(parcial, sha256)
+        except DownloadError:
+            os.remove(parcial)
+            raise
+        os.replace(parcial, path)
+    return True
+
+
+def streamlit_progress(texto: str = "Baixando banco de dados..."):
+    """Callback de ``progress`` que mostra uma barra de progresso do Streamlit."""
+    import streamlit as st
+
+    barra = None
+
+    def atualizar(baixados, total):
+        nonlocal barra
+        if barra is None:
+            barra = st.progress(0.0, text=texto)
+        if total:
+            barra.progress(min(baixados / total, 1.0), text=f"{texto} {baixados / 2**20:.0f} / {total / 2**20:.0f} MB")
+        else:
+            barra.progress(0.0, text=f"{texto} {baixados / 2**20:.0f} MB")
+
+    return atualizar
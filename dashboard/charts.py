@@ -0,0 +1,145 @@
+"""
+Gráficos Plotly das páginas de ligas e times.
+
+Cada função recebe as tabelas já calculadas (``dashboard.stats``/``dashboard.data``)
+e devolve a figura, sem depender do Streamlit: as páginas só chamam
+``st.plotly_chart`` e o gerador de relatórios (``python -m dashboard.report``)
+grava as mesmas figuras em HTML.
+"""
+
+import pandas as pd
+import plotly.express as px
+
+from dashboard.tactics import TEAM_ATTRIBUTE_LABELS
+
+# Colunas do gráfico de barras do comparativo de times
+COMPARISON_COLUMNS = ["Gols Marcados", "Gols Sofridos", "Vitórias", "Derrotas", "Empates"]
+
+
+def standings_evolution_chart(evolucao: pd.DataFrame, temporada: str):
+    """Posição de cada time por rodada (``standings_evolution`` de uma temporada)."""
+    fig = px.line(
+        evolucao,
+        x="stage",
+        y="Posição",
+        color="Time",
+        markers=True,
+        title=f"Posição de cada time por rodada — {temporada}",
+        labels={"stage": "Rodada", "Posição": "Posição"},
+    )
+    fig.update_yaxes(autorange="reversed", dtick=1)
+    return fig
+
+
+def shots_chart(eventos: pd.DataFrame):
+    """Chutes no gol e para fora por jogo de cada time (``team_event_stats``)."""
+    por_jogo = eventos[["Chutes no gol", "Chutes para fora"]].div(eventos["Partidas"], axis=0).round(2)
+    por_jogo = por_jogo.sort_values("Chutes no gol", ascending=False)
+    return px.bar(
+        por_jogo,
+        barmode="stack",
+        title="Chutes por jogo",
+        labels={"index": "Time", "value": "Chutes por jogo", "variable": "Tipo"},
+    )
+
+
+def goal_bands_chart(faixas: pd.DataFrame):
+    """Percentual de partidas acima de cada faixa de gols (``goal_band_share``)."""
+    fig = px.bar(
+        faixas,
+        x="Percentual",
+        y="Faixa de Gols",
+        orientation="h",
+        text="Percentual",
+        labels={"Percentual": "% de partidas", "Faixa de Gols": "Faixa de Gols"},
+        title="Percentual de Partidas por Faixa de Gols"
+    )
+    fig.update_layout(yaxis=dict(autorange="reversed"))
+    return fig
+
+
+def results_chart(rodadas: pd.DataFrame):
+    """Vitórias do mandante, do visitante e empates por rodada (``combine_round_stats``)."""
+    fig = px.line(
+        rodadas.rename(columns={"stage": "Rodada"}),
+        x="Rodada",
+        y=["Vitórias Mandante", "Vitórias Visitante", "Empates"],
+        title="Resultados por Rodada",
+        labels={"value": "Quantidade", "Rodada": "Rodada", "variable": "Resultado"}
+    )
+    fig.update_yaxes(range=[0, None])
+    return fig
+
+
+def goals_per_game_chart(rodadas: pd.DataFrame):
+    """Média de gols por jogo em cada rodada (``combine_round_stats``)."""
+    fig = px.line(
+        rodadas,
+        x="stage",
+        y="Média Gols por Jogo",
+        title="Média de Gols por Jogo por Rodada",
+        labels={"stage": "Rodada", "Média Gols por Jogo": "Gols"},
+        range_y=[0, rodadas["Média Gols por Jogo"].max() * 1.1]
+    )
+    fig.update_yaxes(range=[0, None])
+    return fig
+
+
+def team_comparison_chart(stats: pd.DataFrame):
+    """Gols, vitórias, empates e derrotas dos times do índice de ``stats`` (``team_stats``)."""
+    return px.bar(
+        stats.rename_axis("Time").reset_index().astype({"Time": str}),
+        x="Time",
+        y=COMPARISON_COLUMNS,
+        barmode="group",
+        title="Comparação entre Times",
+        labels={"variable": "Análise", "value": "Quantidade"}
+    )
+
+
+def head_to_head_chart(matriz: dict):
+    """Aproveitamento nos confrontos diretos (``head_to_head_matrix``), com o placar V-E-D no texto."""
+    fig = px.imshow(
+        matriz["aproveitamento"],
+        color_continuous_scale="RdYlGn",
+        zmin=0,
+        zmax=100,
+        aspect="auto",
+        labels={"x": "Adversário", "y": "Time", "color": "Aproveitamento (%)"},
+        title="Aproveitamento nos confrontos diretos (texto: vitórias-empates-derrotas)",
+    )
+    fig.update_traces(text=matriz["placar"].fillna("").to_numpy(), texttemplate="%{text}")
+    return fig
+
+
+def elo_chart(historico: pd.DataFrame, periodo=None):
+    """Elo de cada time depois de cada partida; ``periodo`` (início, fim) fica sombreado."""
+    fig = px.line(
+        historico,
+        x="date",
+        y="Elo",
+        color="Time",
+        title="Elo depois de cada partida (todas as ligas e temporadas)",
+        labels={"date": "Data"},
+    )
+    if periodo is not None:
+        fig.add_vrect(x0=periodo[0], x1=periodo[1], fillcolor="gray", opacity=0.15, line_width=0)
+    return fig
+
+
+def tactical_profile_chart(perfil: pd.DataFrame):
+    """Radar do perfil tático (``tactical_profile``): uma linha por time do índice."""
+    atributos = list(TEAM_ATTRIBUTE_LABELS.values())
+    radar = perfil[atributos].rename_axis("Time").reset_index().astype({"Time": str})
+    radar = radar.melt(id_vars="Time", var_name="Atributo", value_name="Valor")
+    fig = px.line_polar(
+        radar,
+        r="Valor",
+        theta="Atributo",
+        color="Time",
+        line_close=True,
+        title="🧭 Perfil tático médio nas partidas selecionadas",
+        range_r=[20, 80],
+    )
+    fig.update_traces(fill="toself", opacity=0.6)
+    return fig
@@ -0,0 +1,180 @@
+"""
+Snapshot colunar (Parquet) das tabelas usadas pelo dashboard.
+
+``export`` converte as tabelas do SQLite em arquivos Parquet com os tipos
+compactos de ``dashboard.schema`` (categorias para nomes, inteiros pequenos
+para gols e atributos), ordenados
+pelas colunas de filtro para que as leituras pulem os row groups que não
+interessam. ``read_table`` abre os arquivos com memory map, lê só as colunas
+pedidas e aplica os filtros de linha na leitura.
+
+Para usar o snapshot nas páginas: ``DASHBOARD_BACKEND=columnar streamlit run Home.py``.
+
+Uso:
+    python -m dashboard.columnar export [--db data/database.sqlite] [--out data/columnar]
+    python -m dashboard.columnar report
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import create_engine
+
+from dashboard.data import (
+    DB_PATH,
+    LEAGUE_QUERY,
+    MATCH_QUERY,
+    ODDS_QUERY,
+    PLAYER_ATTRIBUTES_EXPORT_QUERY,
+    PLAYER_QUERY,
+    PLAYER_SEASONS_QUERY,
+    TEAM_ATTRIBUTES_QUERY,
+    TEAM_QUERY,
+    add_team_names,
+)
+from dashboard.schema import apply_schema
+
+COLUMNAR_DIR = "data/columnar"
+MANIFEST = "manifest.json"
+
+# Linhas por row group: pequeno o bastante para que um filtro de liga/temporada
+# ou de jogador leia só uma fração do arquivo.
+ROW_GROUP_SIZE = 4096
+
+# Consulta de cada arquivo do snapshot e a ordenação usada na escrita
+TABLES = {
+    "teams": (TEAM_QUERY, ["team_api_id"]),
+    "leagues": (LEAGUE_QUERY, ["league_id"]),
+    "team_attributes": (TEAM_ATTRIBUTES_QUERY, ["team_api_id", "date"]),
+    "matches": (MATCH_QUERY, ["league_id", "season", "stage", "match_api_id"]),
+    "match_odds": (ODDS_QUERY, ["match_api_id"]),
+    "players": (PLAYER_QUERY, ["player_api_id"]),
+    "player_attributes": (PLAYER_ATTRIBUTES_EXPORT_QUERY, ["player_api_id", "date", "id"]),
+    "player_seasons": (PLAYER_SEASONS_QUERY, ["league_id", "season", "player_api_id"]),
+}
+
+
+def export(db_path: str = None, out_dir: str = COLUMNAR_DIR) -> dict:
+    """Gera o snapshot Parquet de todas as tabelas. Devolve o manifesto."""
+    engine = create_engine(f"sqlite:///{db_path or DB_PATH}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    teams = apply_schema(pd.read_sql(TEAM_QUERY, engine))
+    manifesto = {}
+    for nome, (consulta, ordem) in TABLES.items():
+        df = apply_schema(pd.read_sql(consulta, engine))
+        if nome == "matches":
+            df = add_team_names(df, teams)
+        df = df.sort_values(ordem, kind="stable").reset_index(drop=True)
+        caminho = os.path.join(out_dir, f"{nome}.parquet")
+        df.to_parquet(caminho, index=False, row_group_size=ROW_GROUP_SIZE)
+        manifesto[nome] = {"rows": len(df), "bytes": os.path.getsize(caminho)}
+    engine.dispose()
+
+    # O manifesto é escrito por último: sua data marca a versão do snapshot
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifesto, f, indent=2)
+    return manifesto
+
+
+def snapshot_signature(out_dir: str = COLUMNAR_DIR) -> tuple:
+    """Versão do snapshot (mtime + tamanho do manifesto), usada como chave de cache."""
+    stat = os.stat(os.path.join(out_dir, MANIFEST))
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_table(name: str, columns=None, filters=None, out_dir: str = COLUMNAR_DIR) -> pd.DataFrame:
+    """
+    Lê um arquivo do snapshot com memory map.
+
+    ``columns`` limita as colunas lidas e ``filters`` (formato do pyarrow, ex.:
+    ``[("league_id", "=", 1), ("season", "in", ["2015/2016"])]``, ou uma lista de
+    listas para condições com "ou") é aplicado na leitura, descartando row groups
+    inteiros pelas estatísticas do Parquet.
+    """
+    path = os.path.join(out_dir, f"{name}.parquet")
+    if filters and isinstance(filters[0], tuple):
+        # Uma lista vazia em "in" não tem tipo para o pyarrow inferir: usa o da coluna
+        schema = pq.read_schema(path)
+        filters = [
+            (coluna, op, _empty_values(schema.field(coluna).type) if op == "in" and not len(valores) else valores)
+            for coluna, op, valores in filters
+        ]
+    tabela = pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+    return tabela.to_pandas()
+
+
+def _empty_values(tipo: pa.DataType) -> pa.Array:
+    if pa.types.is_dictionary(tipo):
+        tipo = tipo.value_type
+    return pa.array([], type=tipo)
+
+
+# -------------------------------
+# 🔹 Relatório de cold start
+# -------------------------------
+COLD_START_SCRIPT = """
+import json, resource, time
+inicio = time.perf_counter()
+from dashboard import data
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+frames = [
+    data.load_teams(), data.load_leagues(), data.load_matches(),
+    data.load_players(), data.load_player_attributes(),
+]
+fim = time.perf_counter()
+pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "load_s": fim - t0,
+    "total_s": fim - inicio,
+    "rss_mb": (pico - base) / 1024,
+    "frames_mb": sum(f.memory_usage(deep=True).sum() for f in frames) / 2**20,
+}))
+"""
+
+
+def cold_start(backend: str) -> dict:
+    """Mede o cold start das páginas num processo novo com o backend indicado."""
+    env = dict(os.environ, DASHBOARD_BACKEND=backend)
+    saida = subprocess.run(
+        [sys.executable, "-c", COLD_START_SCRIPT],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def report() -> pd.DataFrame:
+    """Tempo de carga e memória residente dos backends SQLite e colunar."""
+    linhas = {backend: cold_start(backend) for backend in ("sqlite", "columnar")}
+    return pd.DataFrame(linhas).T.round(3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="comando", required=True)
+    exp = sub.add_parser("export", help="gera o snapshot Parquet")
+    exp.add_argument("--db", help="caminho do database.sqlite")
+    exp.add_argument("--out", default=COLUMNAR_DIR, help="pasta de saída")
+    sub.add_parser("report", help="compara o cold start dos dois backends")
+    args = parser.parse_args()
+
+    if args.comando == "export":
+        inicio = time.perf_counter()
+        manifesto = export(args.db, args.out)
+        for nome, info in manifesto.items():
+            print(f"{nome:>18}: {info['rows']:>8} linhas, {info['bytes'] / 2**20:6.1f} MB")
+        print(f"Snapshot gerado em {time.perf_counter() - inicio:.1f}s")
+    else:
+        print(report().to_string())
+
+
+if __name__ == "__main__":
+    main()
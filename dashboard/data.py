@@ -0,0 +1,966 @@
+"""
+Acesso ao banco de dados compartilhado por todas as páginas.
+
+Existe um único engine de leitura por processo e cada tabela é lida uma única
+vez: os DataFrames ficam em cache (``st.cache_resource``) e são compartilhados
+entre todas as sessões, sem cópia. A chave do cache inclui a data de modificação
+e o tamanho do arquivo do banco, então substituir o ``database.sqlite`` invalida
+os dados automaticamente.
+
+O engine de leitura abre o arquivo somente leitura (URI ``mode=ro``), com
+pragmas de leitura (``mmap_size``, ``cache_size``, ``temp_store``) e um pool de
+conexões compartilhado pelas threads das sessões. As conexões continuam usando
+os locks do SQLite, então ``dashboard.precompute`` e ``dashboard.events`` podem
+gravar no mesmo arquivo com o app aberto. O engine é recriado (e o anterior
+fechado) quando o arquivo muda. Só a criação dos índices escreve, num engine
+separado (``get_write_engine``).
+
+Os DataFrames devolvidos são somente leitura: filtros e colunas novas geram
+cópias (Copy-on-Write), nunca alteram o objeto compartilhado. As colunas usam
+os tipos compactos de ``dashboard.schema`` (categorias, inteiros pequenos).
+
+A origem das tabelas é escolhida pela variável de ambiente ``DASHBOARD_BACKEND``:
+``sqlite`` (padrão) ou ``columnar``, que lê o snapshot Parquet gerado por
+``python -m dashboard.columnar export``.
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+from sqlalchemy import bindparam, create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+
+from dashboard.bootstrap import ensure_database, streamlit_progress
+from dashboard.distributions import histogram2d, histograms, player_season_attributes
+from dashboard.elo import elo_ratings, incremental, latest_ratings, team_ratings
+from dashboard.metrics import cache_miss, record, run_concurrently, stage, timed
+from dashboard.odds import accuracy, biggest_upsets, calibration, match_probabilities, team_upsets
+from dashboard.schema import (
+    ODDS_COLUMNS,
+    PLAYER_ATTRIBUTE_COLUMNS,
+    TEAM_ATTRIBUTE_COLUMNS,
+    apply_schema,
+    team_name_dtype,
+)
+from dashboard.search import PlayerSearchIndex
+from dashboard.similar import SimilarityIndex
+from dashboard.stats import (
+    head_to_head,
+    league_summary,
+    pair_index,
+    standings_evolution,
+    team_event_stats,
+    team_stats,
+)
+from dashboard.tactics import TeamAttributeIndex
+from dashboard.timeseries import MAX_POINTS, downsample_history
+
+DB_PATH = "data/database.sqlite"
+
+BACKEND = os.environ.get("DASHBOARD_BACKEND", "sqlite")
+
+# Copy-on-Write já é o padrão a partir do pandas 3; antes disso precisa ser ligado
+# para que nenhuma sessão altere os DataFrames compartilhados pelo cache.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+# Índices usados pelos filtros de liga/temporada e pelas buscas por time.
+# O primeiro cobre todas as colunas lidas em MATCH_QUERY, então a consulta de uma
+# liga/temporada não precisa tocar na tabela Match.
+INDEXES = [
+    """CREATE INDEX IF NOT EXISTS idx_match_league_season_stage ON Match (
+        league_id, season, stage, date, match_api_id,
+        home_team_api_id, away_team_api_id, home_team_goal, away_team_goal
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_match_home_team ON Match (home_team_api_id)",
+    "CREATE INDEX IF NOT EXISTS idx_match_away_team ON Match (away_team_api_id)",
+    # Histórico de um jogador em ordem de data sem varrer Player_Attributes
+    "CREATE INDEX IF NOT EXISTS idx_player_attributes_player_date ON Player_Attributes (player_api_id, date)",
+]
+
+
+def ensure_indexes(engine: Engine) -> None:
+    """Cria os índices do dashboard (idempotente)."""
+    with engine.begin() as con:
+        for ddl in INDEXES:
+            con.execute(text(ddl))
+
+
+# Pragmas de cada conexão de leitura
+READ_PRAGMAS = {
+    "mmap_size": 256 * 2**20,    # lê o arquivo por memory map (256 MB)
+    "cache_size": -64 * 2**10,   # 64 MB de cache de páginas por conexão
+    "temp_store": "MEMORY",      # ordenações e tabelas temporárias em memória
+}
+# Conexões de leitura mantidas abertas (e extras sob pico, fechadas ao devolver)
+POOL_SIZE = 4
+POOL_OVERFLOW = 8
+# Threads das consultas independentes no início das páginas
+STARTUP_WORKERS = 4
+
+
+def get_write_engine(path: str = DB_PATH) -> Engine:
+    """Engine de escrita (leitura e escrita, sem pragmas de leitura): criação de índices."""
+    return create_engine(f"sqlite:///{path}")
+
+
+def read_only_engine(path: str = DB_PATH) -> Engine:
+    """
+    Engine somente leitura: URI ``mode=ro``, ``READ_PRAGMAS`` em cada conexão e
+    um pool (``QueuePool``) que as threads das sessões compartilham.
+
+    Sem ``immutable=1``: o arquivo pode receber escritas dos builds
+    (``precompute``, ``events``) enquanto o app lê, e os locks do SQLite
+    garantem que cada consulta veja um estado consistente.
+    """
+    engine = create_engine(
+        f"sqlite:///file:{os.path.abspath(path)}?mode=ro&uri=true",
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_OVERFLOW,
+        # Cada conexão é usada por uma thread de cada vez, mas não sempre pela mesma
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, valor in READ_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {valor}")
+        cursor.close()
+
+    return engine
+
+
+@st.cache_resource(show_spinner=False)
+def _prepare_database() -> None:
+    """Download (se preciso) e índices, uma vez por processo."""
+    # Sem barra de progresso aqui: elementos criados dentro do cache seriam
+    # repetidos nos acertos e ficariam presos à sessão que baixou (ver db_signature)
+    ensure_database(DB_PATH)
+    engine = get_write_engine()
+    ensure_indexes(engine)
+    engine.dispose()
+
+
+def _dispose(engine: Engine) -> None:
+    engine.dispose()
+
+
+# A versão anterior sai do cache quando o arquivo muda: suas conexões são fechadas
+@st.cache_resource(show_spinner=False, max_entries=1, on_release=_dispose)
+def _read_engine(versao: tuple) -> Engine:
+    return read_only_engine(DB_PATH)
+
+
+def get_engine() -> Engine:
+    """Engine de leitura do processo, compartilhado por todas as páginas e sessões."""
+    # Um engine por versão do arquivo, como os DataFrames em cache
+    return _read_engine(db_signature())
+
+
+def db_signature() -> tuple:
+    """Identifica a versão do arquivo do banco (mtime + tamanho) para o cache."""
+    if BACKEND == "columnar":
+        from dashboard import columnar
+
+        return columnar.snapshot_signature()
+    if not os.path.exists(DB_PATH):
+        # Qualquer página pode ser a primeira a abrir: baixa o banco antes da
+        # primeira consulta, com a barra de progresso na sessão que está esperando
+        ensure_database(DB_PATH, progress=streamlit_progress())
+    # Os índices são criados antes de ler a assinatura, senão a primeira execução
+    # invalidaria o cache logo depois de preenchê-lo.
+    _prepare_database()
+    stat = os.stat(DB_PATH)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_concurrently(*loaders) -> list:
+    """
+    Executa loaders independentes (funções sem argumentos, ex.: ``load_leagues``)
+    em paralelo, numa etapa "carga inicial" que registra o tempo economizado.
+    Devolve os resultados na ordem dos loaders.
+    """
+    return run_concurrently("carga inicial", loaders, max_workers=STARTUP_WORKERS)
+
+
+def _read_sql(query, params=None) -> pd.DataFrame:
+    with stage("SQL") as etapa:
+        df = pd.read_sql(query, get_engine(), params=params)
+        record(etapa, df)
+    return df
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _table_names(versao: tuple) -> set:
+    return set(inspect(get_engine()).get_table_names())
+
+
+def has_table(name: str) -> bool:
+    """A tabela existe no banco? (tabelas opcionais geradas pelo pré-cálculo)"""
+    return BACKEND != "columnar" and name in _table_names(db_signature())
+
+
+def _read_columnar(name: str, columns=None, filters=None) -> pd.DataFrame:
+    from dashboard import columnar
+
+    with stage(f"Parquet ({name})") as etapa:
+        df = columnar.read_table(name, columns=columns, filters=filters)
+        record(etapa, df)
+    return df
+
+
+# -------------------------------
+# 🔹 Tabelas básicas
+# -------------------------------
+TEAM_QUERY = "SELECT team_api_id, team_long_name FROM Team"
+LEAGUE_QUERY = "SELECT id AS league_id, name AS league_name FROM League"
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _teams(versao: tuple) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        return _read_columnar("teams")
+    return apply_schema(_read_sql(TEAM_QUERY))
+
+
+@timed("times")
+def load_teams() -> pd.DataFrame:
+    """Times: ``team_api_id``, ``team_long_name``."""
+    return _teams(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _leagues(versao: tuple) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        return _read_columnar("leagues")
+    return apply_schema(_read_sql(LEAGUE_QUERY))
+
+
+@timed("ligas")
+def load_leagues() -> pd.DataFrame:
+    """Ligas: ``league_id``, ``league_name``."""
+    return _leagues(db_signature())
+
+
+# -------------------------------
+# 🔹 Partidas
+# -------------------------------
+MATCH_QUERY = """
+SELECT
+    M.match_api_id,
+    M.league_id,
+    L.name AS league_name,
+    M.season,
+    M.stage,
+    M.date,
+    M.home_team_api_id,
+    M.away_team_api_id,
+    M.home_team_goal,
+    M.away_team_goal
+FROM Match M
+JOIN League L ON M.league_id = L.id
+"""
+
+
+def add_team_names(matches: pd.DataFrame, teams: pd.DataFrame) -> pd.DataFrame:
+    """
+    Acrescenta ``team_home`` e ``team_away`` a partidas lidas com ``MATCH_QUERY``,
+    como categorias com o mesmo conjunto de nomes.
+    """
+    nomes = teams.set_index("team_api_id")["team_long_name"]
+    tipo = team_name_dtype(teams)
+    matches["team_home"] = matches["home_team_api_id"].map(nomes).astype(tipo)
+    matches["team_away"] = matches["away_team_api_id"].map(nomes).astype(tipo)
+    return matches
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+@cache_miss
+def _matches(versao: tuple, league_id, seasons) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        filtros = []
+        if league_id is not None:
+            filtros.append(("league_id", "=", league_id))
+        if seasons is not None:
+            filtros.append(("season", "in", list(seasons)))
+        return _read_columnar("matches", filters=filtros or None)
+
+    query = MATCH_QUERY
+    params = {}
+    filtros = []
+    if league_id is not None:
+        filtros.append("M.league_id = :league_id")
+        params["league_id"] = league_id
+    if seasons is not None:
+        filtros.append("M.season IN :seasons")
+        params["seasons"] = list(seasons)
+    if filtros:
+        query += "WHERE " + " AND ".join(filtros)
+
+    stmt = text(query)
+    if seasons is not None:
+        stmt = stmt.bindparams(bindparam("seasons", expanding=True))
+    return add_team_names(apply_schema(_read_sql(stmt, params)), _teams(versao))
+
+
+@timed("partidas")
+def load_matches(league_id: int = None, seasons=None) -> pd.DataFrame:
+    """
+    Partidas com o nome da liga e dos dois times (``team_home``, ``team_away``).
+
+    ``league_id`` e ``seasons`` viram filtros na própria consulta SQL; sem eles,
+    todas as partidas são devolvidas.
+    """
+    if league_id is not None:
+        league_id = int(league_id)
+    if seasons is not None:
+        seasons = tuple(sorted(seasons))
+    return _matches(db_signature(), league_id, seasons)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _seasons(versao: tuple) -> dict:
+    if BACKEND == "columnar":
+        seasons = _read_columnar("matches", columns=["league_id", "season"]).drop_duplicates()
+        seasons = seasons.astype({"season": str}).sort_values(["league_id", "season"])
+    else:
+        seasons = _read_sql("SELECT DISTINCT league_id, season FROM Match ORDER BY league_id, season")
+    return seasons.groupby("league_id")["season"].apply(list).to_dict()
+
+
+@timed("temporadas")
+def load_seasons(league_id: int) -> list:
+    """Temporadas disponíveis para a liga, em ordem."""
+    return _seasons(db_signature()).get(int(league_id), [])
+
+
+# -------------------------------
+# 🔹 Agregados da liga e dos times (pré-calculados com python -m dashboard.precompute)
+# -------------------------------
+SUMMARY_TABLES = {
+    "standings": "Agg_Standings",
+    "rounds": "Agg_Round_Stats",
+    "goal_bands": "Agg_Goal_Bands",
+}
+BUILD_STATE_TABLE = "Agg_Build_State"
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+@cache_miss
+def _league_summary(versao: tuple, league_id, seasons):
+    tabelas = [*SUMMARY_TABLES.values(), BUILD_STATE_TABLE]
+    if not all(has_table(tabela) for tabela in tabelas):
+        return None
+
+    prontas = _read_sql(
+        text(f"SELECT season FROM {BUILD_STATE_TABLE} WHERE league_id = :league_id"),
+        {"league_id": league_id},
+    )
+    if not set(seasons) <= set(prontas["season"]):
+        return None
+
+    resumo = {}
+    for chave, tabela in SUMMARY_TABLES.items():
+        stmt = text(
+            f"SELECT * FROM {tabela} WHERE league_id = :league_id AND season IN :seasons"
+        ).bindparams(bindparam("seasons", expanding=True))
+        resumo[chave] = _read_sql(stmt, {"league_id": league_id, "seasons": list(seasons)})
+    return resumo
+
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+@cache_miss
+def _season_summary(versao: tuple, league_id, season) -> dict:
+    return league_summary(_matches(versao, league_id, (season,)))
+
+
+@timed("agregados da liga")
+def load_league_summary(league_id: int, seasons) -> dict:
+    """
+    Agregados da visão geral (classificação, rodadas, faixas de gols) por temporada.
+
+    Lidos das tabelas ``Agg_*`` quando todas as temporadas foram pré-calculadas;
+    senão calculados a partir das partidas, com cache por temporada: acrescentar
+    uma temporada à seleção só calcula a nova.
+    """
+    versao = db_signature()
+    league_id = int(league_id)
+    seasons = tuple(sorted(seasons))
+    resumo = _league_summary(versao, league_id, seasons)
+    if resumo is not None:
+        return resumo
+    if not seasons:
+        return league_summary(_matches(versao, league_id, seasons))
+    partes = [_season_summary(versao, league_id, season) for season in seasons]
+    return {chave: pd.concat([parte[chave] for parte in partes], ignore_index=True) for chave in SUMMARY_TABLES}
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+@cache_miss
+def _team_stats(versao: tuple, league_id, seasons) -> pd.DataFrame:
+    return team_stats(_matches(versao, league_id, seasons))
+
+
+@timed("estatísticas dos times")
+def load_team_stats(league_id: int, seasons) -> pd.DataFrame:
+    """``team_stats`` das partidas da liga/temporadas, calculado uma vez por seleção."""
+    return _team_stats(db_signature(), int(league_id), tuple(sorted(seasons)))
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+@cache_miss
+def _head_to_head(versao: tuple, league_id, seasons) -> pd.DataFrame:
+    return head_to_head(_matches(versao, league_id, seasons))
+
+
+@timed("confrontos")
+def load_head_to_head(league_id: int, seasons) -> pd.DataFrame:
+    """``head_to_head`` de todos os pares de times da liga/temporadas (uma linha por time × adversário)."""
+    return _head_to_head(db_signature(), int(league_id), tuple(sorted(seasons)))
+
+
+# Confronto direto por par de times, em todas as ligas/temporadas (python -m dashboard.precompute)
+HEAD_TO_HEAD_TABLE = "Head_To_Head"
+
+
+def _pair_matches(versao: tuple, team_ids=None, match_ids=None) -> pd.DataFrame:
+    """Partidas entre os dois times de ``team_ids`` ou com os ids de ``match_ids``."""
+    if BACKEND == "columnar":
+        if match_ids is not None:
+            return _read_columnar("matches", filters=[("match_api_id", "in", list(match_ids))])
+        a, b = team_ids
+        return _read_columnar("matches", filters=[
+            [("home_team_api_id", "=", a), ("away_team_api_id", "=", b)],
+            [("home_team_api_id", "=", b), ("away_team_api_id", "=", a)],
+        ])
+    if match_ids is not None:
+        stmt = text(MATCH_QUERY + "WHERE M.match_api_id IN :ids").bindparams(bindparam("ids", expanding=True))
+        params = {"ids": list(match_ids)}
+    else:
+        stmt = text(
+            MATCH_QUERY
+            + "WHERE (M.home_team_api_id = :a AND M.away_team_api_id = :b)"
+            + " OR (M.home_team_api_id = :b AND M.away_team_api_id = :a)"
+        )
+        params = {"a": team_ids[0], "b": team_ids[1]}
+    return add_team_names(apply_schema(_read_sql(stmt, params)), _teams(versao))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2048)
+@cache_miss
+def _pair(versao: tuple, team_a: int, team_b: int):
+    if has_table(HEAD_TO_HEAD_TABLE):
+        # Busca pela chave primária do par
+        par = _read_sql(
+            text(f"SELECT * FROM {HEAD_TO_HEAD_TABLE} WHERE team_a_api_id = :a AND team_b_api_id = :b"),
+            {"a": team_a, "b": team_b},
+        )
+    else:
+        par = pair_index(_pair_matches(versao, team_ids=(team_a, team_b)))
+    return None if par.empty else par.iloc[0]
+
+
+@timed("confronto direto")
+def load_pair(team1_api_id: int, team2_api_id: int):
+    """
+    Confronto direto entre dois times em todas as ligas e temporadas, do ponto de
+    vista do primeiro: ``dict`` com partidas, vitorias, empates, derrotas,
+    gols_marcados, gols_sofridos e match_ids (lista, em ordem de data), ou ``None``
+    se nunca se enfrentaram.
+    """
+    team1_api_id, team2_api_id = int(team1_api_id), int(team2_api_id)
+    a, b = sorted((team1_api_id, team2_api_id))
+    par = _pair(db_signature(), a, b)
+    if par is None:
+        return None
+    lado, outro = ("a", "b") if team1_api_id == a else ("b", "a")
+    return {
+        "partidas": int(par["partidas"]),
+        "vitorias": int(par[f"vitorias_{lado}"]),
+        "empates": int(par["empates"]),
+        "derrotas": int(par[f"vitorias_{outro}"]),
+        "gols_marcados": int(par[f"gols_{lado}"]),
+        "gols_sofridos": int(par[f"gols_{outro}"]),
+        "match_ids": [int(i) for i in par["match_ids"].split(",")],
+    }
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _matches_by_id(versao: tuple, match_ids: tuple) -> pd.DataFrame:
+    return _pair_matches(versao, match_ids=match_ids).sort_values("date").reset_index(drop=True)
+
+
+@timed("partidas por id")
+def load_matches_by_id(match_ids) -> pd.DataFrame:
+    """Partidas (mesmas colunas de ``load_matches``) com os ``match_api_id`` pedidos, em ordem de data."""
+    return _matches_by_id(db_signature(), tuple(int(i) for i in match_ids))
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _standings_evolution(versao: tuple, league_id, season) -> pd.DataFrame:
+    return standings_evolution(_matches(versao, league_id, (season,)))
+
+
+@timed("evolução da classificação")
+def load_standings_evolution(league_id: int, season: str) -> pd.DataFrame:
+    """Classificação ao fim de cada rodada de uma temporada (``standings_evolution``)."""
+    return _standings_evolution(db_signature(), int(league_id), str(season))
+
+
+# -------------------------------
+# 🔹 Eventos das partidas
+# -------------------------------
+# Colunas XML de Match e tabelas geradas a partir delas (python -m dashboard.events)
+EVENT_COLUMNS = ["goal", "shoton", "shotoff", "foulcommit", "card", "cross", "corner", "possession"]
+EVENTS_TABLE = "Match_Events"
+POSSESSION_TABLE = "Match_Possession"
+EVENTS_STATE_TABLE = "Match_Events_State"
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+@cache_miss
+def _team_events(versao: tuple, league_id, seasons) -> pd.DataFrame:
+    def consulta(tabela, colunas):
+        stmt = text(
+            f"SELECT {colunas} FROM {tabela} E JOIN Match M ON M.match_api_id = E.match_api_id "
+            "WHERE M.league_id = :league_id AND M.season IN :seasons"
+        ).bindparams(bindparam("seasons", expanding=True))
+        return _read_sql(stmt, {"league_id": league_id, "seasons": list(seasons)})
+
+    eventos = consulta(EVENTS_TABLE, "E.match_api_id, E.type, E.team_api_id, E.detail")
+    posse = consulta(POSSESSION_TABLE, "E.match_api_id, E.minute, E.home_pos, E.away_pos")
+    return team_event_stats(_matches(versao, league_id, seasons), eventos, posse)
+
+
+@timed("eventos por time")
+def load_team_events(league_id: int, seasons):
+    """
+    Chutes, cartões, escanteios, faltas e posse média de cada time na liga/temporadas
+    (``team_event_stats``), ou ``None`` se as tabelas de eventos não existirem.
+    """
+    if not has_table(EVENTS_TABLE):
+        return None
+    return _team_events(db_signature(), int(league_id), tuple(sorted(seasons)))
+
+
+# -------------------------------
+# 🔹 Rating Elo (checkpoints em Match_Elo, gravados por python -m dashboard.precompute)
+# -------------------------------
+ELO_TABLE = "Match_Elo"
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _elo_ratings(versao: tuple) -> pd.DataFrame:
+    partidas = _matches(versao, None, None)
+    if not has_table(ELO_TABLE):
+        with stage("Elo"):
+            return elo_ratings(partidas)
+    gravadas = apply_schema(_read_sql(f"SELECT * FROM {ELO_TABLE}"))
+    # Partidas que entraram depois do último build: só a cauda é recalculada
+    with stage("Elo (incremental)"):
+        inicio, novas = incremental(partidas, gravadas)
+    if inicio is None:
+        return gravadas
+    return pd.concat([gravadas[gravadas["date"] < inicio], novas], ignore_index=True)
+
+
+@timed("Elo")
+def load_elo_ratings() -> pd.DataFrame:
+    """Elo dos dois times antes e depois de cada partida do histórico (colunas de ``dashboard.elo.RATING_COLUMNS``)."""
+    return _elo_ratings(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _elo_history(versao: tuple, team_ids: tuple) -> pd.DataFrame:
+    historico = team_ratings(_elo_ratings(versao))
+    historico = historico[historico["team_api_id"].isin(team_ids)]
+    nomes = _teams(versao).set_index("team_api_id")["team_long_name"]
+    return historico.assign(Time=historico["team_api_id"].map(nomes)).reset_index(drop=True)
+
+
+@timed("histórico de Elo")
+def load_elo_history(team_api_ids) -> pd.DataFrame:
+    """Elo de cada time pedido depois de cada partida: ``date``, ``team_api_id``, ``Time`` e ``Elo``."""
+    return _elo_history(db_signature(), tuple(sorted(int(i) for i in team_api_ids)))
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+@cache_miss
+def _league_elo(versao: tuple, league_id, seasons) -> pd.Series:
+    partidas = _matches(versao, league_id, seasons)
+    elo = latest_ratings(_elo_ratings(versao), partidas["match_api_id"])
+    nomes = _teams(versao).set_index("team_api_id")["team_long_name"]
+    return elo.set_axis(elo.index.map(nomes)).round().astype("int32")
+
+
+@timed("Elo da liga")
+def load_league_elo(league_id: int, seasons) -> pd.Series:
+    """Elo de cada time (índice: nome) ao fim da sua última partida na liga/temporadas."""
+    return _league_elo(db_signature(), int(league_id), tuple(sorted(seasons)))
+
+
+# -------------------------------
+# 🔹 Perfil tático dos times (Team_Attributes na data de cada partida)
+# -------------------------------
+TEAM_ATTRIBUTES_QUERY = f"""
+SELECT team_api_id, date, {", ".join(TEAM_ATTRIBUTE_COLUMNS)}
+FROM Team_Attributes
+"""
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _team_attribute_index(versao: tuple) -> TeamAttributeIndex:
+    if BACKEND == "columnar":
+        snapshots = _read_columnar("team_attributes")
+    else:
+        snapshots = apply_schema(_read_sql(TEAM_ATTRIBUTES_QUERY))
+    return TeamAttributeIndex(snapshots)
+
+
+@timed("índice de atributos dos times")
+def load_team_attribute_index() -> TeamAttributeIndex:
+    """Snapshots de ``Team_Attributes`` ordenados para o as-of join, uma vez por versão do banco."""
+    return _team_attribute_index(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=512)
+@cache_miss
+def _season_team_attributes(versao: tuple, league_id, season) -> pd.DataFrame:
+    with stage("as-of join (atributos dos times)"):
+        return _team_attribute_index(versao).attach(_matches(versao, league_id, (season,)))
+
+
+@timed("atributos dos times nas partidas")
+def load_match_team_attributes(league_id: int, seasons) -> pd.DataFrame:
+    """
+    Partidas da liga/temporadas (``load_matches``) com o snapshot de
+    ``Team_Attributes`` de cada time na data do jogo (``TeamAttributeIndex.attach``).
+
+    O join é feito e guardado por temporada, à parte de ``load_matches``:
+    acrescentar uma temporada à seleção só junta a nova.
+    """
+    versao = db_signature()
+    league_id = int(league_id)
+    partes = [_season_team_attributes(versao, league_id, season) for season in sorted(seasons)]
+    if not partes:
+        return _team_attribute_index(versao).attach(_matches(versao, league_id, ()))
+    return pd.concat(partes, ignore_index=True)
+
+
+# -------------------------------
+# 🔹 Odds das casas de apostas
+# -------------------------------
+ODDS_QUERY = f"SELECT match_api_id, {', '.join(ODDS_COLUMNS)} FROM Match"
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _match_probabilities(versao: tuple) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        odds = _read_columnar("match_odds")
+    else:
+        odds = apply_schema(_read_sql(ODDS_QUERY))
+    with stage("probabilidades implícitas"):
+        return match_probabilities(_matches(versao, None, None).merge(odds, on="match_api_id"))
+
+
+@timed("probabilidades das odds")
+def load_match_probabilities() -> pd.DataFrame:
+    """
+    Probabilidades de consenso das casas de apostas de todas as partidas com odds
+    (``match_probabilities``), calculadas de uma vez para o histórico inteiro.
+    """
+    return _match_probabilities(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _odds_calibration(versao: tuple, league_ids, seasons, by) -> dict:
+    probs = _filter_seasons(_match_probabilities(versao), league_ids, seasons)
+    return {"calibracao": calibration(probs, by), "qualidade": accuracy(probs, by)}
+
+
+@timed("calibração das odds")
+def load_odds_calibration(league_ids, seasons, by: str = None) -> dict:
+    """
+    Curva de calibração (``calibracao``) e Brier/acerto/margem (``qualidade``) por
+    ``by`` (``league_name``, ``season`` ou ``None``) na seleção; cache por filtro.
+    """
+    return _odds_calibration(db_signature(), tuple(sorted(league_ids)), tuple(sorted(seasons)), by)
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _odds_upsets(versao: tuple, league_ids, seasons) -> dict:
+    probs = _filter_seasons(_match_probabilities(versao), league_ids, seasons)
+    return {"times": team_upsets(probs), "partidas": biggest_upsets(probs)}
+
+
+@timed("zebras")
+def load_odds_upsets(league_ids, seasons) -> dict:
+    """Zebras por time (``times``) e as maiores zebras (``partidas``) na seleção; cache por filtro."""
+    return _odds_upsets(db_signature(), tuple(sorted(league_ids)), tuple(sorted(seasons)))
+
+
+# -------------------------------
+# 🔹 Jogadores
+# -------------------------------
+PLAYER_QUERY = "SELECT player_api_id, player_name, birthday, height, weight FROM Player"
+PLAYER_ATTRIBUTES_QUERY = f"""
+SELECT player_api_id, date, {", ".join(PLAYER_ATTRIBUTE_COLUMNS)}
+FROM Player_Attributes
+"""
+# O snapshot colunar guarda também o ``id``: desempate entre snapshots da mesma data
+PLAYER_ATTRIBUTES_EXPORT_QUERY = f"""
+SELECT id, player_api_id, date, {", ".join(PLAYER_ATTRIBUTE_COLUMNS)}
+FROM Player_Attributes
+"""
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _players(versao: tuple) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        return _read_columnar("players")
+    return apply_schema(_read_sql(PLAYER_QUERY))
+
+
+@timed("jogadores")
+def load_players() -> pd.DataFrame:
+    """Jogadores: ``player_api_id``, ``player_name``, ``birthday``, ``height``, ``weight``."""
+    return _players(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _player_index(versao: tuple) -> PlayerSearchIndex:
+    return PlayerSearchIndex(_players(versao))
+
+
+@timed("índice de jogadores")
+def load_player_index() -> PlayerSearchIndex:
+    """Índice de busca por nome de jogador, construído uma vez por versão do banco."""
+    return _player_index(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _player_attributes(versao: tuple) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        return _read_columnar("player_attributes", columns=["player_api_id", "date", *PLAYER_ATTRIBUTE_COLUMNS])
+    return apply_schema(_read_sql(PLAYER_ATTRIBUTES_QUERY))
+
+
+@timed("atributos (histórico)")
+def load_player_attributes() -> pd.DataFrame:
+    """Histórico completo de ``Player_Attributes`` (um snapshot por data)."""
+    return _player_attributes(db_signature())
+
+
+# Uma linha por jogador com o snapshot mais recente (python -m dashboard.precompute)
+LATEST_ATTRIBUTES_TABLE = "Player_Latest_Attributes"
+_LATEST_COLUMNS = ", ".join(["player_api_id", "date", *PLAYER_ATTRIBUTE_COLUMNS])
+LATEST_ATTRIBUTES_QUERY = f"""
+SELECT {_LATEST_COLUMNS} FROM (
+    SELECT {_LATEST_COLUMNS}, ROW_NUMBER() OVER (
+        PARTITION BY player_api_id ORDER BY date DESC, id DESC
+    ) AS ordem
+    FROM Player_Attributes
+)
+WHERE ordem = 1
+"""
+
+
+@st.cache_resource(show_spinner=False, max_entries=2048)
+@cache_miss
+def _latest_attributes(versao: tuple, player_api_id: int):
+    if BACKEND == "columnar":
+        historico = _read_columnar(
+            "player_attributes",
+            columns=["id", "player_api_id", "date", *PLAYER_ATTRIBUTE_COLUMNS],
+            filters=[("player_api_id", "=", player_api_id)],
+        )
+        # Mesmo desempate de LATEST_ATTRIBUTES_QUERY: data e, na mesma data, o maior id
+        latest = historico.sort_values(["date", "id"], kind="stable").tail(1).drop(columns="id")
+    elif has_table(LATEST_ATTRIBUTES_TABLE):
+        latest = _read_sql(
+            text(f"SELECT * FROM {LATEST_ATTRIBUTES_TABLE} WHERE player_api_id = :player_api_id"),
+            {"player_api_id": player_api_id},
+        )
+    else:
+        latest = _read_sql(
+            text(f"""
+            SELECT player_api_id, date, {", ".join(PLAYER_ATTRIBUTE_COLUMNS)}
+            FROM Player_Attributes
+            WHERE player_api_id = :player_api_id
+            ORDER BY date DESC, id DESC
+            LIMIT 1
+            """),
+            {"player_api_id": player_api_id},
+        )
+    if latest.empty:
+        return None
+    # Uma linha só: atributos como float, com NaN (e não pd.NA) quando faltam
+    return latest.astype({col: "float64" for col in PLAYER_ATTRIBUTE_COLUMNS}).iloc[0]
+
+
+@timed("atributos do jogador")
+def load_latest_attributes(player_api_id: int):
+    """
+    Snapshot mais recente de ``Player_Attributes`` do jogador (``pd.Series``),
+    ou ``None`` se não houver nenhum. Lê só as linhas do jogador.
+    """
+    return _latest_attributes(db_signature(), int(player_api_id))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2048)
+@cache_miss
+def _attribute_history(versao: tuple, player_api_id: int) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        historico = _read_columnar(
+            "player_attributes",
+            columns=["date", *PLAYER_ATTRIBUTE_COLUMNS],
+            filters=[("player_api_id", "=", player_api_id)],
+        )
+    else:
+        # Coberto por idx_player_attributes_player_date: só as linhas do jogador
+        historico = apply_schema(_read_sql(
+            text(f"""
+            SELECT date, {", ".join(PLAYER_ATTRIBUTE_COLUMNS)}
+            FROM Player_Attributes
+            WHERE player_api_id = :player_api_id
+            """),
+            {"player_api_id": player_api_id},
+        ))
+    return historico.sort_values("date", kind="stable", ignore_index=True)
+
+
+@timed("histórico do jogador")
+def load_attribute_history(player_api_id: int) -> pd.DataFrame:
+    """
+    Todos os snapshots de ``Player_Attributes`` do jogador, em ordem de data
+    (``date`` e os atributos). Lê só as linhas do jogador; cache por jogador.
+    """
+    return _attribute_history(db_signature(), int(player_api_id))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _similarity_index(versao: tuple) -> SimilarityIndex:
+    if BACKEND == "columnar":
+        latest = _read_columnar("player_attributes", columns=["id", "player_api_id", "date", *PLAYER_ATTRIBUTE_COLUMNS])
+        latest = latest.sort_values(["date", "id"], kind="stable")
+        latest = latest.drop_duplicates("player_api_id", keep="last").drop(columns="id")
+    elif has_table(LATEST_ATTRIBUTES_TABLE):
+        latest = apply_schema(_read_sql(f"SELECT * FROM {LATEST_ATTRIBUTES_TABLE}"))
+    else:
+        latest = apply_schema(_read_sql(LATEST_ATTRIBUTES_QUERY))
+    return SimilarityIndex(latest, _players(versao))
+
+
+@timed("índice de semelhança")
+def load_similarity_index() -> SimilarityIndex:
+    """Matriz padronizada dos atributos mais recentes de todos os jogadores, para ``similar``."""
+    return _similarity_index(db_signature())
+
+
+@st.cache_resource(show_spinner=False, max_entries=4096)
+@cache_miss
+def _attribute_timeline(versao: tuple, player_api_id: int, columns: tuple, max_points: int) -> pd.DataFrame:
+    return downsample_history(_attribute_history(versao, player_api_id), list(columns), max_points)
+
+
+@timed("evolução do jogador")
+def load_attribute_timeline(player_api_id: int, columns, max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """
+    Evolução de ``columns`` do jogador já reduzida para o gráfico (média mensal
+    + LTTB): colunas ``date``, ``Atributo``, ``Valor``. Cache por jogador/atributos.
+    """
+    return _attribute_timeline(db_signature(), int(player_api_id), tuple(columns), int(max_points))
+
+
+# -------------------------------
+# 🔹 Distribuição dos atributos
+# -------------------------------
+_ESCALACOES = "\n    UNION ALL\n    ".join(
+    f"SELECT {lado}_player_{i} AS player_api_id, league_id, season, date FROM Match"
+    for lado in ("home", "away") for i in range(1, 12)
+)
+# Uma linha por jogador escalado em cada liga/temporada, com a data da última partida
+PLAYER_SEASONS_QUERY = f"""
+SELECT player_api_id, league_id, season, MAX(date) AS date FROM (
+    {_ESCALACOES}
+)
+WHERE player_api_id IS NOT NULL
+GROUP BY player_api_id, league_id, season
+"""
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+@cache_miss
+def _player_season_attributes(versao: tuple) -> pd.DataFrame:
+    if BACKEND == "columnar":
+        temporadas = _read_columnar("player_seasons")
+    else:
+        temporadas = apply_schema(_read_sql(PLAYER_SEASONS_QUERY))
+    with stage("atributos por temporada"):
+        df = player_season_attributes(temporadas, _player_attributes(versao))
+        nomes = _leagues(versao).set_index("league_id")["league_name"]
+        df["league_name"] = df["league_id"].map(nomes).astype("category")
+    return df
+
+
+@timed("atributos por liga/temporada")
+def load_player_season_attributes() -> pd.DataFrame:
+    """
+    Atributos de cada jogador em cada liga/temporada em que foi escalado:
+    ``player_api_id``, ``league_id``, ``league_name``, ``season``, ``date`` e os
+    atributos (snapshot mais próximo da última partida da temporada).
+    """
+    return _player_season_attributes(db_signature())
+
+
+def _filter_seasons(df: pd.DataFrame, league_ids, seasons) -> pd.DataFrame:
+    return df[df["league_id"].isin(league_ids) & df["season"].isin(seasons)]
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _attribute_histograms(versao: tuple, column, by, league_ids, seasons, bin_width) -> pd.DataFrame:
+    df = _filter_seasons(_player_season_attributes(versao), league_ids, seasons)
+    return histograms(df, column, by, bin_width)
+
+
+@timed("histogramas")
+def load_attribute_histograms(column: str, by: str, league_ids, seasons, bin_width: int = 5) -> pd.DataFrame:
+    """Histograma de ``column`` por ``by`` (ex.: ``league_name``) na seleção; cache por filtro."""
+    return _attribute_histograms(
+        db_signature(), column, by, tuple(sorted(league_ids)), tuple(sorted(seasons)), int(bin_width)
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+@cache_miss
+def _attribute_density(versao: tuple, x, y, league_ids, seasons, bin_width) -> pd.DataFrame:
+    df = _filter_seasons(_player_season_attributes(versao), league_ids, seasons)
+    return histogram2d(df, x, y, bin_width)
+
+
+@timed("densidade 2D")
+def load_attribute_density(x: str, y: str, league_ids, seasons, bin_width: int = 5) -> pd.DataFrame:
+    """Grade de contagens ``y`` × ``x`` (``histogram2d``) na seleção; cache por filtro."""
+    return _attribute_density(
+        db_signature(), x, y, tuple(sorted(league_ids)), tuple(sorted(seasons)), int(bin_width)
+    )
@@ -0,0 +1,88 @@
+"""
+Distribuição dos atributos dos jogadores por liga e temporada.
+
+Cada jogador entra uma vez por liga/temporada em que foi escalado, com o
+snapshot de ``Player_Attributes`` mais próximo da sua última partida naquela
+temporada. Os gráficos nunca recebem essas linhas: os histogramas (por grupo)
+e as grades 2D são contados aqui com ``np.bincount`` e só as contagens vão
+para o Plotly, então o tamanho do gráfico depende do número de faixas, não do
+número de jogadores.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Atributos vão de 0 a 100
+VALOR_MAXIMO = 100
+
+
+def player_season_attributes(player_seasons: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """
+    Atributos de cada jogador em cada liga/temporada.
+
+    ``player_seasons`` tem ``player_api_id``, ``league_id``, ``season`` e ``date``
+    (última partida do jogador na temporada); ``history`` é o histórico de
+    ``Player_Attributes``. Usa o snapshot mais próximo de ``date``.
+    """
+    esquerda = player_seasons.dropna(subset=["date"]).sort_values("date", kind="stable")
+    direita = history.dropna(subset=["date"]).sort_values("date", kind="stable")
+    combinado = pd.merge_asof(
+        esquerda,
+        direita.rename(columns={"date": "snapshot"}),
+        left_on="date",
+        right_on="snapshot",
+        by="player_api_id",
+        direction="nearest",
+    )
+    return combinado.dropna(subset=["snapshot"]).drop(columns="snapshot").reset_index(drop=True)
+
+
+def _n_bins(bin_width: int) -> int:
+    return -(-VALOR_MAXIMO // bin_width)
+
+
+def _bins(values: pd.Series, bin_width: int) -> np.ndarray:
+    """Faixa de cada valor (``-1`` para ausentes); a última faixa inclui o 100."""
+    valores = values.to_numpy(dtype="float64", na_value=np.nan)
+    faixas = np.minimum(valores // bin_width, _n_bins(bin_width) - 1)
+    return np.where(np.isnan(valores), -1, faixas).astype(np.int64)
+
+
+def histograms(df: pd.DataFrame, column: str, by: str, bin_width: int = 5) -> pd.DataFrame:
+    """
+    Histograma de ``column`` para cada valor de ``by`` numa única contagem.
+
+    Colunas: ``by``, ``Faixa`` (início da faixa), ``Jogadores`` e ``Percentual``
+    (dentro do grupo).
+    """
+    n_faixas = _n_bins(bin_width)
+    faixas = _bins(df[column], bin_width)
+    grupos, nomes = pd.factorize(df[by], sort=True)
+    validos = (faixas >= 0) & (grupos >= 0)
+    contagem = np.bincount(
+        grupos[validos] * n_faixas + faixas[validos], minlength=len(nomes) * n_faixas
+    ).reshape(len(nomes), n_faixas)
+    totais = contagem.sum(axis=1, keepdims=True)
+    percentual = np.divide(contagem * 100, totais, out=np.zeros(contagem.shape), where=totais > 0)
+    return pd.DataFrame({
+        by: np.repeat(np.asarray(nomes), n_faixas),
+        "Faixa": np.tile(np.arange(n_faixas) * bin_width, len(nomes)),
+        "Jogadores": contagem.ravel(),
+        "Percentual": percentual.ravel().round(2),
+    })
+
+
+def histogram2d(df: pd.DataFrame, x: str, y: str, bin_width: int = 5) -> pd.DataFrame:
+    """
+    Contagem de jogadores em cada célula ``(faixa de x, faixa de y)``.
+
+    Grade completa (células vazias com zero): índice = início das faixas de
+    ``y``, colunas = início das faixas de ``x``.
+    """
+    n_faixas = _n_bins(bin_width)
+    fx = _bins(df[x], bin_width)
+    fy = _bins(df[y], bin_width)
+    validos = (fx >= 0) & (fy >= 0)
+    grade = np.bincount(fy[validos] * n_faixas + fx[validos], minlength=n_faixas * n_faixas)
+    inicios = np.arange(n_faixas) * bin_width
+    return pd.DataFrame(grade.reshape(n_faixas, n_faixas), index=inicios, columns=inicios)
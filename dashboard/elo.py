@@ -0,0 +1,163 @@
+"""
+Rating Elo dos times ao longo de todo o histórico de partidas.
+
+As partidas são processadas em ordem de data, uma data por vez: todas as
+partidas do mesmo dia usam os ratings do início do dia e as variações do dia
+são aplicadas juntas (operações sobre arrays, sem laço por partida). Cada
+partida recebe o Elo dos dois times antes e depois do jogo.
+
+O estado de um time ao fim de cada data é o seu Elo "antes" naquele dia mais as
+variações de todas as suas partidas do dia (uma só, nos dados reais), então as
+próprias linhas calculadas servem de checkpoint: quando entram (ou mudam)
+partidas, ``incremental`` recupera o estado do dia anterior à primeira partida
+alterada e processa só a cauda a partir dali.
+"""
+
+import numpy as np
+import pandas as pd
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+# Pontos somados ao mandante no cálculo do resultado esperado
+HOME_ADVANTAGE = 100.0
+
+# Colunas da partida que entram no cálculo (e na impressão digital de cada partida)
+INPUT_COLUMNS = [
+    "match_api_id", "date", "home_team_api_id", "away_team_api_id", "home_team_goal", "away_team_goal",
+]
+RATING_COLUMNS = [
+    "match_api_id", "date", "home_team_api_id", "away_team_api_id",
+    "home_elo_pre", "away_elo_pre", "home_elo_post", "away_elo_post", "fingerprint",
+]
+
+
+def fingerprints(matches: pd.DataFrame) -> np.ndarray:
+    """Hash ``int64`` das colunas de ``INPUT_COLUMNS`` de cada partida (independe dos tipos lidos)."""
+    normalizado = pd.DataFrame({
+        col: (pd.to_datetime(matches[col]) if col == "date" else matches[col]).to_numpy(dtype="int64")
+        for col in INPUT_COLUMNS
+    })
+    return pd.util.hash_pandas_object(normalizado, index=False).to_numpy(dtype="uint64").view("int64")
+
+
+def _goal_multiplier(saldo: np.ndarray) -> np.ndarray:
+    """Peso pelo saldo de gols (Elo do futebol mundial): 1, 1,5 e (11 + saldo) / 8."""
+    saldo = np.abs(saldo)
+    return np.where(saldo <= 1, 1.0, np.where(saldo == 2, 1.5, (11 + saldo) / 8))
+
+
+def elo_ratings(matches: pd.DataFrame, state: dict = None) -> pd.DataFrame:
+    """
+    Elo antes e depois de cada partida de ``matches`` (colunas ``INPUT_COLUMNS``).
+
+    ``state`` é o rating de cada time antes da primeira partida (``team_api_id``
+    → rating); times fora dele começam com ``INITIAL_RATING``. Devolve as
+    colunas de ``RATING_COLUMNS`` em ordem de data.
+    """
+    partidas = matches.dropna(subset=["date"]).sort_values(["date", "match_api_id"], kind="stable")
+    casa = partidas["home_team_api_id"].to_numpy(dtype="int64")
+    fora = partidas["away_team_api_id"].to_numpy(dtype="int64")
+    times, codigos = np.unique(np.concatenate([casa, fora]), return_inverse=True)
+    h, a = codigos[:len(casa)], codigos[len(casa):]
+
+    state = state or {}
+    ratings = np.array([state.get(int(time), INITIAL_RATING) for time in times], dtype="float64")
+    saldo = partidas["home_team_goal"].to_numpy(dtype="int64") - partidas["away_team_goal"].to_numpy(dtype="int64")
+    pontuacao = np.where(saldo > 0, 1.0, np.where(saldo == 0, 0.5, 0.0))
+    peso = K_FACTOR * _goal_multiplier(saldo)
+
+    pre_casa = np.empty(len(partidas))
+    pre_fora = np.empty(len(partidas))
+    delta = np.empty(len(partidas))
+    datas = partidas["date"].to_numpy()
+    # Limites de cada data nas partidas ordenadas
+    limites = np.flatnonzero(np.r_[True, datas[1:] != datas[:-1], True])
+    for inicio, fim in zip(limites[:-1], limites[1:]):
+        dia = slice(inicio, fim)
+        pre_casa[dia] = ratings[h[dia]]
+        pre_fora[dia] = ratings[a[dia]]
+        esperado = 1 / (1 + 10 ** ((pre_fora[dia] - pre_casa[dia] - HOME_ADVANTAGE) / 400))
+        delta[dia] = peso[dia] * (pontuacao[dia] - esperado)
+        # add.at: um time com duas partidas no mesmo dia recebe as duas variações
+        np.add.at(ratings, h[dia], delta[dia])
+        np.add.at(ratings, a[dia], -delta[dia])
+
+    return pd.DataFrame({
+        "match_api_id": partidas["match_api_id"].to_numpy(),
+        "date": datas,
+        "home_team_api_id": casa,
+        "away_team_api_id": fora,
+        "home_elo_pre": pre_casa,
+        "away_elo_pre": pre_fora,
+        "home_elo_post": pre_casa + delta,
+        "away_elo_post": pre_fora - delta,
+        "fingerprint": fingerprints(partidas),
+    })
+
+
+def team_ratings(ratings: pd.DataFrame) -> pd.DataFrame:
+    """Elo de cada time depois de cada partida: ``match_api_id``, ``date``, ``team_api_id`` e ``Elo``, em ordem de data."""
+    long = pd.DataFrame({
+        "match_api_id": np.tile(ratings["match_api_id"].to_numpy(), 2),
+        "date": np.tile(ratings["date"].to_numpy(), 2),
+        "team_api_id": np.concatenate([ratings["home_team_api_id"], ratings["away_team_api_id"]]),
+        "Elo": np.concatenate([ratings["home_elo_post"], ratings["away_elo_post"]]),
+    })
+    return long.sort_values(["date", "match_api_id"], kind="stable").reset_index(drop=True)
+
+
+def _end_of_day(ratings: pd.DataFrame) -> pd.Series:
+    """
+    Elo de cada time (índice ``team_api_id``) ao fim do último dia em que jogou
+    em ``ratings``: o Elo "antes" do dia mais as variações de todas as partidas
+    dele no dia (o "depois" de cada partida só tem a variação dela).
+    """
+    long = pd.DataFrame({
+        "date": np.tile(ratings["date"].to_numpy(), 2),
+        "team_api_id": np.concatenate([ratings["home_team_api_id"], ratings["away_team_api_id"]]),
+        "pre": np.concatenate([ratings["home_elo_pre"], ratings["away_elo_pre"]]),
+        "delta": np.concatenate([
+            ratings["home_elo_post"] - ratings["home_elo_pre"],
+            ratings["away_elo_post"] - ratings["away_elo_pre"],
+        ]),
+    })
+    ultimo_dia = long[long["date"] == long.groupby("team_api_id")["date"].transform("max")]
+    grupos = ultimo_dia.groupby("team_api_id")
+    return (grupos["pre"].first() + grupos["delta"].sum()).rename("Elo")
+
+
+def state_before(ratings: pd.DataFrame, date) -> dict:
+    """Checkpoint: Elo de cada time ao fim do seu último dia de jogo anterior a ``date``."""
+    estado = _end_of_day(ratings[ratings["date"] < date])
+    return dict(zip(estado.index.tolist(), estado.tolist()))
+
+
+def incremental(matches: pd.DataFrame, stored: pd.DataFrame):
+    """
+    Atualiza ratings já calculados (``stored``) com as partidas atuais.
+
+    Partidas novas, alteradas ou removidas invalidam ``stored`` a partir da sua
+    data. Devolve ``(inicio, novas)``: a primeira data recalculada (``None`` se
+    nada mudou) e as linhas de todas as partidas a partir dela; as linhas de
+    ``stored`` anteriores a ``inicio`` continuam válidas.
+    """
+    atuais = fingerprints(matches)
+    mudaram = ~np.isin(atuais, stored["fingerprint"].to_numpy())
+    removidas = ~np.isin(stored["fingerprint"].to_numpy(), atuais)
+    datas = pd.concat([
+        pd.to_datetime(matches.loc[mudaram, "date"]),
+        pd.to_datetime(stored.loc[removidas, "date"]),
+    ])
+    if datas.dropna().empty:
+        return None, stored.iloc[:0]
+
+    inicio = datas.min()
+    cauda = matches[pd.to_datetime(matches["date"]) >= inicio]
+    return inicio, elo_ratings(cauda, state_before(stored, inicio))
+
+
+def latest_ratings(ratings: pd.DataFrame, match_ids=None) -> pd.Series:
+    """Elo de cada time (índice ``team_api_id``) depois da sua última partida entre ``match_ids`` (todas sem eles)."""
+    if match_ids is not None:
+        ratings = ratings[ratings["match_api_id"].isin(match_ids)]
+    return _end_of_day(ratings)
@@ -0,0 +1,230 @@
+"""
+ETL dos eventos das partidas (colunas XML de ``Match``).
+
+As colunas ``goal``, ``shoton``, ``shotoff``, ``foulcommit``, ``card``,
+``cross``, ``corner`` e ``possession`` guardam um XML por partida. Este módulo
+converte esses XMLs em duas tabelas normalizadas no próprio banco:
+
+- ``Match_Events``: um evento por linha (``match_api_id``, ``type``, ``minute``,
+  ``extra_minute``, ``team_api_id``, ``player_api_id``, ``player2_api_id``,
+  ``subtype``, ``detail``). ``type`` é a coluna de origem e ``detail`` guarda
+  ``card_type`` (cartões) ou ``goal_type`` (gols);
+- ``Match_Possession``: as leituras de posse (``match_api_id``, ``minute``,
+  ``home_pos``, ``away_pos``).
+
+As partidas pendentes são divididas em blocos de ``CHUNK_SIZE``. Cada processo
+do pool lê do SQLite só o seu bloco, converte os XMLs e grava as linhas num
+arquivo SQLite temporário; o processo principal só copia cada parte para o
+banco (``INSERT ... SELECT``, uma transação por bloco) assim que ela fica pronta.
+Como a parte serial é só essa cópia, o tempo cai quase linearmente com o número
+de processos. O build é incremental: ``Match_Events_State`` registra as partidas já processadas, que
+não são lidas de novo (``--full`` reprocessa tudo).
+
+Uso:
+    python -m dashboard.events [--db data/database.sqlite] [--full] [--workers N]
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+from sqlalchemy import bindparam, create_engine, inspect, text
+
+from dashboard.data import (
+    DB_PATH,
+    EVENT_COLUMNS,
+    EVENTS_STATE_TABLE,
+    EVENTS_TABLE,
+    POSSESSION_TABLE,
+    ensure_indexes,
+)
+
+# Partidas por bloco (uma tarefa do pool e uma transação de escrita)
+CHUNK_SIZE = 2000
+
+EVENT_FIELDS = [
+    "match_api_id", "type", "minute", "extra_minute",
+    "team_api_id", "player_api_id", "player2_api_id", "subtype", "detail",
+]
+POSSESSION_FIELDS = ["match_api_id", "minute", "home_pos", "away_pos"]
+
+TABLES = {
+    EVENTS_TABLE: f"""CREATE TABLE IF NOT EXISTS {EVENTS_TABLE} (
+        match_api_id INTEGER NOT NULL, type TEXT NOT NULL, minute INTEGER, extra_minute INTEGER,
+        team_api_id INTEGER, player_api_id INTEGER, player2_api_id INTEGER, subtype TEXT, detail TEXT
+    )""",
+    POSSESSION_TABLE: f"""CREATE TABLE IF NOT EXISTS {POSSESSION_TABLE} (
+        match_api_id INTEGER NOT NULL, minute INTEGER, home_pos INTEGER, away_pos INTEGER
+    )""",
+    EVENTS_STATE_TABLE: f"CREATE TABLE IF NOT EXISTS {EVENTS_STATE_TABLE} (match_api_id INTEGER PRIMARY KEY)",
+}
+INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS idx_{EVENTS_TABLE.lower()}_match ON {EVENTS_TABLE} (match_api_id)",
+    f"CREATE INDEX IF NOT EXISTS idx_{POSSESSION_TABLE.lower()}_match ON {POSSESSION_TABLE} (match_api_id)",
+]
+
+
+def _int(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_events(match_api_id: int, tipo: str, xml: str) -> list:
+    """Eventos de um XML ``<tipo><value>...</value>...</tipo>`` como tuplas de ``EVENT_FIELDS``."""
+    if not xml:
+        return []
+    eventos = []
+    for valor in ET.fromstring(xml).findall("value"):
+        campos = {filho.tag: filho.text for filho in valor}
+        eventos.append((
+            match_api_id,
+            tipo,
+            _int(campos.get("elapsed")),
+            _int(campos.get("elapsed_plus")),
+            _int(campos.get("team")),
+            _int(campos.get("player1")),
+            _int(campos.get("player2")),
+            campos.get("subtype"),
+            campos.get("card_type") or campos.get("goal_type"),
+        ))
+    return eventos
+
+
+def parse_possession(match_api_id: int, xml: str) -> list:
+    """Leituras de posse de bola como tuplas de ``POSSESSION_FIELDS``."""
+    if not xml:
+        return []
+    leituras = []
+    for valor in ET.fromstring(xml).findall("value"):
+        campos = {filho.tag: filho.text for filho in valor}
+        casa, fora = _int(campos.get("homepos")), _int(campos.get("awaypos"))
+        if casa is not None or fora is not None:
+            leituras.append((match_api_id, _int(campos.get("elapsed")), casa, fora))
+    return leituras
+
+
+def _parse_chunk(db_path: str, match_ids: list, parte: str) -> tuple:
+    """
+    Lê e converte os XMLs de um bloco de partidas e grava as linhas num arquivo
+    SQLite próprio (``parte``). Executado no processo worker: a leitura, a conversão
+    e a gravação rodam em paralelo; o processo principal só junta as partes.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    colunas = ", ".join(f'"{coluna}"' for coluna in EVENT_COLUMNS)
+    stmt = text(f"SELECT match_api_id, {colunas} FROM Match WHERE match_api_id IN :ids").bindparams(
+        bindparam("ids", expanding=True)
+    )
+    with engine.connect() as con:
+        linhas = con.execute(stmt, {"ids": match_ids}).fetchall()
+    engine.dispose()
+
+    eventos, posse = [], []
+    for match_api_id, *xmls in linhas:
+        for tipo, xml in zip(EVENT_COLUMNS, xmls):
+            if tipo == "possession":
+                posse += parse_possession(match_api_id, xml)
+            else:
+                eventos += parse_events(match_api_id, tipo, xml)
+
+    # Arquivo temporário: sem journal nem fsync
+    with closing(sqlite3.connect(parte)) as con:
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        for ddl in TABLES.values():
+            con.execute(ddl)
+        for tabela, campos, valores in (
+            (EVENTS_TABLE, EVENT_FIELDS, eventos),
+            (POSSESSION_TABLE, POSSESSION_FIELDS, posse),
+            (EVENTS_STATE_TABLE, ["match_api_id"], [(match_api_id,) for match_api_id in match_ids]),
+        ):
+            marcadores = ", ".join("?" * len(campos))
+            con.executemany(f"INSERT INTO {tabela} ({', '.join(campos)}) VALUES ({marcadores})", valores)
+        con.commit()
+    return parte, len(match_ids), len(eventos), len(posse)
+
+
+def _merge_chunk(db_path: str, parte: str) -> None:
+    """Copia uma parte para o banco numa transação (as linhas antigas das partidas são substituídas)."""
+    with closing(sqlite3.connect(db_path, timeout=60)) as con:
+        con.execute("ATTACH DATABASE ? AS parte", (parte,))
+        with con:
+            for tabela in TABLES:
+                con.execute(
+                    f"DELETE FROM main.{tabela} WHERE match_api_id IN "
+                    f"(SELECT match_api_id FROM parte.{EVENTS_STATE_TABLE})"
+                )
+                con.execute(f"INSERT INTO main.{tabela} SELECT * FROM parte.{tabela}")
+        con.execute("DETACH DATABASE parte")
+    os.remove(parte)
+
+
+def pending_matches(engine, full: bool = False) -> list:
+    """Partidas que ainda não foram processadas (todas com ``full``)."""
+    if full or not inspect(engine).has_table(EVENTS_STATE_TABLE):
+        consulta = "SELECT match_api_id FROM Match"
+    else:
+        consulta = (
+            f"SELECT M.match_api_id FROM Match M "
+            f"LEFT JOIN {EVENTS_STATE_TABLE} S ON S.match_api_id = M.match_api_id "
+            f"WHERE S.match_api_id IS NULL"
+        )
+    with engine.connect() as con:
+        return [linha[0] for linha in con.execute(text(consulta + " ORDER BY 1"))]
+
+
+def build(db_path: str = DB_PATH, full: bool = False, workers: int = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Processa as partidas pendentes. Devolve partidas, eventos e leituras de posse gravados."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    ensure_indexes(engine)
+    with engine.begin() as con:
+        for tabela, ddl in TABLES.items():
+            if full:
+                con.execute(text(f"DROP TABLE IF EXISTS {tabela}"))
+            con.execute(text(ddl))
+        for ddl in INDEXES:
+            con.execute(text(ddl))
+
+    pendentes = pending_matches(engine, full)
+    engine.dispose()
+    blocos = [pendentes[i:i + chunk_size] for i in range(0, len(pendentes), chunk_size)]
+    totais = {"partidas": 0, "eventos": 0, "posse": 0}
+    if not blocos:
+        return totais
+
+    max_workers = workers or min(len(blocos), os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory(prefix="eventos_") as pasta, ProcessPoolExecutor(max_workers) as pool:
+        partes = [os.path.join(pasta, f"bloco_{i}.sqlite") for i in range(len(blocos))]
+        # Cada parte é juntada assim que fica pronta; os outros blocos continuam nos workers
+        for parte, partidas, eventos, posse in pool.map(_parse_chunk, [db_path] * len(blocos), blocos, partes):
+            _merge_chunk(db_path, parte)
+            totais["partidas"] += partidas
+            totais["eventos"] += eventos
+            totais["posse"] += posse
+    return totais
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH, help="caminho do database.sqlite")
+    parser.add_argument("--full", action="store_true", help="reprocessa todas as partidas")
+    parser.add_argument("--workers", type=int, help="número de processos (padrão: um por CPU)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="partidas por bloco")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    totais = build(args.db, full=args.full, workers=args.workers, chunk_size=args.chunk_size)
+    print(
+        f"{totais['partidas']} partida(s) processada(s): {totais['eventos']} eventos e "
+        f"{totais['posse']} leituras de posse em {time.perf_counter() - inicio:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
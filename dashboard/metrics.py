@@ -0,0 +1,385 @@
+"""
+Instrumentação das páginas: tempo de cada etapa, linhas lidas, memória dos
+DataFrames e acertos/faltas de cache.
+
+Cada página chama ``start_page`` no início e ``end_page`` no fim; entre as duas,
+os loaders de ``dashboard.data`` (decorados com ``timed``) e os blocos
+``with stage(...)`` das páginas registram suas etapas. Trechos decorados com
+``fragment`` (``st.fragment``) viram uma etapa na execução completa e, quando
+reexecutam sozinhos, uma execução própria ("página › trecho"). Funções decoradas com
+``cache_miss`` logo abaixo de ``st.cache_resource`` só executam quando o cache
+falha, então a etapa que as chamou é marcada como ``miss``. ``run_concurrently``
+executa chamadas independentes num pool de threads: as etapas de cada chamada
+entram como sub-etapas e a etapa registra o tempo economizado em relação a
+executá-las uma depois da outra.
+
+Saídas (todas opcionais):
+
+- painel na barra lateral: ``?metricas=1`` na URL ou ``DASHBOARD_METRICS_PANEL=1``;
+- log estruturado (uma linha JSON por execução): ``DASHBOARD_METRICS_LOG=arquivo``;
+- arquivo de texto no formato do Prometheus (p50/p95 por página, totais por etapa
+  e cache), reescrito a cada execução: ``DASHBOARD_METRICS_PROM=arquivo``.
+
+``python -m dashboard.metrics arquivo.jsonl`` resume um log com p50/p95 por página.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from dashboard.schema import frame_memory
+
+PANEL_ENV = "DASHBOARD_METRICS_PANEL"
+LOG_ENV = "DASHBOARD_METRICS_LOG"
+PROM_ENV = "DASHBOARD_METRICS_PROM"
+
+# Execuções guardadas por página para calcular os percentis
+JANELA = 1000
+
+logger = logging.getLogger("dashboard.metrics")
+
+
+@dataclass
+class Stage:
+    name: str
+    depth: int = 0
+    seconds: float = 0.0
+    rows: int = None
+    memory_mb: float = None
+    cache: str = None  # "hit", "miss" ou None (etapa sem cache)
+    saved_seconds: float = None  # run_concurrently: soma das chamadas − duração da etapa
+
+
+@dataclass
+class Run:
+    page: str
+    started: float = field(default_factory=time.time)
+    inicio: float = field(default_factory=time.perf_counter)
+    seconds: float = None
+    stages: list = field(default_factory=list)
+    pilha: list = field(default_factory=list)
+
+
+_local = threading.local()
+_lock = threading.Lock()
+_historico = defaultdict(lambda: deque(maxlen=JANELA))
+_totais = defaultdict(float)
+
+
+def _run():
+    return getattr(_local, "run", None)
+
+
+def enabled() -> bool:
+    """Se alguma saída está ligada (só então a memória dos DataFrames é medida)."""
+    return panel_requested() or bool(os.environ.get(LOG_ENV) or os.environ.get(PROM_ENV))
+
+
+def panel_requested() -> bool:
+    if os.environ.get(PANEL_ENV) == "1":
+        return True
+    try:
+        return st.query_params.get("metricas") == "1"
+    except Exception:
+        # Fora de uma sessão do Streamlit (CLI, benchmarks)
+        return False
+
+
+# -------------------------------
+# 🔹 Registro
+# -------------------------------
+def start_page(page: str) -> None:
+    """Começa a medir uma execução da página."""
+    _local.run = Run(page)
+    _local.medir_memoria = enabled()
+    try:
+        st.session_state["_metricas_pagina"] = page
+    except Exception:
+        pass
+
+
+@contextmanager
+def stage(name: str, cached: bool = False):
+    """
+    Mede o bloco como uma etapa da execução atual. ``cached=True`` marca a etapa
+    como ``hit`` até que uma função ``cache_miss`` rode dentro dela.
+    """
+    run = _run()
+    if run is None:
+        yield None
+        return
+    etapa = Stage(name, depth=len(run.pilha), cache="hit" if cached else None)
+    run.stages.append(etapa)
+    run.pilha.append(etapa)
+    inicio = time.perf_counter()
+    try:
+        yield etapa
+    finally:
+        etapa.seconds = time.perf_counter() - inicio
+        run.pilha.pop()
+
+
+def record(etapa: Stage, result) -> None:
+    """Guarda linhas e memória de ``result`` na etapa, se for um DataFrame."""
+    if etapa is None or not isinstance(result, pd.DataFrame):
+        return
+    etapa.rows = len(result)
+    if getattr(_local, "medir_memoria", False):
+        etapa.memory_mb = frame_memory(result)
+
+
+def timed(name: str):
+    """Decorator dos loaders: cada chamada vira uma etapa com cache, linhas e memória."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name, cached=True) as etapa:
+                result = func(*args, **kwargs)
+                record(etapa, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def cache_miss(func):
+    """Marca a etapa atual como ``miss``; vai logo abaixo de ``st.cache_resource``."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        run = _run()
+        if run is not None:
+            for etapa in run.pilha:
+                if etapa.cache is not None:
+                    etapa.cache = "miss"
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def run_concurrently(name: str, calls, max_workers: int = 4) -> list:
+    """
+    Executa ``calls`` (funções sem argumentos, independentes entre si) num pool de
+    threads, medidas como a etapa ``name``. Devolve os resultados na ordem de ``calls``.
+
+    Cada thread recebe o contexto da sessão do Streamlit e uma execução própria
+    de métricas; no fim, as etapas de cada chamada entram como sub-etapas e
+    ``saved_seconds`` guarda quanto o paralelismo economizou. É uma estimativa:
+    cada chamada é medida enquanto as outras rodam, então, quando elas disputam a
+    CPU (conversão dos resultados em DataFrame segura o GIL), a economia real é menor.
+    """
+    calls = list(calls)
+    run = _run()
+    contexto = get_script_run_ctx(suppress_warning=True)
+    medir_memoria = getattr(_local, "medir_memoria", False)
+
+    def executar(func):
+        if contexto is not None:
+            add_script_run_ctx(threading.current_thread(), contexto)
+        sub = Run(run.page) if run is not None else None
+        _local.run = sub
+        _local.medir_memoria = medir_memoria
+        inicio = time.perf_counter()
+        try:
+            return func(), sub, time.perf_counter() - inicio
+        finally:
+            _local.run = None
+
+    with stage(name) as etapa:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls))), thread_name_prefix=name) as pool:
+            resultados = list(pool.map(executar, calls))
+
+    if etapa is not None:
+        for _, sub, _ in resultados:
+            for filha in sub.stages:
+                filha.depth += etapa.depth + 1
+                run.stages.append(filha)
+        etapa.saved_seconds = sum(segundos for _, _, segundos in resultados) - etapa.seconds
+    return [resultado for resultado, _, _ in resultados]
+
+
+def fragment(name: str):
+    """
+    ``st.fragment`` medido: dentro da execução da página é uma etapa; quando só o
+    trecho reexecuta (um widget dele mudou), é uma execução à parte.
+    """
+    def decorator(func):
+        @st.fragment
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _run() is not None:
+                with stage(name):
+                    return func(*args, **kwargs)
+            start_page(f"{st.session_state.get('_metricas_pagina', '?')} › {name}")
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Um fragmento não pode escrever na barra lateral
+                end_page(panel=False)
+        return wrapper
+    return decorator
+
+
+def end_page(panel: bool = True) -> Run:
+    """Fecha a execução: atualiza os percentis, exporta e desenha o painel se pedido."""
+    run = _run()
+    if run is None:
+        return None
+    _local.run = None
+    run.seconds = time.perf_counter() - run.inicio
+
+    with _lock:
+        _historico[run.page].append(run.seconds)
+        _totais[("rerun_seconds", run.page, "", "")] += run.seconds
+        _totais[("reruns", run.page, "", "")] += 1
+        for etapa in run.stages:
+            _totais[("stage_seconds", run.page, etapa.name, "")] += etapa.seconds
+            _totais[("stage_runs", run.page, etapa.name, "")] += 1
+            if etapa.cache:
+                _totais[("cache", run.page, etapa.name, etapa.cache)] += 1
+            if etapa.saved_seconds is not None:
+                _totais[("saved_seconds", run.page, etapa.name, "")] += etapa.saved_seconds
+
+    if os.environ.get(LOG_ENV):
+        _log(run)
+    if os.environ.get(PROM_ENV):
+        write_prometheus(os.environ[PROM_ENV])
+    if panel and panel_requested():
+        show_panel(run)
+    return run
+
+
+# -------------------------------
+# 🔹 Consultas e exportação
+# -------------------------------
+def latency(page: str) -> dict:
+    """p50/p95 (s) e número de execuções recentes da página neste processo."""
+    with _lock:
+        tempos = np.array(_historico.get(page, ()))
+    if not len(tempos):
+        return {"runs": 0, "p50": None, "p95": None}
+    p50, p95 = np.percentile(tempos, [50, 95])
+    return {"runs": len(tempos), "p50": p50, "p95": p95}
+
+
+def _log(run: Run) -> None:
+    if not logger.handlers:
+        handler = logging.FileHandler(os.environ[LOG_ENV], encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    logger.info(json.dumps({
+        "ts": run.started,
+        "page": run.page,
+        "seconds": round(run.seconds, 6),
+        "stages": [
+            {k: v for k, v in asdict(etapa).items() if v is not None} for etapa in run.stages
+        ],
+    }, ensure_ascii=False))
+
+
+def _label(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def prometheus_text() -> str:
+    """Métricas acumuladas do processo no formato texto do Prometheus."""
+    linhas = [
+        "# HELP dashboard_rerun_seconds Duração das execuções de cada página (quantis das últimas execuções).",
+        "# TYPE dashboard_rerun_seconds summary",
+    ]
+    with _lock:
+        historico = {pagina: np.array(tempos) for pagina, tempos in _historico.items()}
+        totais = dict(_totais)
+    for pagina, tempos in sorted(historico.items()):
+        p = _label(pagina)
+        for q, valor in zip(("0.5", "0.95"), np.percentile(tempos, [50, 95])):
+            linhas.append(f'dashboard_rerun_seconds{{page="{p}",quantile="{q}"}} {valor:.6f}')
+        linhas.append(f'dashboard_rerun_seconds_sum{{page="{p}"}} {totais[("rerun_seconds", pagina, "", "")]:.6f}')
+        linhas.append(f'dashboard_rerun_seconds_count{{page="{p}"}} {totais[("reruns", pagina, "", "")]:g}')
+
+    series = [
+        ("stage_seconds", "dashboard_stage_seconds_total", "Tempo acumulado por etapa."),
+        ("stage_runs", "dashboard_stage_runs_total", "Execuções de cada etapa."),
+        ("cache", "dashboard_cache_requests_total", "Consultas ao cache por etapa (hit/miss)."),
+        ("saved_seconds", "dashboard_concurrent_saved_seconds_total",
+         "Tempo economizado pelas etapas executadas em paralelo (soma das chamadas − duração)."),
+    ]
+    for tipo, nome, ajuda in series:
+        linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} counter"]
+        for (t, pagina, etapa, resultado), valor in sorted(totais.items()):
+            if t != tipo:
+                continue
+            rotulos = f'page="{_label(pagina)}",stage="{_label(etapa)}"'
+            if resultado:
+                rotulos += f',result="{resultado}"'
+            linhas.append(f"{nome}{{{rotulos}}} {valor:g}")
+    return "\n".join(linhas) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Grava ``prometheus_text()`` em ``path`` de forma atômica (textfile collector)."""
+    temporario = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(temporario, path)
+
+
+def show_panel(run: Run) -> None:
+    """Painel de desempenho da execução na barra lateral."""
+    tabela = pd.DataFrame({
+        "Etapa": ["\u2003" * etapa.depth + etapa.name for etapa in run.stages],
+        "ms": [round(etapa.seconds * 1000, 1) for etapa in run.stages],
+        "Linhas": pd.array([etapa.rows for etapa in run.stages], dtype="Int64"),
+        "MB": [None if etapa.memory_mb is None else round(etapa.memory_mb, 2) for etapa in run.stages],
+        "Cache": [etapa.cache or "" for etapa in run.stages],
+    })
+    economia = sum(etapa.saved_seconds for etapa in run.stages if etapa.saved_seconds is not None)
+    historico = latency(run.page)
+    with st.sidebar.expander("⏱️ Desempenho", expanded=True):
+        st.metric("Execução da página", f"{run.seconds * 1000:.0f} ms")
+        st.caption(
+            f"p50 {historico['p50'] * 1000:.0f} ms · p95 {historico['p95'] * 1000:.0f} ms "
+            f"({historico['runs']} execuções neste processo)"
+        )
+        if any(etapa.saved_seconds is not None for etapa in run.stages):
+            st.caption(f"Consultas em paralelo: {economia * 1000:.0f} ms economizados")
+        st.dataframe(tabela, hide_index=True)
+
+
+def summarize(path: str) -> pd.DataFrame:
+    """p50/p95 por página (e por etapa) a partir de um log de ``DASHBOARD_METRICS_LOG``."""
+    with open(path, encoding="utf-8") as f:
+        registros = [json.loads(linha) for linha in f if linha.strip()]
+    runs = pd.DataFrame([{"page": r["page"], "stage": "(página)", "seconds": r["seconds"]} for r in registros])
+    etapas = pd.DataFrame([
+        {"page": r["page"], "stage": e["name"], "seconds": e["seconds"]}
+        for r in registros for e in r["stages"]
+    ])
+    todos = pd.concat([runs, etapas], ignore_index=True)
+    resumo = todos.groupby(["page", "stage"], sort=False)["seconds"].describe(percentiles=[0.5, 0.95])
+    return (resumo[["count", "50%", "95%"]] * [1, 1000, 1000]).rename(
+        columns={"count": "execuções", "50%": "p50 ms", "95%": "p95 ms"}
+    ).round(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume um log de métricas do dashboard (p50/p95).")
+    parser.add_argument("log", help=f"arquivo gravado via {LOG_ENV}")
+    args = parser.parse_args()
+    print(summarize(args.log).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Probabilidades implícitas nas odds das casas de apostas.
+
+As odds de todas as partidas ficam num único array ``float32`` de forma
+(partidas, casas, 3) — mandante, empate e visitante. Tudo é calculado com
+operações sobre o array inteiro, sem laço por partida:
+
+- probabilidade implícita de cada casa: ``1 / odd``, normalizada para somar 1
+  (remove a margem da casa, o "overround");
+- consenso: média das casas que têm as três odds da partida;
+- calibração: cada partida gera três previsões (uma por resultado), agrupadas
+  em faixas de probabilidade e comparadas com a frequência observada;
+- zebras: resultados que o consenso considerava improváveis, por time e por partida.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.schema import BOOKMAKERS, ODDS_COLUMNS
+
+RESULTADOS = ["Mandante", "Empate", "Visitante"]
+
+# Colunas da partida mantidas em ``match_probabilities``
+MATCH_COLUMNS = [
+    "match_api_id", "league_id", "league_name", "season", "date",
+    "home_team_api_id", "away_team_api_id", "team_home", "team_away",
+    "home_team_goal", "away_team_goal",
+]
+
+
+def odds_array(df: pd.DataFrame) -> np.ndarray:
+    """Odds de ``df`` (colunas ``ODDS_COLUMNS``) como array (partidas, casas, 3); odds inválidas viram NaN."""
+    odds = df[ODDS_COLUMNS].to_numpy(dtype="float32", na_value=np.nan).reshape(len(df), len(BOOKMAKERS), 3)
+    return np.where(odds > 1, odds, np.float32(np.nan))
+
+
+def implied_probabilities(odds: np.ndarray):
+    """
+    Probabilidades implícitas sem a margem de cada casa e a margem (overround).
+
+    Devolve ``(probs, margem)``: ``probs`` tem a forma de ``odds`` e ``margem``
+    (partidas, casas). Casas sem alguma das três odds ficam com NaN.
+    """
+    inversas = 1 / odds
+    soma = inversas.sum(axis=2, keepdims=True)
+    return inversas / soma, soma[..., 0] - 1
+
+
+def consensus(probs: np.ndarray) -> np.ndarray:
+    """Média das casas disponíveis em cada partida, renormalizada: (partidas, 3)."""
+    validas = ~np.isnan(probs[..., 0])
+    quantidade = validas.sum(axis=1)
+    soma = np.where(validas[..., None], probs, 0).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = soma / quantidade[:, None]
+        return media / media.sum(axis=1, keepdims=True)
+
+
+def match_probabilities(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Probabilidades de consenso de cada partida com odds.
+
+    ``matches`` tem as colunas de ``MATCH_COLUMNS`` e ``ODDS_COLUMNS``. Colunas
+    novas: ``p_home``, ``p_draw``, ``p_away`` (``float32``), ``margem`` (média das
+    casas), ``casas`` (quantas casas tinham as três odds) e ``resultado``
+    (0 = mandante, 1 = empate, 2 = visitante).
+    """
+    probs, margem = implied_probabilities(odds_array(matches))
+    consenso = consensus(probs).astype("float32")
+    casas = (~np.isnan(margem)).sum(axis=1)
+    margem_media = np.divide(
+        np.nansum(margem, axis=1), casas, out=np.full(len(casas), np.nan, dtype="float32"), where=casas > 0
+    )
+
+    saldo = matches["home_team_goal"].to_numpy(dtype="int64") - matches["away_team_goal"].to_numpy(dtype="int64")
+    df = matches[[col for col in MATCH_COLUMNS if col in matches.columns]].assign(
+        p_home=consenso[:, 0],
+        p_draw=consenso[:, 1],
+        p_away=consenso[:, 2],
+        margem=margem_media,
+        casas=casas.astype("int8"),
+        resultado=np.where(saldo > 0, 0, np.where(saldo == 0, 1, 2)).astype("int8"),
+    )
+    return df[casas > 0].reset_index(drop=True)
+
+
+def _probabilities(probs: pd.DataFrame) -> np.ndarray:
+    return probs[["p_home", "p_draw", "p_away"]].to_numpy(dtype="float64")
+
+
+def _groups(probs: pd.DataFrame, by):
+    """Código do grupo de cada partida e os nomes dos grupos (um grupo só sem ``by``)."""
+    if by is None:
+        return np.zeros(len(probs), dtype=np.int64), np.array(["Todas"], dtype=object)
+    codigos, nomes = pd.factorize(probs[by], sort=True)
+    return codigos.astype(np.int64), np.asarray(nomes, dtype=object)
+
+
+def calibration(probs: pd.DataFrame, by: str = None, bins: int = 10) -> pd.DataFrame:
+    """
+    Curva de calibração: probabilidade prevista × frequência observada por faixa.
+
+    Cada partida contribui com três previsões (mandante, empate, visitante).
+    Colunas: ``by`` (ou "Grupo"), ``Previsto``, ``Observado`` e ``Previsões``.
+    """
+    p = _probabilities(probs)
+    acerto = probs["resultado"].to_numpy()[:, None] == np.arange(3)
+    grupos, nomes = _groups(probs, by)
+
+    faixa = np.minimum((p * bins).astype(np.int64), bins - 1)
+    chave = (np.repeat(grupos, 3) * bins + faixa.ravel())
+    total = len(nomes) * bins
+    contagem = np.bincount(chave, minlength=total)
+    previsto = np.bincount(chave, weights=p.ravel(), minlength=total)
+    observado = np.bincount(chave, weights=acerto.ravel(), minlength=total)
+
+    cheias = contagem > 0
+    return pd.DataFrame({
+        by or "Grupo": nomes[np.arange(total) // bins][cheias],
+        "Previsto": previsto[cheias] / contagem[cheias],
+        "Observado": observado[cheias] / contagem[cheias],
+        "Previsões": contagem[cheias],
+    })
+
+
+def accuracy(probs: pd.DataFrame, by: str = None) -> pd.DataFrame:
+    """
+    Qualidade das previsões por grupo: Partidas, Brier (soma dos erros quadráticos
+    das três probabilidades, média por partida), Acerto do favorito (%) e Margem média (%).
+    """
+    p = _probabilities(probs)
+    resultado = probs["resultado"].to_numpy()
+    acerto = resultado[:, None] == np.arange(3)
+    grupos, nomes = _groups(probs, by)
+
+    partidas = np.bincount(grupos, minlength=len(nomes))
+    brier = np.bincount(grupos, weights=((p - acerto) ** 2).sum(axis=1), minlength=len(nomes))
+    favorito = np.bincount(grupos, weights=p.argmax(axis=1) == resultado, minlength=len(nomes))
+    margem = np.bincount(grupos, weights=probs["margem"].to_numpy(dtype="float64"), minlength=len(nomes))
+    tabela = pd.DataFrame({
+        "Partidas": partidas,
+        "Brier": brier / partidas,
+        "Acerto do favorito (%)": favorito / partidas * 100,
+        "Margem média (%)": margem / partidas * 100,
+    }, index=pd.Index(nomes, name=by or "Grupo"))
+    return tabela[tabela["Partidas"] > 0].round({"Brier": 4, "Acerto do favorito (%)": 1, "Margem média (%)": 2})
+
+
+def team_upsets(probs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Zebras por time, do ponto de vista de cada time em cada partida.
+
+    Azarão: o adversário tinha mais chance de vencer. Índice: nome do time.
+    Colunas: Partidas, Zebras a favor (vitórias como azarão), Zebras contra
+    (derrotas como favorito), Pontos, Pontos esperados (3·P(vitória) + P(empate))
+    e Saldo (pontos acima do esperado).
+    """
+    def duas_vezes(col_home, col_away):
+        return np.concatenate([probs[col_home].to_numpy(), probs[col_away].to_numpy()])
+
+    vitoria = duas_vezes("p_home", "p_away").astype("float64")
+    derrota = duas_vezes("p_away", "p_home").astype("float64")
+    empate = np.tile(probs["p_draw"].to_numpy(dtype="float64"), 2)
+    resultado = probs["resultado"].to_numpy()
+    # Do ponto de vista do time: 0 = vitória, 1 = empate, 2 = derrota
+    visao = np.concatenate([resultado, 2 - resultado])
+
+    long = pd.DataFrame({
+        "Time": pd.concat([probs["team_home"], probs["team_away"]], ignore_index=True),
+        "Partidas": 1,
+        "Zebras a favor": (visao == 0) & (vitoria < derrota),
+        "Zebras contra": (visao == 2) & (vitoria > derrota),
+        "Pontos": np.array([3, 1, 0])[visao],
+        "Pontos esperados": 3 * vitoria + empate,
+    })
+    tabela = long.groupby("Time", observed=True).sum()
+    tabela["Pontos esperados"] = tabela["Pontos esperados"].round(1)
+    tabela["Saldo"] = (tabela["Pontos"] - tabela["Pontos esperados"]).round(1)
+    tabela.index.name = None
+    return tabela.sort_values("Saldo", ascending=False)
+
+
+def biggest_upsets(probs: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """As ``n`` partidas cujo resultado o consenso considerava menos provável."""
+    p = _probabilities(probs)
+    resultado = probs["resultado"].to_numpy()
+    chance = p[np.arange(len(p)), resultado]
+    ordem = np.argsort(chance, kind="stable")[:n]
+    linhas = probs.iloc[ordem]
+    return pd.DataFrame({
+        "Data": linhas["date"].dt.date.to_numpy(),
+        "Liga": linhas["league_name"].to_numpy(),
+        "Mandante": linhas["team_home"].to_numpy(),
+        "Placar": (linhas["home_team_goal"].astype(str) + " x " + linhas["away_team_goal"].astype(str)).to_numpy(),
+        "Visitante": linhas["team_away"].to_numpy(),
+        "Resultado": np.array(RESULTADOS)[resultado[ordem]],
+        "Probabilidade (%)": (chance[ordem] * 100).round(1),
+    })
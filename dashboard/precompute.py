@@ -0,0 +1,259 @@
+"""
+Pré-cálculo dos agregados da visão geral das ligas.
+
+Calcula, para cada liga/temporada, a classificação, o resumo por rodada e o
+ranking por faixa de gols, e grava nas tabelas ``Agg_*`` do próprio banco. As
+ligas são processadas em paralelo (um processo por liga). O build é
+incremental: só as ligas/temporadas cujas partidas mudaram desde o último build
+são recalculadas.
+
+Também gera ``Player_Latest_Attributes``, com o snapshot mais recente de cada
+jogador, usada pela página de jogadores, e ``Head_To_Head``, o confronto direto
+de cada par de times em todas as ligas/temporadas (refeito só quando alguma
+liga/temporada mudou), e ``Match_Elo``, o Elo de cada partida (só a cauda a partir
+da primeira partida nova ou alterada é recalculada).
+
+Uso:
+    python -m dashboard.precompute [--db data/database.sqlite] [--full]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from sqlalchemy import bindparam, create_engine, inspect, text
+
+from dashboard.data import (
+    BUILD_STATE_TABLE,
+    DB_PATH,
+    ELO_TABLE,
+    HEAD_TO_HEAD_TABLE,
+    LATEST_ATTRIBUTES_QUERY,
+    LATEST_ATTRIBUTES_TABLE,
+    MATCH_QUERY,
+    SUMMARY_TABLES,
+    add_team_names,
+    ensure_indexes,
+)
+from dashboard.elo import elo_ratings, incremental
+from dashboard.schema import apply_schema
+from dashboard.stats import league_summary, pair_index
+
+# Colunas que definem o conteúdo de uma liga/temporada para o build incremental
+FINGERPRINT_QUERY = """
+SELECT league_id, season, match_api_id, stage,
+       home_team_api_id, away_team_api_id, home_team_goal, away_team_goal
+FROM Match
+"""
+
+# Colunas usadas pelo Elo
+ELO_MATCHES_QUERY = """
+SELECT match_api_id, date, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal
+FROM Match
+"""
+
+
+def match_fingerprints(engine) -> pd.DataFrame:
+    """Número de partidas e hash do conteúdo de cada liga/temporada."""
+    partidas = pd.read_sql(FINGERPRINT_QUERY, engine)
+    partidas = partidas.sort_values(["league_id", "season", "match_api_id"])
+    hashes = pd.util.hash_pandas_object(partidas, index=False)
+    estado = partidas[["league_id", "season"]].assign(fingerprint=hashes.to_numpy())
+    estado = estado.groupby(["league_id", "season"]).agg(
+        n_matches=("fingerprint", "size"),
+        # Soma em módulo 2**64: muda se qualquer linha mudar, entrar ou sair
+        fingerprint=("fingerprint", "sum"),
+    ).reset_index()
+    # SQLite só guarda inteiros com sinal de 64 bits
+    estado["fingerprint"] = estado["fingerprint"].to_numpy(dtype="uint64").view("int64")
+    return estado
+
+
+def _build_league(db_path: str, league_id: int, seasons: list) -> dict:
+    """Calcula os agregados de uma liga (executado no processo worker)."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    stmt = text(
+        MATCH_QUERY + "WHERE M.league_id = :league_id AND M.season IN :seasons"
+    ).bindparams(bindparam("seasons", expanding=True))
+    matches = pd.read_sql(stmt, engine, params={"league_id": league_id, "seasons": seasons})
+    teams = pd.read_sql("SELECT team_api_id, team_long_name FROM Team", engine)
+    engine.dispose()
+    return league_summary(add_team_names(matches, teams))
+
+
+def _write(engine, alteradas: pd.DataFrame, resultados: list, estado: pd.DataFrame) -> None:
+    inspector = inspect(engine)
+    with engine.begin() as con:
+        # Apaga as linhas antigas das ligas/temporadas recalculadas (ou removidas)
+        for tabela in [*SUMMARY_TABLES.values(), BUILD_STATE_TABLE]:
+            if not inspector.has_table(tabela):
+                continue
+            for league_id, season in alteradas.itertuples(index=False):
+                con.execute(
+                    text(f"DELETE FROM {tabela} WHERE league_id = :league_id AND season = :season"),
+                    {"league_id": int(league_id), "season": season},
+                )
+
+        for resumo in resultados:
+            for chave, tabela in SUMMARY_TABLES.items():
+                resumo[chave].to_sql(tabela, con, if_exists="append", index=False)
+        estado.to_sql(BUILD_STATE_TABLE, con, if_exists="append", index=False)
+
+        for tabela in [*SUMMARY_TABLES.values(), BUILD_STATE_TABLE]:
+            con.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{tabela.lower()}_league_season "
+                f"ON {tabela} (league_id, season)"
+            ))
+
+
+def build_latest_attributes(engine) -> int:
+    """
+    (Re)cria ``Player_Latest_Attributes``: o snapshot mais recente de cada jogador.
+
+    A tabela nova é montada ao lado e só substitui a antiga no fim da transação.
+    """
+    novo = f"{LATEST_ATTRIBUTES_TABLE}_new"
+    with engine.begin() as con:
+        con.execute(text(f"DROP TABLE IF EXISTS {novo}"))
+        con.execute(text(f"CREATE TABLE {novo} AS {LATEST_ATTRIBUTES_QUERY}"))
+        con.execute(text(f"DROP TABLE IF EXISTS {LATEST_ATTRIBUTES_TABLE}"))
+        con.execute(text(f"ALTER TABLE {novo} RENAME TO {LATEST_ATTRIBUTES_TABLE}"))
+        con.execute(text(
+            f"CREATE UNIQUE INDEX idx_{LATEST_ATTRIBUTES_TABLE.lower()}_player "
+            f"ON {LATEST_ATTRIBUTES_TABLE} (player_api_id)"
+        ))
+        return con.execute(text(f"SELECT COUNT(*) FROM {LATEST_ATTRIBUTES_TABLE}")).scalar()
+
+
+def build_head_to_head(engine) -> int:
+    """
+    (Re)cria ``Head_To_Head`` a partir de ``Match``: uma linha por par de times,
+    com chave primária (``team_a_api_id``, ``team_b_api_id``) para buscas diretas.
+    """
+    partidas = pd.read_sql(
+        "SELECT match_api_id, date, home_team_api_id, away_team_api_id, home_team_goal, away_team_goal "
+        "FROM Match",
+        engine,
+    )
+    pares = pair_index(partidas)
+    novo = f"{HEAD_TO_HEAD_TABLE}_new"
+    with engine.begin() as con:
+        con.execute(text(f"DROP TABLE IF EXISTS {novo}"))
+        con.execute(text(f"""
+            CREATE TABLE {novo} (
+                team_a_api_id INTEGER NOT NULL,
+                team_b_api_id INTEGER NOT NULL,
+                partidas INTEGER, vitorias_a INTEGER, empates INTEGER, vitorias_b INTEGER,
+                gols_a INTEGER, gols_b INTEGER, match_ids TEXT,
+                PRIMARY KEY (team_a_api_id, team_b_api_id)
+            ) WITHOUT ROWID
+        """))
+        pares.to_sql(novo, con, if_exists="append", index=False)
+        con.execute(text(f"DROP TABLE IF EXISTS {HEAD_TO_HEAD_TABLE}"))
+        con.execute(text(f"ALTER TABLE {novo} RENAME TO {HEAD_TO_HEAD_TABLE}"))
+    return len(pares)
+
+
+def build_elo(engine, full: bool = False) -> int:
+    """
+    Atualiza ``Match_Elo``. As linhas gravadas são o checkpoint: partidas novas,
+    alteradas ou removidas recalculam só a cauda a partir da sua data (tudo com
+    ``full``). Devolve o número de partidas recalculadas.
+    """
+    partidas = apply_schema(pd.read_sql(ELO_MATCHES_QUERY, engine))
+    if full or not inspect(engine).has_table(ELO_TABLE):
+        inicio, novas = None, elo_ratings(partidas)
+    else:
+        gravadas = apply_schema(pd.read_sql(f"SELECT * FROM {ELO_TABLE}", engine))
+        inicio, novas = incremental(partidas, gravadas)
+        if inicio is None:
+            return 0
+
+    # Datas no mesmo formato texto de Match
+    novas = novas.assign(date=novas["date"].dt.strftime("%Y-%m-%d %H:%M:%S"))
+    with engine.begin() as con:
+        if inicio is None:
+            con.execute(text(f"DROP TABLE IF EXISTS {ELO_TABLE}"))
+        else:
+            con.execute(
+                text(f"DELETE FROM {ELO_TABLE} WHERE date >= :inicio"),
+                {"inicio": inicio.strftime("%Y-%m-%d %H:%M:%S")},
+            )
+        novas.to_sql(ELO_TABLE, con, if_exists="append", index=False)
+        con.execute(text(f"CREATE INDEX IF NOT EXISTS idx_{ELO_TABLE.lower()}_date ON {ELO_TABLE} (date)"))
+    return len(novas)
+
+
+def build(db_path: str = DB_PATH, full: bool = False, workers: int = None) -> pd.DataFrame:
+    """
+    Recalcula os agregados das ligas/temporadas alteradas desde o último build.
+
+    Devolve as ligas/temporadas recalculadas.
+    """
+    engine = create_engine(f"sqlite:///{db_path}")
+    ensure_indexes(engine)
+
+    atual = match_fingerprints(engine)
+    if inspect(engine).has_table(BUILD_STATE_TABLE):
+        anterior = pd.read_sql(f"SELECT * FROM {BUILD_STATE_TABLE}", engine)
+    else:
+        anterior = atual.iloc[:0]
+
+    comparacao = atual.merge(
+        anterior, on=["league_id", "season"], how="outer", suffixes=("", "_anterior"), indicator=True
+    )
+    mudou = (comparacao["_merge"] != "both") | (comparacao["fingerprint"] != comparacao["fingerprint_anterior"])
+    if full:
+        mudou[:] = True
+    alteradas = comparacao.loc[mudou, ["league_id", "season"]]
+    pendentes = comparacao.loc[mudou & (comparacao["_merge"] != "right_only"), ["league_id", "season"]]
+
+    tarefas = [
+        (db_path, int(league_id), grupo["season"].tolist())
+        for league_id, grupo in pendentes.groupby("league_id")
+    ]
+    resultados = []
+    if tarefas:
+        # Um processo por liga (limitado ao número de CPUs)
+        max_workers = workers or min(len(tarefas), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            resultados = list(pool.map(_build_league, *zip(*tarefas)))
+
+    if not alteradas.empty:
+        estado = atual.merge(pendentes, on=["league_id", "season"])
+        _write(engine, alteradas, resultados, estado)
+    engine.dispose()
+    return alteradas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH, help="caminho do database.sqlite")
+    parser.add_argument("--full", action="store_true", help="recalcula tudo, ignorando o último build")
+    parser.add_argument("--workers", type=int, help="número de processos (padrão: um por liga)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    alteradas = build(args.db, full=args.full, workers=args.workers)
+    print(f"{len(alteradas)} liga(s)/temporada(s) recalculada(s) em {time.perf_counter() - inicio:.1f}s")
+
+    inicio = time.perf_counter()
+    engine = create_engine(f"sqlite:///{args.db}")
+    jogadores = build_latest_attributes(engine)
+    print(f"{LATEST_ATTRIBUTES_TABLE}: {jogadores} jogadores em {time.perf_counter() - inicio:.1f}s")
+
+    if len(alteradas) or not inspect(engine).has_table(HEAD_TO_HEAD_TABLE):
+        inicio = time.perf_counter()
+        pares = build_head_to_head(engine)
+        print(f"{HEAD_TO_HEAD_TABLE}: {pares} pares de times em {time.perf_counter() - inicio:.1f}s")
+
+    inicio = time.perf_counter()
+    partidas = build_elo(engine, full=args.full)
+    print(f"{ELO_TABLE}: {partidas} partida(s) recalculada(s) em {time.perf_counter() - inicio:.1f}s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Relatórios de todas as ligas/temporadas, sem abrir o Streamlit.
+
+Para cada liga × temporada grava em ``<saida>/<liga>/<temporada>/`` as tabelas
+da visão geral e do comparativo (classificação com Elo, resumo por rodada,
+faixas de gols, evolução da classificação, estatísticas dos times e confrontos
+diretos) em CSV ou Parquet, e os gráficos das páginas em HTML estático
+(``dashboard.charts``). ``<saida>/index.csv`` lista o que foi gerado.
+
+Cada liga/temporada é uma tarefa do pool de processos. Cada worker abre a sua
+própria conexão com o banco e lê só as partidas da sua tarefa (índice de
+cobertura de ``Match``); os times e o Elo de todo o histórico são carregados uma
+vez no processo principal e entregues aos workers na inicialização do pool. O
+plotly.js é gravado uma única vez na raiz da saída e referenciado pelos HTMLs.
+
+Uso:
+    python -m dashboard.report [--db data/database.sqlite] [--out relatorios]
+                               [--format csv|parquet] [--workers N]
+                               [--leagues ID ...] [--seasons 2015/2016 ...]
+"""
+
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from plotly.offline import get_plotlyjs
+from sqlalchemy import create_engine, text
+
+from dashboard.charts import (
+    elo_chart,
+    goal_bands_chart,
+    goals_per_game_chart,
+    head_to_head_chart,
+    results_chart,
+    standings_evolution_chart,
+    team_comparison_chart,
+)
+from dashboard.data import DB_PATH, LEAGUE_QUERY, MATCH_QUERY, TEAM_QUERY, add_team_names, ensure_indexes
+from dashboard.elo import elo_ratings, latest_ratings, team_ratings
+from dashboard.precompute import ELO_MATCHES_QUERY
+from dashboard.schema import apply_schema
+from dashboard.stats import (
+    combine_goal_bands,
+    combine_round_stats,
+    combine_standings,
+    goal_band_share,
+    head_to_head,
+    head_to_head_matrix,
+    league_summary,
+    standings_evolution,
+    team_stats,
+)
+
+PLOTLY_JS = "plotly.min.js"
+
+# Estado de cada worker, preenchido por _init_worker
+_worker = {}
+
+
+def _slug(nome: str) -> str:
+    """Nome de pasta sem espaços nem barras ("2015/2016" → "2015-2016")."""
+    return re.sub(r"[^\w.-]+", "_", str(nome).replace("/", "-")).strip("_")
+
+
+def _init_worker(db_path: str, teams: pd.DataFrame, elo: pd.DataFrame) -> None:
+    """Conexão própria do worker e os dados compartilhados (somente leitura)."""
+    _worker["engine"] = create_engine(f"sqlite:///{db_path}")
+    _worker["teams"] = teams
+    _worker["elo"] = elo
+    # Elo por time-partida, usado no gráfico de todas as tarefas do worker
+    _worker["historico"] = team_ratings(elo)
+
+
+def league_season_tables(matches: pd.DataFrame, teams: pd.DataFrame, elo: pd.DataFrame) -> dict:
+    """
+    Tabelas do relatório de uma liga/temporada (partidas de ``load_matches``):
+    as mesmas da visão geral e do comparativo, com o Elo de cada time ao fim da
+    temporada na classificação.
+    """
+    resumo = league_summary(matches)
+    classificacao = combine_standings(resumo["standings"])
+    nomes = teams.set_index("team_api_id")["team_long_name"]
+    final = latest_ratings(elo, matches["match_api_id"])
+    final = final.set_axis(final.index.map(nomes))
+    classificacao["Elo"] = classificacao["Time"].astype(str).map(final).round().astype("Int32")
+    rodadas = combine_round_stats(resumo["rounds"])
+    return {
+        "classificacao": classificacao,
+        "rodadas": rodadas,
+        "faixas_de_gols": goal_band_share(rodadas),
+        "ranking_faixas_de_gols": combine_goal_bands(resumo["goal_bands"]),
+        "evolucao_classificacao": standings_evolution(matches),
+        "times": team_stats(matches).rename_axis("Time").reset_index(),
+        "confrontos": head_to_head(matches),
+    }
+
+
+def league_season_charts(tabelas: dict, matches: pd.DataFrame, teams: pd.DataFrame, historico: pd.DataFrame,
+                         season: str) -> dict:
+    """
+    Gráficos do relatório, montados com as mesmas funções das páginas.
+    ``historico`` é o Elo por time-partida (``team_ratings``).
+    """
+    times = tabelas["times"].set_index("Time")
+    ids = pd.unique(pd.concat([matches["home_team_api_id"], matches["away_team_api_id"]]))
+    historico = historico[historico["team_api_id"].isin(ids)]
+    nomes = teams.set_index("team_api_id")["team_long_name"]
+    historico = historico.assign(Time=historico["team_api_id"].map(nomes))
+    return {
+        "evolucao_classificacao": standings_evolution_chart(tabelas["evolucao_classificacao"], season),
+        "resultados_por_rodada": results_chart(tabelas["rodadas"]),
+        "media_de_gols": goals_per_game_chart(tabelas["rodadas"]),
+        "faixas_de_gols": goal_bands_chart(tabelas["faixas_de_gols"]),
+        "comparativo_times": team_comparison_chart(times),
+        "confrontos": head_to_head_chart(head_to_head_matrix(tabelas["confrontos"], sorted(times.index))),
+        "elo": elo_chart(historico, (matches["date"].min(), matches["date"].max())),
+    }
+
+
+def _report(league_id: int, league_name: str, season: str, out: str, formato: str) -> dict:
+    """Gera o relatório de uma liga/temporada (executado no processo worker)."""
+    inicio = time.perf_counter()
+    stmt = text(MATCH_QUERY + "WHERE M.league_id = :league_id AND M.season = :season")
+    matches = pd.read_sql(stmt, _worker["engine"], params={"league_id": league_id, "season": season})
+    matches = add_team_names(apply_schema(matches), _worker["teams"])
+
+    pasta = os.path.join(out, _slug(league_name), _slug(season))
+    os.makedirs(pasta, exist_ok=True)
+    tabelas = league_season_tables(matches, _worker["teams"], _worker["elo"])
+    for nome, tabela in tabelas.items():
+        caminho = os.path.join(pasta, f"{nome}.{formato}")
+        if formato == "parquet":
+            tabela.to_parquet(caminho, index=False)
+        else:
+            tabela.to_csv(caminho, index=False)
+
+    # plotly.js fica na raiz da saída: <liga>/<temporada>/ → ../../plotly.min.js
+    plotly_js = os.path.relpath(os.path.join(out, PLOTLY_JS), pasta).replace(os.sep, "/")
+    graficos = league_season_charts(tabelas, matches, _worker["teams"], _worker["historico"], season)
+    for nome, fig in graficos.items():
+        fig.write_html(os.path.join(pasta, f"{nome}.html"), include_plotlyjs=plotly_js)
+
+    return {
+        "league_id": league_id,
+        "Liga": league_name,
+        "Temporada": season,
+        "Partidas": len(matches),
+        "Pasta": os.path.relpath(pasta, out),
+        "Arquivos": len(tabelas) + len(graficos),
+        "Tempo (s)": round(time.perf_counter() - inicio, 3),
+    }
+
+
+def build(db_path: str = DB_PATH, out: str = "relatorios", formato: str = "csv", workers: int = None,
+          league_ids=None, seasons=None) -> pd.DataFrame:
+    """Gera os relatórios de todas as ligas/temporadas (ou das pedidas). Devolve o índice gerado."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    ensure_indexes(engine)
+    tarefas = pd.read_sql("SELECT DISTINCT league_id, season FROM Match ORDER BY league_id, season", engine)
+    tarefas = tarefas.merge(pd.read_sql(LEAGUE_QUERY, engine), on="league_id")
+    if league_ids:
+        tarefas = tarefas[tarefas["league_id"].isin(league_ids)]
+    if seasons:
+        tarefas = tarefas[tarefas["season"].isin(seasons)]
+
+    # Lidos uma vez aqui e compartilhados com os workers
+    teams = apply_schema(pd.read_sql(TEAM_QUERY, engine))
+    elo = elo_ratings(apply_schema(pd.read_sql(ELO_MATCHES_QUERY, engine)))
+    engine.dispose()
+
+    os.makedirs(out, exist_ok=True)
+    with open(os.path.join(out, PLOTLY_JS), "w", encoding="utf-8") as arquivo:
+        arquivo.write(get_plotlyjs())
+
+    linhas = []
+    if not tarefas.empty:
+        max_workers = workers or min(len(tarefas), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(db_path, teams, elo)) as pool:
+            linhas = list(pool.map(
+                _report,
+                tarefas["league_id"].astype(int),
+                tarefas["league_name"],
+                tarefas["season"],
+                [out] * len(tarefas),
+                [formato] * len(tarefas),
+            ))
+    indice = pd.DataFrame(linhas)
+    indice.to_csv(os.path.join(out, "index.csv"), index=False)
+    return indice
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=DB_PATH, help="caminho do database.sqlite")
+    parser.add_argument("--out", default="relatorios", help="pasta de saída")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="formato das tabelas")
+    parser.add_argument("--workers", type=int, help="número de processos (padrão: um por CPU)")
+    parser.add_argument("--leagues", type=int, nargs="+", help="só estas ligas (league_id)")
+    parser.add_argument("--seasons", nargs="+", help="só estas temporadas")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    indice = build(args.db, args.out, args.format, args.workers, args.leagues, args.seasons)
+    print(
+        f"{len(indice)} relatório(s) de liga/temporada em {args.out}/ "
+        f"em {time.perf_counter() - inicio:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Tipos compactos das tabelas carregadas em memória.
+
+Nomes e temporadas viram categorias (comparações e groupbys usam os códigos
+inteiros), datas viram ``datetime64``, gols e rodadas viram ``int8`` e os
+atributos de 0 a 100 dos jogadores e dos times viram ``UInt8`` (inteiro pequeno
+que aceita valor ausente) e as odds viram ``float32``.
+
+``python -m dashboard.schema`` mostra a memória de cada tabela antes e depois.
+"""
+
+import pandas as pd
+
+PLAYER_ATTRIBUTE_COLUMNS = [
+    "overall_rating", "potential",
+    "crossing", "finishing", "heading_accuracy", "short_passing", "volleys",
+    "dribbling", "curve", "free_kick_accuracy", "long_passing", "ball_control",
+    "acceleration", "sprint_speed", "agility", "reactions", "balance",
+    "shot_power", "jumping", "stamina", "strength", "long_shots",
+    "aggression", "interceptions", "positioning", "vision", "penalties", "marking",
+    "standing_tackle", "sliding_tackle", "gk_diving", "gk_handling", "gk_kicking",
+    "gk_positioning", "gk_reflexes",
+]
+
+# Atributos táticos de Team_Attributes (escala de 20 a 80)
+TEAM_ATTRIBUTE_COLUMNS = [
+    "buildUpPlaySpeed", "buildUpPlayDribbling", "buildUpPlayPassing",
+    "chanceCreationPassing", "chanceCreationCrossing", "chanceCreationShooting",
+    "defencePressure", "defenceAggression", "defenceTeamWidth",
+]
+
+# Casas de apostas com odds em Match: colunas <casa>H, <casa>D e <casa>A
+BOOKMAKERS = ["B365", "BW", "IW", "LB", "PS", "WH", "SJ", "VC", "GB", "BS"]
+ODDS_COLUMNS = [f"{casa}{resultado}" for casa in BOOKMAKERS for resultado in "HDA"]
+
+# Tipo de cada coluna (colunas ausentes aqui mantêm o tipo lido do banco)
+DTYPES = {
+    "league_id": "int32",
+    "match_api_id": "int32",
+    "home_team_api_id": "int32",
+    "away_team_api_id": "int32",
+    "team_api_id": "int32",
+    "player_api_id": "int32",
+    "stage": "int8",
+    "home_team_goal": "int8",
+    "away_team_goal": "int8",
+    "season": "category",
+    "league_name": "category",
+    "date": "datetime64[ns]",
+    "birthday": "datetime64[ns]",
+    "height": "float32",
+    "weight": "UInt16",
+    **{col: "UInt8" for col in PLAYER_ATTRIBUTE_COLUMNS},
+    **{col: "UInt8" for col in TEAM_ATTRIBUTE_COLUMNS},
+    **{col: "float32" for col in ODDS_COLUMNS},
+}
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas conhecidas de ``df`` para os tipos compactos."""
+    tipos = {col: tipo for col, tipo in DTYPES.items() if col in df.columns}
+    return df.astype(tipos)
+
+
+def team_name_dtype(teams: pd.DataFrame) -> pd.CategoricalDtype:
+    """
+    Categoria única para os nomes de times.
+
+    ``team_home`` e ``team_away`` usam o mesmo tipo, então podem ser concatenadas
+    (formato time-partida) e comparadas sem voltar a ser texto.
+    """
+    return pd.CategoricalDtype(sorted(teams["team_long_name"].dropna().unique()))
+
+
+def frame_memory(df: pd.DataFrame) -> float:
+    """Memória ocupada pelo DataFrame, em MB (inclui o conteúdo das strings)."""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def memory_report() -> pd.DataFrame:
+    """Memória de cada tabela lida do SQLite, com os tipos originais e com o schema."""
+    from dashboard.data import (
+        LEAGUE_QUERY,
+        MATCH_QUERY,
+        PLAYER_ATTRIBUTES_QUERY,
+        PLAYER_QUERY,
+        TEAM_QUERY,
+        add_team_names,
+        get_engine,
+    )
+
+    engine = get_engine()
+    teams = pd.read_sql(TEAM_QUERY, engine)
+    brutas = {
+        "Team": teams,
+        "League": pd.read_sql(LEAGUE_QUERY, engine),
+        "Match": pd.read_sql(MATCH_QUERY, engine),
+        "Player": pd.read_sql(PLAYER_QUERY, engine),
+        "Player_Attributes": pd.read_sql(PLAYER_ATTRIBUTES_QUERY, engine),
+    }
+    # Nomes dos times como texto (antes) e como categoria compartilhada (depois)
+    nomes = teams.set_index("team_api_id")["team_long_name"]
+    antes = brutas["Match"].assign(
+        team_home=brutas["Match"]["home_team_api_id"].map(nomes),
+        team_away=brutas["Match"]["away_team_api_id"].map(nomes),
+    )
+
+    linhas = []
+    for tabela, df in brutas.items():
+        original = antes if tabela == "Match" else df
+        compacto = apply_schema(df)
+        if tabela == "Match":
+            compacto = add_team_names(compacto, apply_schema(teams))
+        linhas.append({
+            "Tabela": tabela,
+            "Linhas": len(df),
+            "Antes (MB)": frame_memory(original),
+            "Depois (MB)": frame_memory(compacto),
+        })
+    report = pd.DataFrame(linhas).set_index("Tabela")
+    report["Redução"] = 1 - report["Depois (MB)"] / report["Antes (MB)"]
+    return report
+
+
+if __name__ == "__main__":
+    print(memory_report().round(2).to_string())
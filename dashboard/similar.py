@@ -0,0 +1,135 @@
+"""
+Busca de jogadores semelhantes pelos atributos técnicos.
+
+Construído uma vez a partir do snapshot mais recente de cada jogador: os
+atributos técnicos viram uma matriz ``float32`` padronizada (média 0, desvio 1
+por atributo; ausentes ficam na média). A distância euclidiana de um jogador a
+todos os outros sai de um único produto matriz-vetor:
+
+    |x - q|² = |x|² - 2·x·q + |q|²
+
+com ``|x|²`` pré-calculado. Acima de ``APPROX_MIN_PLAYERS`` jogadores o índice
+também agrupa as linhas em células (k-means) e cada consulta só mede as células
+mais próximas do jogador (busca aproximada, estilo IVF).
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.schema import PLAYER_ATTRIBUTE_COLUMNS
+
+# Atributos técnicos (overall_rating e potential ficam de fora: são resumos deles)
+SIMILARITY_COLUMNS = PLAYER_ATTRIBUTE_COLUMNS[2:]
+
+# A partir de quantos jogadores as consultas usam as células do k-means
+APPROX_MIN_PLAYERS = 200_000
+
+# Células visitadas por consulta na busca aproximada
+N_PROBE = 8
+
+
+def _kmeans(X: np.ndarray, n_cells: int, iteracoes: int = 10, amostra: int = 50_000, seed: int = 0):
+    """Centroides por k-means (Lloyd) numa amostra das linhas."""
+    rng = np.random.default_rng(seed)
+    linhas = X[rng.choice(len(X), size=min(amostra, len(X)), replace=False)]
+    centroides = linhas[rng.choice(len(linhas), size=n_cells, replace=False)].copy()
+    for _ in range(iteracoes):
+        celula = _nearest(linhas, centroides)
+        soma = np.zeros_like(centroides)
+        np.add.at(soma, celula, linhas)
+        contagem = np.bincount(celula, minlength=n_cells)
+        cheias = contagem > 0
+        centroides[cheias] = soma[cheias] / contagem[cheias, None]
+    return centroides
+
+
+def _nearest(X: np.ndarray, centroides: np.ndarray, lote: int = 65_536) -> np.ndarray:
+    """Centroide mais próximo de cada linha, em lotes para limitar a memória."""
+    normas = (centroides ** 2).sum(axis=1)
+    celulas = np.empty(len(X), dtype=np.int32)
+    for inicio in range(0, len(X), lote):
+        bloco = X[inicio:inicio + lote]
+        celulas[inicio:inicio + lote] = np.argmin(normas - 2 * bloco @ centroides.T, axis=1)
+    return celulas
+
+
+class SimilarityIndex:
+    """Vizinhos mais próximos sobre os atributos mais recentes de cada jogador."""
+
+    def __init__(self, latest: pd.DataFrame, players: pd.DataFrame, approx_min_players: int = APPROX_MIN_PLAYERS):
+        latest = latest.merge(players[["player_api_id", "player_name", "birthday"]], on="player_api_id", how="left")
+        self.player_ids = latest["player_api_id"].to_numpy()
+        self.player_names = latest["player_name"].to_numpy(dtype=object)
+        self.rows = pd.Series(np.arange(len(latest)), index=self.player_ids)
+        self.overall = latest["overall_rating"].to_numpy(dtype="float32", na_value=np.nan)
+        # Idade em anos completos na data do snapshot (os dados param em 2016)
+        idade = (latest["date"] - latest["birthday"]).dt.days / 365.25
+        self.age = np.floor(idade.to_numpy(dtype="float32", na_value=np.nan))
+
+        valores = latest[SIMILARITY_COLUMNS].to_numpy(dtype="float32", na_value=np.nan)
+        media = np.nanmean(valores, axis=0)
+        desvio = np.nanstd(valores, axis=0)
+        desvio[~(desvio > 0)] = 1
+        X = (valores - media) / desvio
+        X[np.isnan(X)] = 0
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.norms = (self.X ** 2).sum(axis=1)
+
+        self.centroids = None
+        if len(self.X) >= approx_min_players:
+            self.centroids = _kmeans(self.X, n_cells=int(np.sqrt(len(self.X))))
+            celulas = _nearest(self.X, self.centroids)
+            ordem = np.argsort(celulas, kind="stable")
+            self.cell_rows = ordem.astype(np.int32)
+            self.cell_bounds = np.searchsorted(celulas[ordem], np.arange(len(self.centroids) + 1))
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def _candidates(self, q: np.ndarray) -> np.ndarray:
+        """Linhas a medir: todas, ou as das ``N_PROBE`` células mais próximas de ``q``."""
+        if self.centroids is None:
+            return None
+        distancias = ((self.centroids - q) ** 2).sum(axis=1)
+        celulas = np.argpartition(distancias, min(N_PROBE, len(distancias) - 1))[:N_PROBE]
+        return np.concatenate([self.cell_rows[self.cell_bounds[c]:self.cell_bounds[c + 1]] for c in celulas])
+
+    def similar(self, player_api_id: int, k: int = 5, age=None, overall=None) -> pd.DataFrame:
+        """
+        Os ``k`` jogadores mais próximos de ``player_api_id`` (ele mesmo excluído).
+
+        ``age`` e ``overall`` são intervalos ``(mín, máx)`` opcionais. Colunas:
+        ``player_api_id``, ``player_name``, ``age``, ``overall_rating``, ``distance``.
+        """
+        colunas = ["player_api_id", "player_name", "age", "overall_rating", "distance"]
+        if player_api_id not in self.rows.index:
+            return pd.DataFrame(columns=colunas)
+        linha = self.rows[player_api_id]
+        q = self.X[linha]
+
+        candidatos = self._candidates(q)
+        X = self.X if candidatos is None else self.X[candidatos]
+        normas = self.norms if candidatos is None else self.norms[candidatos]
+        indices = np.arange(len(self.X)) if candidatos is None else candidatos
+
+        d2 = normas - 2 * (X @ q) + self.norms[linha]
+        validos = indices != linha
+        for valores, intervalo in ((self.age, age), (self.overall, overall)):
+            if intervalo is not None:
+                v = valores[indices]
+                validos &= (v >= intervalo[0]) & (v <= intervalo[1])
+        d2 = np.where(validos, d2, np.inf)
+
+        k = min(k, int(validos.sum()))
+        if k == 0:
+            return pd.DataFrame(columns=colunas)
+        melhores = np.argpartition(d2, k - 1)[:k]
+        melhores = melhores[np.argsort(d2[melhores], kind="stable")]
+        resultado = indices[melhores]
+        return pd.DataFrame({
+            "player_api_id": self.player_ids[resultado],
+            "player_name": self.player_names[resultado],
+            "age": self.age[resultado],
+            "overall_rating": self.overall[resultado],
+            "distance": np.sqrt(np.maximum(d2[melhores], 0)),
+        })
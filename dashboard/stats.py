@@ -0,0 +1,370 @@
+"""
+Estatísticas de times calculadas com operações vetorizadas.
+
+A base de tudo é o formato "time-partida": cada partida vira duas linhas, uma do
+ponto de vista do mandante e outra do visitante. A partir dele qualquer
+estatística por time é um único ``groupby``.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Colunas da partida repetidas nas duas linhas do formato time-partida
+MATCH_COLUMNS = ["match_api_id", "league_id", "league_name", "season", "stage", "date"]
+
+RESULTS = ["V", "E", "D"]
+
+# Faixas de gols usadas nos percentuais de "mais de X gols"
+FAIXAS = [0.5, 1.5, 2.5, 3.5]
+
+
+def fill_unknown(names: pd.Series) -> pd.Series:
+    """Troca nomes ausentes por "Unknown" (também em colunas categóricas)."""
+    if not names.isna().any():
+        return names
+    if isinstance(names.dtype, pd.CategoricalDtype) and "Unknown" not in names.cat.categories:
+        names = names.cat.add_categories("Unknown")
+    return names.fillna("Unknown")
+
+
+def team_matches(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte partidas (uma linha por jogo) em linhas time-partida.
+
+    Colunas: ``team``, ``opponent``, ``goals_for``, ``goals_against``,
+    ``is_home``, ``result`` ("V", "E" ou "D"), ``points`` e as colunas de
+    identificação da partida presentes em ``matches``. Quando os ids dos times
+    estão disponíveis, também ``team_api_id`` e ``opponent_api_id``.
+    """
+    def duas_vezes(col_home, col_away):
+        return pd.concat([matches[col_home], matches[col_away]], ignore_index=True)
+
+    n = len(matches)
+    long = pd.DataFrame({
+        col: pd.concat([matches[col], matches[col]], ignore_index=True)
+        for col in MATCH_COLUMNS if col in matches.columns
+    })
+    long["team"] = duas_vezes("team_home", "team_away")
+    long["opponent"] = duas_vezes("team_away", "team_home")
+    if "home_team_api_id" in matches.columns:
+        long["team_api_id"] = duas_vezes("home_team_api_id", "away_team_api_id")
+        long["opponent_api_id"] = duas_vezes("away_team_api_id", "home_team_api_id")
+    long["goals_for"] = duas_vezes("home_team_goal", "away_team_goal")
+    long["goals_against"] = duas_vezes("away_team_goal", "home_team_goal")
+    long["is_home"] = np.repeat([True, False], n)
+
+    saldo = long["goals_for"].to_numpy() - long["goals_against"].to_numpy()
+    codigo = np.where(saldo > 0, 0, np.where(saldo == 0, 1, 2))
+    long["result"] = pd.Categorical.from_codes(codigo, categories=RESULTS)
+    long["points"] = np.array([3, 1, 0], dtype="int8")[codigo]
+    return long
+
+
+def _stat_columns(long: pd.DataFrame, keys) -> pd.DataFrame:
+    """Colunas numéricas somáveis por time (uma soma só no groupby)."""
+    resultado = long["result"]
+    colunas = {key: long[key] for key in keys}
+    colunas.update({
+        "PJ": np.ones(len(long), dtype="int64"),
+        "V": (resultado == "V").to_numpy(dtype="int64"),
+        "E": (resultado == "E").to_numpy(dtype="int64"),
+        "D": (resultado == "D").to_numpy(dtype="int64"),
+        "GM": long["goals_for"].to_numpy(dtype="int64"),
+        "GS": long["goals_against"].to_numpy(dtype="int64"),
+        "Pts": long["points"].to_numpy(dtype="int64"),
+    })
+    return pd.DataFrame(colunas)
+
+
+def team_stats(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Linha de estatísticas de todos os times das partidas, em uma única passada.
+
+    Índice: nome do time. Colunas: Partidas, Gols Marcados, Gols Sofridos,
+    Vitórias, Empates, Derrotas.
+    """
+    valores = _stat_columns(team_matches(matches), ["team"])
+    tabela = valores.groupby("team", observed=True).sum()
+    tabela.index.name = None
+    return tabela.rename(columns={
+        "PJ": "Partidas",
+        "GM": "Gols Marcados",
+        "GS": "Gols Sofridos",
+        "V": "Vitórias",
+        "E": "Empates",
+        "D": "Derrotas",
+    })[["Partidas", "Gols Marcados", "Gols Sofridos", "Vitórias", "Empates", "Derrotas"]]
+
+
+# Tipo de evento (tabela Match_Events) → coluna de ``team_event_stats``
+EVENT_LABELS = {
+    "shoton": "Chutes no gol",
+    "shotoff": "Chutes para fora",
+    "corner": "Escanteios",
+    "cross": "Cruzamentos",
+    "foulcommit": "Faltas",
+}
+CARD_LABELS = {"y": "Amarelos", "y2": "Vermelhos", "r": "Vermelhos"}
+
+
+def team_event_stats(matches: pd.DataFrame, events: pd.DataFrame, possession: pd.DataFrame) -> pd.DataFrame:
+    """
+    Eventos por time nas partidas de ``matches`` (com ids dos times).
+
+    ``events`` tem ``match_api_id``, ``type``, ``team_api_id`` e ``detail``;
+    ``possession`` tem as leituras de posse (a última de cada partida vale para o
+    jogo todo). Índice: nome do time. Colunas: Partidas, as de ``EVENT_LABELS``,
+    Amarelos, Vermelhos e Posse média (%).
+    """
+    long = team_matches(matches)[["match_api_id", "team", "team_api_id", "is_home"]]
+    tabela = long.groupby("team_api_id").agg(Time=("team", "first"), Partidas=("match_api_id", "size"))
+
+    rotulos = events["type"].map(EVENT_LABELS)
+    cartoes = events["type"] == "card"
+    rotulos = rotulos.mask(cartoes, events["detail"].map(CARD_LABELS))
+    contagem = events.assign(rotulo=rotulos).dropna(subset=["rotulo", "team_api_id"])
+    contagem = contagem.groupby(["team_api_id", "rotulo"]).size().unstack(fill_value=0)
+    colunas = [*EVENT_LABELS.values(), "Amarelos", "Vermelhos"]
+    contagem.index = contagem.index.astype(tabela.index.dtype)
+    tabela = tabela.join(contagem.reindex(columns=colunas, fill_value=0)).fillna(dict.fromkeys(colunas, 0))
+
+    final = possession.dropna(subset=["home_pos", "away_pos"]).sort_values(["match_api_id", "minute"])
+    final = final.groupby("match_api_id").last()
+    posse = long.join(final[["home_pos", "away_pos"]], on="match_api_id", how="inner")
+    posse["pos"] = np.where(posse["is_home"], posse["home_pos"], posse["away_pos"])
+    tabela["Posse média (%)"] = posse.groupby("team_api_id")["pos"].mean().round(1)
+
+    tabela = tabela.astype(dict.fromkeys(colunas, "int64")).set_index("Time")
+    tabela.index.name = None
+    return tabela
+
+
+def head_to_head(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Confrontos de todos os pares de times das partidas, em um único ``groupby``.
+
+    Uma linha por (``team``, ``opponent``), do ponto de vista de ``team``:
+    PJ, V, E, D, GM, GS, Pts.
+    """
+    valores = _stat_columns(team_matches(matches), ["team", "opponent"])
+    return valores.groupby(["team", "opponent"], observed=True).sum().reset_index()
+
+
+def pair_index(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Confronto direto de cada par de times (sem ordem) somando todas as partidas.
+
+    O par é identificado por ``team_a_api_id < team_b_api_id``; vitórias e gols
+    são do ponto de vista de cada lado. ``match_ids`` lista as partidas do par em
+    ordem de data, separadas por vírgula.
+    """
+    if "date" in matches.columns:
+        matches = matches.sort_values(["date", "match_api_id"], kind="stable")
+    home = matches["home_team_api_id"].to_numpy(dtype="int64")
+    away = matches["away_team_api_id"].to_numpy(dtype="int64")
+    gols_casa = matches["home_team_goal"].to_numpy(dtype="int64")
+    gols_fora = matches["away_team_goal"].to_numpy(dtype="int64")
+    a_em_casa = home < away
+    gols_a = np.where(a_em_casa, gols_casa, gols_fora)
+    gols_b = np.where(a_em_casa, gols_fora, gols_casa)
+
+    valores = pd.DataFrame({
+        "team_a_api_id": np.minimum(home, away),
+        "team_b_api_id": np.maximum(home, away),
+        "partidas": np.ones(len(matches), dtype="int64"),
+        "vitorias_a": (gols_a > gols_b).astype("int64"),
+        "empates": (gols_a == gols_b).astype("int64"),
+        "vitorias_b": (gols_a < gols_b).astype("int64"),
+        "gols_a": gols_a,
+        "gols_b": gols_b,
+        "match_id": matches["match_api_id"].astype(str).to_numpy(),
+    })
+    grupos = valores.groupby(["team_a_api_id", "team_b_api_id"])
+    pares = grupos[["partidas", "vitorias_a", "empates", "vitorias_b", "gols_a", "gols_b"]].sum()
+    pares["match_ids"] = grupos["match_id"].agg(",".join)
+    return pares.reset_index()
+
+
+def head_to_head_matrix(confrontos: pd.DataFrame, teams) -> dict:
+    """
+    Matrizes N×N (linha: time, coluna: adversário) dos ``teams`` escolhidos a partir
+    de ``head_to_head``: ``"aproveitamento"`` (% dos pontos disputados) e ``"placar"``
+    (texto "V-E-D"). Pares que não se enfrentaram ficam vazios.
+    """
+    teams = list(teams)
+    sel = confrontos[confrontos["team"].isin(teams) & confrontos["opponent"].isin(teams)]
+    sel = sel.assign(
+        team=sel["team"].astype(str),
+        opponent=sel["opponent"].astype(str),
+        aproveitamento=sel["Pts"] / (3 * sel["PJ"]) * 100,
+        placar=sel["V"].astype(str) + "-" + sel["E"].astype(str) + "-" + sel["D"].astype(str),
+    )
+    return {
+        valor: sel.pivot(index="team", columns="opponent", values=valor).reindex(index=teams, columns=teams)
+        for valor in ("aproveitamento", "placar")
+    }
+
+
+def standings_table(matches: pd.DataFrame, by=None) -> pd.DataFrame:
+    """
+    Tabela de classificação (PJ, V, E, D, GM, GS, SG, Pts) de todos os times.
+
+    ``by`` são colunas extras de agrupamento (ex.: ``["league_id", "season"]``)
+    para gerar várias tabelas de uma vez; sem ele, as partidas de todas as
+    ligas/temporadas recebidas são somadas numa tabela só. Ordenada por pontos,
+    saldo e gols marcados.
+    """
+    chaves = list(by or [])
+    valores = _stat_columns(team_matches(matches), chaves + ["team"])
+    tabela = valores.groupby(chaves + ["team"], observed=True).sum()
+    tabela["SG"] = tabela["GM"] - tabela["GS"]
+    tabela = tabela.reset_index().rename(columns={"team": "Time"})
+    tabela = tabela[chaves + ["Time", "PJ", "V", "E", "D", "GM", "GS", "SG", "Pts"]]
+    return tabela.sort_values(
+        by=chaves + ["Pts", "SG", "GM"],
+        ascending=[True] * len(chaves) + [False, False, False],
+        kind="stable",
+    ).reset_index(drop=True)
+
+
+def standings_evolution(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Classificação ao fim de cada rodada, numa única passada sobre as partidas.
+
+    As linhas time-partida são somadas por (time, rodada) e acumuladas ao longo das
+    rodadas com ``cumsum``; times sem jogo numa rodada repetem a linha anterior.
+    Colunas: ``stage``, Time, PJ, V, E, D, GM, GS, SG, Pts e Posição (critérios da
+    tabela: pontos, saldo, gols marcados). Espera partidas de uma só temporada.
+    """
+    colunas = ["PJ", "V", "E", "D", "GM", "GS", "Pts"]
+    valores = _stat_columns(team_matches(matches), ["team", "stage"])
+    por_rodada = valores.groupby(["team", "stage"], observed=True)[colunas].sum()
+
+    times = por_rodada.index.get_level_values("team").unique()
+    rodadas = np.sort(por_rodada.index.get_level_values("stage").unique())
+    grade = pd.MultiIndex.from_product([times, rodadas], names=["team", "stage"])
+    acumulado = por_rodada.reindex(grade, fill_value=0).to_numpy()
+    # (times, rodadas, colunas): soma acumulada ao longo das rodadas
+    acumulado = acumulado.reshape(len(times), len(rodadas), len(colunas)).cumsum(axis=1)
+
+    tabela = pd.DataFrame(acumulado.reshape(-1, len(colunas)), columns=colunas)
+    tabela.insert(0, "Time", np.repeat(np.asarray(times), len(rodadas)))
+    tabela.insert(0, "stage", np.tile(rodadas, len(times)))
+    tabela["SG"] = tabela["GM"] - tabela["GS"]
+    tabela = tabela.sort_values(
+        by=["stage", "Pts", "SG", "GM"], ascending=[True, False, False, False], kind="stable"
+    ).reset_index(drop=True)
+    tabela["Posição"] = tabela.groupby("stage").cumcount() + 1
+    return tabela[["stage", "Time", "PJ", "V", "E", "D", "GM", "GS", "SG", "Pts", "Posição"]]
+
+
+def goals_over(total_goals, faixas) -> np.ndarray:
+    """Matriz booleana (partidas × faixas): a partida teve mais gols que a faixa?"""
+    return np.asarray(total_goals)[:, None] > np.asarray(faixas)[None, :]
+
+
+def goal_bands_ranking(matches: pd.DataFrame, faixas=FAIXAS, by=None) -> pd.DataFrame:
+    """
+    Partidas de cada time acima de cada faixa de gols, para todas as faixas de uma vez.
+
+    Colunas: (``by``), Time, Partidas, Faixa de Gols (ex.: ">2.5 gols"),
+    Total Partidas Acima e Percentual (0–100).
+    """
+    chaves = list(by or [])
+    long = team_matches(matches)
+    total = long["goals_for"].to_numpy() + long["goals_against"].to_numpy()
+    rotulos = [f">{f} gols" for f in faixas]
+
+    acima = pd.DataFrame(goals_over(total, faixas).astype("int64"), columns=rotulos)
+    acima["Partidas"] = 1
+    for chave in chaves + ["team"]:
+        acima[chave] = long[chave]
+    contagem = acima.groupby(chaves + ["team"], observed=True).sum()
+
+    ranking = contagem.reset_index().rename(columns={"team": "Time"}).melt(
+        id_vars=chaves + ["Time", "Partidas"], var_name="Faixa de Gols", value_name="Total Partidas Acima"
+    )
+    ranking["Percentual"] = ranking["Total Partidas Acima"] / ranking["Partidas"] * 100
+    return ranking
+
+
+def round_stats(matches: pd.DataFrame, faixas=FAIXAS, by=None) -> pd.DataFrame:
+    """
+    Resumo de cada rodada (``stage``): partidas, gols, resultados e partidas
+    acima de cada faixa de gols.
+    """
+    chaves = list(by or []) + ["stage"]
+    gm = matches["home_team_goal"].to_numpy(dtype="int64")
+    gv = matches["away_team_goal"].to_numpy(dtype="int64")
+    total = gm + gv
+
+    valores = pd.DataFrame({chave: matches[chave].to_numpy() for chave in chaves})
+    valores["Partidas"] = 1
+    valores["home_team_goal"] = gm
+    valores["away_team_goal"] = gv
+    valores["Total Gols"] = total
+    valores["Vitórias Mandante"] = (gm > gv).astype("int64")
+    valores["Vitórias Visitante"] = (gv > gm).astype("int64")
+    valores["Empates"] = (gm == gv).astype("int64")
+    acima = goals_over(total, faixas).astype("int64")
+    for i, f in enumerate(faixas):
+        valores[f">{f} gols"] = acima[:, i]
+    return valores.groupby(chaves, observed=True).sum().reset_index()
+
+
+def league_summary(matches: pd.DataFrame, faixas=FAIXAS) -> dict:
+    """
+    Agregados da página de visão geral, um conjunto por liga/temporada.
+
+    Devolve ``{"standings", "rounds", "goal_bands"}``; todos os números são
+    somáveis, então várias temporadas se combinam com as funções ``combine_*``.
+    """
+    # Times sem nome entram como "Unknown" em vez de sumirem do groupby
+    matches = matches.assign(
+        team_home=fill_unknown(matches["team_home"]),
+        team_away=fill_unknown(matches["team_away"]),
+    )
+    by = ["league_id", "season"]
+    return {
+        "standings": standings_table(matches, by=by),
+        "rounds": round_stats(matches, faixas, by=by),
+        "goal_bands": goal_bands_ranking(matches, faixas, by=by),
+    }
+
+
+def combine_standings(standings: pd.DataFrame) -> pd.DataFrame:
+    """Soma tabelas de classificação de várias ligas/temporadas numa só."""
+    tabela = standings.groupby("Time")[["PJ", "V", "E", "D", "GM", "GS", "Pts"]].sum()
+    tabela["SG"] = tabela["GM"] - tabela["GS"]
+    tabela = tabela.reset_index()[["Time", "PJ", "V", "E", "D", "GM", "GS", "SG", "Pts"]]
+    return tabela.sort_values(
+        by=["Pts", "SG", "GM"], ascending=[False, False, False], kind="stable"
+    ).reset_index(drop=True)
+
+
+def combine_round_stats(rounds: pd.DataFrame) -> pd.DataFrame:
+    """Soma os resumos por rodada de várias temporadas e calcula a média de gols."""
+    colunas = [c for c in rounds.columns if c not in ("league_id", "season", "stage")]
+    por_rodada = rounds.groupby("stage")[colunas].sum().reset_index()
+    por_rodada["Média Gols por Jogo"] = por_rodada["Total Gols"] / por_rodada["Partidas"]
+    return por_rodada
+
+
+def goal_band_share(rounds: pd.DataFrame, faixas=FAIXAS) -> pd.DataFrame:
+    """Partidas acima de cada faixa de gols e o percentual do total (a partir de ``round_stats``)."""
+    total = rounds["Partidas"].sum()
+    contagem = [int(rounds[f">{f} gols"].sum()) for f in faixas]
+    return pd.DataFrame({
+        "Faixa de Gols": [f">{f} gols" for f in faixas],
+        "Partidas": contagem,
+        "Percentual": [round(c / total * 100, 1) if total > 0 else 0 for c in contagem],
+    })
+
+
+def combine_goal_bands(ranking: pd.DataFrame) -> pd.DataFrame:
+    """Soma os rankings por faixa de gols de várias temporadas."""
+    ranking = ranking.groupby(["Time", "Faixa de Gols"], sort=False)[
+        ["Partidas", "Total Partidas Acima"]
+    ].sum().reset_index()
+    ranking["Percentual"] = ranking["Total Partidas Acima"] / ranking["Partidas"] * 100
+    return ranking
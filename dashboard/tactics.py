@@ -0,0 +1,110 @@
+"""
+Perfil tático dos times (``Team_Attributes``) na data de cada partida.
+
+``Team_Attributes`` tem vários snapshots datados por time (velocidade de
+construção, criação de chances, pressão defensiva...). ``TeamAttributeIndex``
+ordena os snapshots uma vez por (time, data) e guarda uma chave ``int64`` por
+linha, ``time · 2²⁰ + dia``. O as-of join de qualquer conjunto de partidas é um
+único ``np.searchsorted`` dessas chaves: para cada time-partida, o snapshot mais
+recente do mesmo time até a data do jogo (inclusive) — sem busca por linha nem
+``groupby``, e sem ordenar as partidas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.schema import TEAM_ATTRIBUTE_COLUMNS
+
+# Nome exibido de cada atributo tático
+TEAM_ATTRIBUTE_LABELS = {
+    "buildUpPlaySpeed": "Velocidade na construção",
+    "buildUpPlayDribbling": "Drible na construção",
+    "buildUpPlayPassing": "Passe na construção",
+    "chanceCreationPassing": "Passe na criação",
+    "chanceCreationCrossing": "Cruzamentos",
+    "chanceCreationShooting": "Finalizações",
+    "defencePressure": "Pressão defensiva",
+    "defenceAggression": "Agressividade defensiva",
+    "defenceTeamWidth": "Largura defensiva",
+}
+
+# Bits reservados ao dia na chave (2²⁰ dias ≈ 2870 anos a partir de 1970)
+_DAY_BITS = 20
+
+
+def _days(datas) -> np.ndarray:
+    """Dias desde 1970 de cada data (``datetime64``)."""
+    return np.asarray(datas, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+class TeamAttributeIndex:
+    """Snapshots de ``Team_Attributes`` ordenados por (time, data) para o as-of join."""
+
+    def __init__(self, team_attributes: pd.DataFrame):
+        snapshots = team_attributes.dropna(subset=["team_api_id", "date"])
+        times = snapshots["team_api_id"].to_numpy(dtype=np.int64)
+        dias = _days(snapshots["date"])
+        ordem = np.lexsort((dias, times))
+        self.teams = times[ordem]
+        self.dates = snapshots["date"].to_numpy(dtype="datetime64[ns]")[ordem]
+        self.keys = (times[ordem] << _DAY_BITS) + dias[ordem]
+        self.values = snapshots[TEAM_ATTRIBUTE_COLUMNS].to_numpy(dtype="float32", na_value=np.nan)[ordem]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, team_ids, datas) -> np.ndarray:
+        """
+        Linha do snapshot de cada (time, data): o mais recente do time com data
+        até a do jogo; -1 quando o time não tem snapshot até lá.
+        """
+        times = np.asarray(team_ids, dtype=np.int64)
+        datas = np.asarray(datas, dtype="datetime64[ns]")
+        validas = ~np.isnat(datas)
+        chaves = (times << _DAY_BITS) + np.where(validas, _days(datas), 0)
+        linhas = np.searchsorted(self.keys, chaves, side="right") - 1
+        achou = validas & (linhas >= 0)
+        achou[achou] = self.teams[linhas[achou]] == times[achou]
+        return np.where(achou, linhas, -1)
+
+    def attach(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """
+        ``matches`` com o snapshot de cada time na data da partida: colunas
+        ``home_<atributo>``/``away_<atributo>`` (``float32``, NaN sem snapshot) e
+        ``home_attributes_date``/``away_attributes_date`` (data do snapshot usado).
+        """
+        blocos = []
+        for lado in ("home", "away"):
+            linhas = self.lookup(matches[f"{lado}_team_api_id"], matches["date"])
+            achou = linhas >= 0
+            valores = np.full((len(linhas), len(TEAM_ATTRIBUTE_COLUMNS)), np.nan, dtype="float32")
+            valores[achou] = self.values[linhas[achou]]
+            datas = np.full(len(linhas), np.datetime64("NaT"), dtype="datetime64[ns]")
+            datas[achou] = self.dates[linhas[achou]]
+            # Um bloco float32 por lado (um só array), sem inserir coluna por coluna
+            colunas = [f"{lado}_{col}" for col in TEAM_ATTRIBUTE_COLUMNS]
+            blocos.append(pd.DataFrame(valores, index=matches.index, columns=colunas))
+            blocos.append(pd.DataFrame({f"{lado}_attributes_date": datas}, index=matches.index))
+        return pd.concat([matches, *blocos], axis=1)
+
+
+def tactical_profile(joined: pd.DataFrame, team_ids) -> pd.DataFrame:
+    """
+    Perfil tático médio de cada time de ``team_ids`` nas partidas de ``joined``
+    (saída de ``TeamAttributeIndex.attach``): média dos snapshots em vigor em cada
+    jogo, mandante ou visitante. Índice: ``team_api_id``; colunas: os rótulos de
+    ``TEAM_ATTRIBUTE_LABELS`` e "Partidas com snapshot".
+    """
+    partes = []
+    for lado in ("home", "away"):
+        parte = joined[[f"{lado}_team_api_id", *(f"{lado}_{col}" for col in TEAM_ATTRIBUTE_COLUMNS)]]
+        partes.append(parte.set_axis(["team_api_id", *TEAM_ATTRIBUTE_COLUMNS], axis=1))
+    long = pd.concat(partes, ignore_index=True)
+    long = long[long["team_api_id"].isin(team_ids)]
+
+    grupos = long.groupby("team_api_id")
+    perfil = grupos[TEAM_ATTRIBUTE_COLUMNS].mean().astype("float64").round(1)
+    perfil = perfil.rename(columns=TEAM_ATTRIBUTE_LABELS)
+    com_snapshot = long[TEAM_ATTRIBUTE_COLUMNS].notna().any(axis=1)
+    perfil["Partidas com snapshot"] = com_snapshot.groupby(long["team_api_id"]).sum()
+    return perfil.reindex(list(team_ids))
@@ -0,0 +1,73 @@
+"""
+Redução de séries temporais antes de irem para o Plotly.
+
+O histórico de atributos de um jogador tem um snapshot por data, em intervalos
+irregulares. Cada série (jogador × atributo) passa por duas etapas:
+
+1. média por mês: várias atualizações no mesmo mês viram um ponto só;
+2. LTTB (Largest-Triangle-Three-Buckets), se a série ainda tiver mais de
+   ``max_points`` pontos: mantém o primeiro e o último ponto e, em cada faixa
+   intermediária, o ponto que forma o maior triângulo com os vizinhos. Picos e
+   quedas sobrevivem, e o gráfico final tem no máximo ``max_points`` pontos por
+   série, qualquer que seja o período.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Pontos por série enviados ao gráfico
+MAX_POINTS = 60
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """Posições dos ``n`` pontos de ``(x, y)`` escolhidos pelo LTTB (ordenadas)."""
+    tamanho = len(x)
+    if n >= tamanho or n < 3:
+        return np.arange(tamanho) if n >= tamanho else np.array([0, tamanho - 1])[:max(n, 0)]
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # Faixas de mesmo tamanho entre o primeiro e o último ponto
+    limites = np.linspace(1, tamanho - 1, n - 1).astype(np.int64)
+    escolhidos = np.empty(n, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, tamanho - 1
+    anterior = 0
+    for i in range(n - 2):
+        inicio, fim = limites[i], limites[i + 1]
+        # Média da faixa seguinte (o último ponto, na última faixa)
+        proximo_fim = limites[i + 2] if i + 2 < n - 1 else tamanho
+        media_x = x[fim:proximo_fim].mean()
+        media_y = y[fim:proximo_fim].mean()
+        areas = np.abs(
+            (x[anterior] - media_x) * (y[inicio:fim] - y[anterior])
+            - (x[anterior] - x[inicio:fim]) * (media_y - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas))
+        escolhidos[i + 1] = anterior
+    return escolhidos
+
+
+def monthly(history: pd.DataFrame, columns) -> pd.DataFrame:
+    """Média de ``columns`` por mês de ``date`` (o ponto fica no primeiro dia do mês)."""
+    mes = history["date"].dt.to_period("M").dt.to_timestamp().rename("date")
+    valores = history[columns].astype("float64")
+    return valores.groupby(mes, sort=True).mean().reset_index()
+
+
+def downsample_history(history: pd.DataFrame, columns, max_points: int = MAX_POINTS) -> pd.DataFrame:
+    """
+    Histórico de um jogador em formato longo e reduzido: colunas ``date``,
+    ``Atributo`` e ``Valor``, com no máximo ``max_points`` pontos por atributo.
+    """
+    if history.empty:
+        return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "Atributo": [], "Valor": []})
+    mensal = monthly(history, columns)
+    datas = mensal["date"].to_numpy()
+    x = datas.astype("datetime64[D]").astype("int64")
+    partes = []
+    for coluna in columns:
+        y = mensal[coluna].to_numpy()
+        validos = ~np.isnan(y)
+        posicoes = np.flatnonzero(validos)[lttb(x[validos], y[validos], max_points)]
+        partes.append(pd.DataFrame({"date": datas[posicoes], "Atributo": coluna, "Valor": y[posicoes]}))
+    return pd.concat(partes, ignore_index=True)
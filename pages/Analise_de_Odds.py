@@ -0,0 +1,111 @@
+import streamlit as st
+import plotly.express as px
+
+from dashboard.data import (
+    load_concurrently,
+    load_leagues,
+    load_match_probabilities,
+    load_odds_calibration,
+    load_odds_upsets,
+)
+from dashboard.metrics import end_page, fragment, stage, start_page
+
+st.set_page_config(layout="wide")
+start_page("Análise de odds")
+st.title("🎲 Análise das Odds")
+st.caption(
+    "Probabilidades implícitas de cada casa de apostas sem a margem (overround), "
+    "combinadas numa probabilidade de consenso por partida."
+)
+
+# Dados compartilhados (cache por processo)
+leagues, probabilidades = load_concurrently(load_leagues, load_match_probabilities)
+
+# -------------------------------
+# 🔹 Filtro de ligas e temporadas
+# -------------------------------
+nomes_ligas = dict(zip(leagues["league_id"], leagues["league_name"]))
+col1, col2 = st.columns(2)
+league_ids = col1.multiselect(
+    "Ligas", sorted(nomes_ligas, key=nomes_ligas.get), default=sorted(nomes_ligas), format_func=nomes_ligas.get
+)
+temporadas = sorted(probabilidades["season"].dropna().unique())
+seasons = col2.multiselect("Temporadas", temporadas, default=temporadas)
+
+
+# -------------------------------
+# 🔹 Calibração
+# -------------------------------
+# Fragmento: trocar o agrupamento só recalcula (ou lê do cache) esta seção
+@fragment("calibração das odds")
+def calibracao():
+    st.subheader("🎯 Calibração das probabilidades")
+    grupos = {"Liga": "league_name", "Temporada": "season", "Geral": None}
+    por = st.radio("Calibração por", list(grupos), horizontal=True)
+    resultado = load_odds_calibration(league_ids, seasons, grupos[por])
+    coluna = grupos[por] or "Grupo"
+
+    with stage("gráfico de calibração"):
+        fig = px.line(
+            resultado["calibracao"],
+            x="Previsto",
+            y="Observado",
+            color=coluna,
+            markers=True,
+            hover_data=["Previsões"],
+            labels={
+                "Previsto": "Probabilidade prevista",
+                "Observado": "Frequência observada",
+                coluna: por,
+            },
+            title="Probabilidade prevista × frequência observada",
+        )
+        # Diagonal: calibração perfeita
+        fig.add_shape(type="line", x0=0, y0=0, x1=1, y1=1, line=dict(dash="dash", color="gray"))
+        fig.update_xaxes(range=[0, 1])
+        fig.update_yaxes(range=[0, 1])
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("**Qualidade das previsões** (Brier menor é melhor)")
+    st.dataframe(resultado["qualidade"], use_container_width=True)
+
+
+# -------------------------------
+# 🔹 Zebras
+# -------------------------------
+@fragment("zebras")
+def zebras():
+    st.subheader("🦓 Zebras por time")
+    resultado = load_odds_upsets(league_ids, seasons)
+    times = resultado["times"]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Mais pontos acima do esperado**")
+        st.dataframe(times.head(10), use_container_width=True)
+    with col2:
+        st.markdown("**Mais pontos abaixo do esperado**")
+        st.dataframe(times.tail(10).iloc[::-1], use_container_width=True)
+
+    with stage("gráfico de zebras"):
+        mais_zebras = times.sort_values("Zebras a favor", ascending=False).head(15)
+        fig = px.bar(
+            mais_zebras,
+            y=["Zebras a favor", "Zebras contra"],
+            barmode="group",
+            title="Times com mais vitórias como azarão",
+            labels={"index": "Time", "value": "Partidas", "variable": "Tipo"},
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("**Maiores zebras** (resultado menos provável segundo o consenso)")
+    st.dataframe(resultado["partidas"], use_container_width=True, hide_index=True)
+
+
+if league_ids and seasons:
+    calibracao()
+    zebras()
+else:
+    st.info("Selecione ao menos uma liga e uma temporada.")
+
+end_page()
@@ -1,275 +1,210 @@
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
-import plotly.express as px
-
-st.title("⚽ Comparativo entre clubes")
-
-# Conexão com SQLite
-engine = create_engine("sqlite:///data/database.sqlite")
-
-# Carregar tabelas básicas
-teams = pd.read_sql("SELECT team_api_id, team_long_name FROM Team", engine)
-leagues = pd.read_sql("SELECT id AS league_id, name AS league_name FROM League", engine)
-
-# Query principal de partidas
-query = """
-SELECT 
-    M.match_api_id,
-    M.league_id,
-    L.name AS league_name,
-    M.season,
-    M.home_team_api_id,
-    M.away_team_api_id,
-    M.home_team_goal,
-    M.away_team_goal
-FROM Match M
-JOIN League L ON M.league_id = L.id
-"""
-matches = pd.read_sql(query, engine)
-
-# Juntar nomes dos times (home e away)
-matches = matches.merge(
-    teams, left_on="home_team_api_id", right_on="team_api_id", how="left"
-).rename(columns={"team_long_name": "team_home"})
-matches = matches.merge(
-    teams, left_on="away_team_api_id", right_on="team_api_id", how="left"
-).rename(columns={"team_long_name": "team_away"})
-
-matches = matches[
-    [
-        "match_api_id",
-        "league_id",
-        "league_name",
-        "season",
-        "team_home",
-        "team_away",
-        "home_team_goal",
-        "away_team_goal",
-    ]
-]
 
+from dashboard.charts import elo_chart, head_to_head_chart, tactical_profile_chart, team_comparison_chart
+from dashboard.data import (
+    load_concurrently,
+    load_elo_history,
+    load_head_to_head,
+    load_leagues,
+    load_matches,
+    load_match_team_attributes,
+    load_matches_by_id,
+    load_pair,
+    load_seasons,
+    load_team_stats,
+    load_teams,
+)
+from dashboard.metrics import end_page, fragment, stage, start_page
+from dashboard.stats import head_to_head_matrix
+from dashboard.tactics import tactical_profile
 
+start_page("Comparativo entre dois times")
+st.title("⚽ Comparativo entre clubes")
 
+# Dados compartilhados (cache por processo); Team é lido junto para os nomes das partidas
+leagues, _ = load_concurrently(load_leagues, load_teams)
 
 selected_league = st.selectbox(
     "Selecione a Liga", leagues["league_name"].sort_values()
 )
-
-# Filtrar apenas a liga escolhida
-league_matches = matches[matches["league_name"] == selected_league]
+league_id = leagues.loc[leagues["league_name"] == selected_league, "league_id"].iloc[0]
 
 # Filtro de período (temporadas)
-seasons = sorted(league_matches["season"].unique())
+seasons = load_seasons(league_id)
 selected_seasons = st.multiselect(
     "Selecione a(s) Temporada(s)",
     seasons,
     default=seasons[-1:]  # última temporada como padrão
 )
 
-league_matches = league_matches[league_matches["season"].isin(selected_seasons)]
+# Estatísticas de todos os times da seleção: um único groupby, em cache por
+# liga/temporadas, então trocar de time não recalcula nada
+stats_liga = load_team_stats(league_id, selected_seasons)
 
 # Lista de times da liga
-all_teams = pd.unique(league_matches[["team_home", "team_away"]].values.ravel("K"))
-team1 = st.selectbox("Time 1", sorted(all_teams))
-team2 = st.selectbox("Time 2", sorted(all_teams))
+all_teams = stats_liga.index
 
-# -------------------------------
-# 🔹 Função de estatísticas
-# -------------------------------
-def stats(df, team_name):
-    df_team = df[
-        (df["team_home"] == team_name) | (df["team_away"] == team_name)
-    ]
-
-    gols_marcados = df_team.apply(
-        lambda row: row["home_team_goal"] if row["team_home"] == team_name else row["away_team_goal"],
-        axis=1,
-    ).sum()
-
-    gols_sofridos = df_team.apply(
-        lambda row: row["away_team_goal"] if row["team_home"] == team_name else row["home_team_goal"],
-        axis=1,
-    ).sum()
-
-    partidas = len(df_team)
-
-    # Vitórias, empates, derrotas
-    vitorias = df_team.apply(
-        lambda row: 1 if 
-        ((row["team_home"] == team_name and row["home_team_goal"] > row["away_team_goal"]) or
-         (row["team_away"] == team_name and row["away_team_goal"] > row["home_team_goal"])) else 0,
-        axis=1
-    ).sum()
-
-    empates = df_team.apply(
-        lambda row: 1 if row["home_team_goal"] == row["away_team_goal"] else 0,
-        axis=1
-    ).sum()
-
-    derrotas = partidas - vitorias - empates
-
-    return {
-        "Partidas": partidas,
-        "Gols Marcados": gols_marcados,
-        "Gols Sofridos": gols_sofridos,
-        "Vitórias": vitorias,
-        "Empates": empates,
-        "Derrotas": derrotas
-    }
+# Id de cada time da seleção (para o confronto direto)
+league_matches = load_matches(league_id, selected_seasons)
+team_ids = dict(zip(
+    pd.concat([league_matches["team_home"], league_matches["team_away"]]).astype(str),
+    pd.concat([league_matches["home_team_api_id"], league_matches["away_team_api_id"]]),
+))
 
-# -------------------------------
-# 🔹 Calculando estatísticas
-# -------------------------------
-stats_team1 = stats(league_matches, team1)
-stats_team2 = stats(league_matches, team2)
+modo = st.radio("Modo de comparação", ["Dois times", "Vários times"], horizontal=True)
 
-# -------------------------------
-# 🔹 Criando tabela comparativa
-# -------------------------------
-df_stats = pd.DataFrame([stats_team1, stats_team2], index=[team1, team2])
-st.subheader(f"📊 Estatísticas — {selected_league}")
-st.write(f"🗓️ Temporadas: {', '.join(selected_seasons)}")
-st.dataframe(df_stats)  # tabela interativa
 
 # -------------------------------
-# 🔹 Gráfico comparativo
+# 🔹 Comparativo dos times escolhidos
 # -------------------------------
-df_plot = pd.DataFrame({
-    "Time": [team1, team2],
-    "Gols Marcados": [stats_team1["Gols Marcados"], stats_team2["Gols Marcados"]],
-    "Gols Sofridos": [stats_team1["Gols Sofridos"], stats_team2["Gols Sofridos"]],
-    "Vitórias": [stats_team1["Vitórias"], stats_team2["Vitórias"]],
-    "Empates": [stats_team1["Empates"], stats_team2["Empates"]],
-    "Derrotas": [stats_team1["Derrotas"], stats_team2["Derrotas"]],
-})
-
-fig = px.bar(
-    df_plot,
-    x="Time",
-    y=["Gols Marcados", "Gols Sofridos", "Vitórias", "Derrotas", "Empates"],
-    barmode="group",
-    title="Comparação entre Times",
-    labels={"variable": "Análise", "value": "Quantidade"}
-)
-
-st.plotly_chart(fig)
-
-st.subheader("📖 Comparação entre os times")
-
-story = f"""
+# Fragmento: trocar "Time 1" ou "Time 2" reexecuta só este trecho
+@fragment("comparativo dos times")
+def comparativo_times():
+    team1 = st.selectbox("Time 1", sorted(all_teams))
+    team2 = st.selectbox("Time 2", sorted(all_teams))
+    # Sem temporadas (ou sem partidas) não há times para comparar
+    if team1 is None or team2 is None:
+        st.info("Selecione ao menos uma temporada com partidas.")
+        return
+
+    # -------------------------------
+    # 🔹 Calculando estatísticas
+    # -------------------------------
+    # Linhas dos dois times na tabela da liga (calculada uma vez por liga/temporadas)
+    df_stats = stats_liga.reindex([team1, team2], fill_value=0)
+    stats_team1 = df_stats.iloc[0]
+    stats_team2 = df_stats.iloc[1]
+
+    # -------------------------------
+    # 🔹 Criando tabela comparativa
+    # -------------------------------
+    st.subheader(f"📊 Estatísticas — {selected_league}")
+    st.write(f"🗓️ Temporadas: {', '.join(selected_seasons)}")
+    st.dataframe(df_stats)  # tabela interativa
+
+    # -------------------------------
+    # 🔹 Gráfico comparativo
+    # -------------------------------
+    with stage("gráfico comparativo"):
+        fig = team_comparison_chart(df_stats)
+        st.plotly_chart(fig)
+
+    st.subheader("📖 Comparação entre os times")
+
+    story = f"""
 No período selecionado ({', '.join(selected_seasons)}), na liga **{selected_league}**:
 
 - O time que marcou mais gols foi **{team1 if stats_team1['Gols Marcados'] > stats_team2['Gols Marcados'] else team2}**.
 - O time com mais vitórias foi **{team1 if stats_team1['Vitórias'] > stats_team2['Vitórias'] else team2}**.
 - O time com menos derrotas foi **{team1 if stats_team1['Derrotas'] < stats_team2['Derrotas'] else team2}**.
-"""
-
-st.markdown(story)
-
-st.subheader("📊 Comparativo de porcentagens")
-
-# Função para calcular porcentagem
-def calc_percent(valor, total):
-    return round((valor / total) * 100, 1) if total > 0 else 0
-
-# Criar um DataFrame com porcentagens
-df_percent = pd.DataFrame({
-    "Categoria": ["Vitórias", "Empates", "Derrotas"],
-    team1: [
-        calc_percent(stats_team1["Vitórias"], stats_team1["Partidas"]),
-        calc_percent(stats_team1["Empates"], stats_team1["Partidas"]),
-        calc_percent(stats_team1["Derrotas"], stats_team1["Partidas"])
-    ],
-    team2: [
-        calc_percent(stats_team2["Vitórias"], stats_team2["Partidas"]),
-        calc_percent(stats_team2["Empates"], stats_team2["Partidas"]),
-        calc_percent(stats_team2["Derrotas"], stats_team2["Partidas"])
-    ]
-})
-
-# Exibir os cards lado a lado
-for categoria in df_percent["Categoria"]:
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric(
-            label=f"{team1} - {categoria}",
-            value=f"{df_percent.loc[df_percent['Categoria'] == categoria, team1].values[0]}%"
-        )
-    with col2:
-        st.metric(
-            label=f"{team2} - {categoria}",
-            value=f"{df_percent.loc[df_percent['Categoria'] == categoria, team2].values[0]}%"
-        )
-        
-st.subheader("📖 Comparação entre os times (Percentuais)")
-
-# Função para calcular aumento percentual relativo
-def percentual_relativo(valor1, valor2, menos_eh_melhor=False):
     """
-    Calcula a diferença percentual entre valor1 e valor2.
-    Retorna uma string do tipo 'X% mais' ou 'X% menos' de forma automática.
-    
-    Se menos_eh_melhor=True, então menor valor é considerado melhor.
-    """
-    if valor1 == valor2:
-        return "igual"
-    
-    if menos_eh_melhor:
-        # Menor é melhor: inverte a lógica do "mais/menos"
-        if valor1 < valor2:
-            diff = ((valor2 - valor1) / valor2) * 100
-            return f"{round(diff,1)}% menos"
-        else:
-            diff = ((valor1 - valor2) / valor1) * 100
-            return f"{round(diff,1)}% menos"
-    else:
-        # Maior é melhor
-        if valor1 > valor2:
-            diff = ((valor1 - valor2) / valor2) * 100
-            return f"{round(diff,1)}% mais"
-        else:
-            diff = ((valor2 - valor1) / valor1) * 100
-            return f"{round(diff,1)}% mais"
-        
-def time_oposto(time_atual):
-    return team2 if time_atual == team1 else team1
-
-# Função para determinar qual time se destaca
-def comparativo(valor1, valor2, nome_time1, nome_time2, menos_eh_melhor=False):
-    if valor1 == valor2:
-        return "igual", f"igual ao {time_oposto(nome_time1)}"
-    if menos_eh_melhor:
-        if valor1 < valor2:
-            return nome_time1, percentual_relativo(valor1, valor2, menos_eh_melhor=True)
+
+    st.markdown(story)
+
+    st.subheader("📊 Comparativo de porcentagens")
+
+    # Função para calcular porcentagem
+    def calc_percent(valor, total):
+        return round((valor / total) * 100, 1) if total > 0 else 0
+
+    # Criar um DataFrame com porcentagens
+    df_percent = pd.DataFrame({
+        "Categoria": ["Vitórias", "Empates", "Derrotas"],
+        team1: [
+            calc_percent(stats_team1["Vitórias"], stats_team1["Partidas"]),
+            calc_percent(stats_team1["Empates"], stats_team1["Partidas"]),
+            calc_percent(stats_team1["Derrotas"], stats_team1["Partidas"])
+        ],
+        team2: [
+            calc_percent(stats_team2["Vitórias"], stats_team2["Partidas"]),
+            calc_percent(stats_team2["Empates"], stats_team2["Partidas"]),
+            calc_percent(stats_team2["Derrotas"], stats_team2["Partidas"])
+        ]
+    })
+
+    # Exibir os cards lado a lado
+    for categoria in df_percent["Categoria"]:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(
+                label=f"{team1} - {categoria}",
+                value=f"{df_percent.loc[df_percent['Categoria'] == categoria, team1].values[0]}%"
+            )
+        with col2:
+            st.metric(
+                label=f"{team2} - {categoria}",
+                value=f"{df_percent.loc[df_percent['Categoria'] == categoria, team2].values[0]}%"
+            )
+
+    st.subheader("📖 Comparação entre os times (Percentuais)")
+
+    # Função para calcular aumento percentual relativo
+    def percentual_relativo(valor1, valor2, menos_eh_melhor=False):
+        """
+        Calcula a diferença percentual entre valor1 e valor2.
+        Retorna uma string do tipo 'X% mais' ou 'X% menos' de forma automática.
+
+        Se menos_eh_melhor=True, então menor valor é considerado melhor.
+        """
+        if valor1 == valor2:
+            return "igual"
+
+        if menos_eh_melhor:
+            # Menor é melhor: inverte a lógica do "mais/menos"
+            if valor1 < valor2:
+                diff = ((valor2 - valor1) / valor2) * 100
+                return f"{round(diff,1)}% menos"
+            else:
+                diff = ((valor1 - valor2) / valor1) * 100
+                return f"{round(diff,1)}% menos"
         else:
-            return nome_time2, percentual_relativo(valor2, valor1, menos_eh_melhor=True)
-    else:
-        if valor1 > valor2:
-            return nome_time1, percentual_relativo(valor1, valor2)
+            # Maior é melhor
+            if valor1 > valor2:
+                diff = ((valor1 - valor2) / valor2) * 100
+                return f"{round(diff,1)}% mais"
+            else:
+                diff = ((valor2 - valor1) / valor1) * 100
+                return f"{round(diff,1)}% mais"
+
+    def time_oposto(time_atual):
+        return team2 if time_atual == team1 else team1
+
+    # Função para determinar qual time se destaca
+    def comparativo(valor1, valor2, nome_time1, nome_time2, menos_eh_melhor=False):
+        if valor1 == valor2:
+            return "igual", f"igual ao {time_oposto(nome_time1)}"
+        if menos_eh_melhor:
+            if valor1 < valor2:
+                return nome_time1, percentual_relativo(valor1, valor2, menos_eh_melhor=True)
+            else:
+                return nome_time2, percentual_relativo(valor2, valor1, menos_eh_melhor=True)
         else:
-            return nome_time2, percentual_relativo(valor2, valor1)
-
-# Comparativos
-time_gols_marcados, gols_marcados_comp = comparativo(
-    stats_team1['Gols Marcados'], stats_team2['Gols Marcados'], team1, team2
-)
-time_gols_sofridos, gols_sofridos_comp = comparativo(
-    stats_team1['Gols Sofridos'], stats_team2['Gols Sofridos'], team1, team2, menos_eh_melhor=True
-)
-time_vitorias, vitorias_comp = comparativo(
-    stats_team1['Vitórias'], stats_team2['Vitórias'], team1, team2
-)
-time_empates, empates_comp = comparativo(
-    stats_team1['Empates'], stats_team2['Empates'], team1, team2
-)
-time_derrotas, derrotas_comp = comparativo(
-    stats_team1['Derrotas'], stats_team2['Derrotas'], team1, team2, menos_eh_melhor=True
-)
-
-
-
-story_percent = f"""
+            if valor1 > valor2:
+                return nome_time1, percentual_relativo(valor1, valor2)
+            else:
+                return nome_time2, percentual_relativo(valor2, valor1)
+
+    # Comparativos
+    time_gols_marcados, gols_marcados_comp = comparativo(
+        stats_team1['Gols Marcados'], stats_team2['Gols Marcados'], team1, team2
+    )
+    time_gols_sofridos, gols_sofridos_comp = comparativo(
+        stats_team1['Gols Sofridos'], stats_team2['Gols Sofridos'], team1, team2, menos_eh_melhor=True
+    )
+    time_vitorias, vitorias_comp = comparativo(
+        stats_team1['Vitórias'], stats_team2['Vitórias'], team1, team2
+    )
+    time_empates, empates_comp = comparativo(
+        stats_team1['Empates'], stats_team2['Empates'], team1, team2
+    )
+    time_derrotas, derrotas_comp = comparativo(
+        stats_team1['Derrotas'], stats_team2['Derrotas'], team1, team2, menos_eh_melhor=True
+    )
+
+
+
+    story_percent = f"""
 No período selecionado ({', '.join(selected_seasons)}), na liga **{selected_league}**:
 
 - **{team1}** jogou {stats_team1['Partidas']} partidas, marcando {stats_team1['Gols Marcados']} gols e sofrendo {stats_team1['Gols Sofridos']} gols. 
@@ -285,7 +220,142 @@ Comparando os números percentualmente:
 - **Vitórias:** {time_vitorias} ({vitorias_comp}).  
 - **Empates:** {time_empates} ({empates_comp}).  
 - **Derrotas:** {time_derrotas} ({derrotas_comp}).
-"""
+    """
+
+    st.markdown(story_percent)
+
+    evolucao_elo([team1, team2])
+    perfil_tatico(team1, team2)
+    confronto_direto(team1, team2)
 
-st.markdown(story_percent)
 
+# -------------------------------
+# 🔹 Evolução do Elo (todo o histórico)
+# -------------------------------
+def evolucao_elo(times):
+    st.subheader("📈 Evolução do Elo")
+    historico = load_elo_history([team_ids[time] for time in dict.fromkeys(times) if time in team_ids])
+    # Período selecionado sombreado
+    periodo = None if league_matches.empty else (league_matches["date"].min(), league_matches["date"].max())
+    with stage("gráfico de Elo"):
+        fig_elo = elo_chart(historico, periodo)
+        st.plotly_chart(fig_elo, use_container_width=True)
+
+
+# -------------------------------
+# 🔹 Perfil tático (Team_Attributes na data de cada partida)
+# -------------------------------
+def perfil_tatico(team1, team2):
+    nomes = {team_ids[time]: time for time in dict.fromkeys([team1, team2]) if time in team_ids}
+    # Sem times ou temporadas selecionados não há partidas para o perfil
+    if not nomes or not selected_seasons:
+        return
+
+    st.subheader("🧭 Perfil tático")
+    st.caption(
+        "Média dos atributos de cada time em vigor nas partidas da seleção "
+        "(snapshot mais recente até a data de cada jogo)."
+    )
+    # As-of join em cache por temporada; aqui só a média dos dois times
+    with stage("perfil tático"):
+        perfil = tactical_profile(load_match_team_attributes(league_id, selected_seasons), list(nomes))
+    perfil = perfil.set_axis(perfil.index.map(nomes).rename(None))
+
+    com_snapshot = perfil["Partidas com snapshot"] > 0
+    if not com_snapshot.all():
+        st.info(f"Sem atributos táticos antes das partidas do período: {', '.join(perfil.index[~com_snapshot])}.")
+    perfil = perfil[com_snapshot]
+    if perfil.empty:
+        return
+
+    with stage("gráfico de perfil tático"):
+        fig_perfil = tactical_profile_chart(perfil)
+        st.plotly_chart(fig_perfil, use_container_width=True)
+    st.dataframe(perfil.T)
+
+
+# -------------------------------
+# 🔹 Confronto direto (todas as ligas e temporadas)
+# -------------------------------
+def confronto_direto(team1, team2):
+    if team1 == team2:
+        return
+    st.subheader("🤝 Confronto direto (todas as temporadas)")
+
+    # Uma busca pelo par no índice Head_To_Head, sem varrer as temporadas
+    confronto = load_pair(team_ids[team1], team_ids[team2])
+    if confronto is None:
+        st.info(f"{team1} e {team2} nunca se enfrentaram.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Partidas", confronto["partidas"])
+    col2.metric(f"Vitórias {team1}", confronto["vitorias"])
+    col3.metric("Empates", confronto["empates"])
+    col4.metric(f"Vitórias {team2}", confronto["derrotas"])
+    st.write(f"⚽ Gols: **{team1}** {confronto['gols_marcados']} × {confronto['gols_sofridos']} **{team2}**")
+
+    with st.expander("Partidas do confronto"):
+        partidas = load_matches_by_id(confronto["match_ids"])
+        st.dataframe(
+            partidas.assign(
+                Data=partidas["date"].dt.date,
+                Placar=partidas["home_team_goal"].astype(str) + " × " + partidas["away_team_goal"].astype(str),
+            ).rename(columns={
+                "season": "Temporada", "league_name": "Liga", "team_home": "Mandante", "team_away": "Visitante",
+            })[["Data", "Temporada", "Liga", "Mandante", "Placar", "Visitante"]],
+            hide_index=True,
+        )
+
+
+# -------------------------------
+# 🔹 Comparativo de vários times
+# -------------------------------
+@fragment("comparativo de vários times")
+def comparativo_varios():
+    times = st.multiselect("Times", sorted(all_teams), default=sorted(all_teams)[:4])
+    if len(times) < 2:
+        st.info("Selecione pelo menos dois times.")
+        return
+
+    # Tudo sai de duas tabelas em cache por liga/temporadas: estatísticas por time
+    # e confrontos de todos os pares (um groupby cada), só filtradas aqui
+    df_stats = stats_liga.reindex(times, fill_value=0)
+    df_stats.index = df_stats.index.astype(str)
+
+    st.subheader(f"📊 Estatísticas — {selected_league}")
+    st.write(f"🗓️ Temporadas: {', '.join(selected_seasons)}")
+    st.dataframe(df_stats)
+
+    with stage("gráfico comparativo"):
+        fig = team_comparison_chart(df_stats)
+        st.plotly_chart(fig)
+
+    evolucao_elo(times)
+
+    # Percentual de vitórias, empates e derrotas de cada time
+    st.subheader("📊 Comparativo de porcentagens")
+    partidas = df_stats["Partidas"].where(df_stats["Partidas"] > 0)
+    percentuais = df_stats[["Vitórias", "Empates", "Derrotas"]].div(partidas, axis=0).mul(100).round(1).fillna(0)
+    por_linha = 5
+    for inicio in range(0, len(times), por_linha):
+        cols = st.columns(por_linha)
+        for col, (time, linha) in zip(cols, percentuais.iloc[inicio:inicio + por_linha].iterrows()):
+            with col:
+                st.metric(label=time, value=f"{linha['Vitórias']}% vitórias")
+                st.caption(f"{linha['Empates']}% empates · {linha['Derrotas']}% derrotas")
+
+    # Matriz de confrontos: linha = time, coluna = adversário
+    st.subheader("⚔️ Confrontos entre os times")
+    with stage("matriz de confrontos"):
+        matriz = head_to_head_matrix(load_head_to_head(league_id, selected_seasons), times)
+        fig_matriz = head_to_head_chart(matriz)
+        st.plotly_chart(fig_matriz, use_container_width=True)
+
+
+if modo == "Dois times":
+    comparativo_times()
+else:
+    comparativo_varios()
+
+end_page()
@@ -0,0 +1,123 @@
+import streamlit as st
+import plotly.express as px
+
+from dashboard.data import (
+    load_attribute_density,
+    load_attribute_histograms,
+    load_concurrently,
+    load_leagues,
+    load_player_season_attributes,
+    load_players,
+)
+from dashboard.metrics import end_page, fragment, stage, start_page
+from dashboard.schema import PLAYER_ATTRIBUTE_COLUMNS
+
+# Acima disso o gráfico de pontos não é oferecido: só as grades agregadas
+PONTOS_MAXIMOS = 5000
+
+st.set_page_config(layout="wide")
+start_page("Distribuição de atributos")
+st.title("📊 Distribuição de Atributos dos Jogadores")
+st.caption(
+    "Cada jogador conta uma vez por liga/temporada em que foi escalado, com os atributos "
+    "mais próximos da sua última partida na temporada."
+)
+
+# Dados compartilhados (cache por processo)
+leagues, jogadores_temporada = load_concurrently(load_leagues, load_player_season_attributes)
+
+# -------------------------------
+# 🔹 Filtro de ligas e temporadas
+# -------------------------------
+nomes_ligas = dict(zip(leagues["league_id"], leagues["league_name"]))
+col1, col2, col3 = st.columns([2, 2, 1])
+league_ids = col1.multiselect(
+    "Ligas", sorted(nomes_ligas, key=nomes_ligas.get), default=sorted(nomes_ligas), format_func=nomes_ligas.get
+)
+temporadas = sorted(jogadores_temporada["season"].dropna().unique())
+seasons = col2.multiselect("Temporadas", temporadas, default=temporadas)
+bin_width = col3.slider("Largura da faixa", 1, 10, 5)
+
+
+# -------------------------------
+# 🔹 Histogramas por grupo
+# -------------------------------
+# Fragmento: trocar o atributo ou o agrupamento só recalcula (ou lê do cache) esta seção
+@fragment("histogramas")
+def histogramas():
+    st.subheader("📶 Distribuição por liga ou temporada")
+    col1, col2 = st.columns(2)
+    coluna = col1.selectbox("Atributo", PLAYER_ATTRIBUTE_COLUMNS, key="hist_atributo")
+    grupos = {"Liga": "league_name", "Temporada": "season"}
+    por = col2.radio("Agrupar por", list(grupos), horizontal=True)
+
+    # Só as contagens por faixa chegam ao gráfico (grupos × faixas pontos)
+    contagens = load_attribute_histograms(coluna, grupos[por], league_ids, seasons, bin_width)
+    with stage("gráfico de histogramas"):
+        fig = px.line(
+            contagens,
+            x="Faixa",
+            y="Percentual",
+            color=grupos[por],
+            line_shape="hv",
+            hover_data=["Jogadores"],
+            labels={"Faixa": coluna, "Percentual": "% dos jogadores", grupos[por]: por},
+            title=f"Distribuição de {coluna} por {por.lower()}",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------------
+# 🔹 Densidade 2D
+# -------------------------------
+@fragment("densidade 2D")
+def densidade():
+    st.subheader("🗺️ Densidade entre dois atributos")
+    col1, col2 = st.columns(2)
+    x = col1.selectbox("Eixo X", PLAYER_ATTRIBUTE_COLUMNS, index=PLAYER_ATTRIBUTE_COLUMNS.index("sprint_speed"))
+    y = col2.selectbox("Eixo Y", PLAYER_ATTRIBUTE_COLUMNS, index=PLAYER_ATTRIBUTE_COLUMNS.index("finishing"))
+
+    grade = load_attribute_density(x, y, league_ids, seasons, bin_width)
+    total = int(grade.to_numpy().sum())
+    with stage("gráfico de densidade"):
+        fig = px.imshow(
+            grade,
+            origin="lower",
+            aspect="auto",
+            color_continuous_scale="Viridis",
+            labels={"x": x, "y": y, "color": "Jogadores"},
+            title=f"{y} × {x} ({total} jogadores/temporada)",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Pontos individuais só para seleções pequenas, em WebGL
+    if st.checkbox("Mostrar jogadores individualmente"):
+        if total > PONTOS_MAXIMOS:
+            st.info(f"Seleção com {total} pontos: restrinja ligas/temporadas para até {PONTOS_MAXIMOS}.")
+            return
+        with stage("gráfico de pontos"):
+            selecao = jogadores_temporada[
+                jogadores_temporada["league_id"].isin(league_ids) & jogadores_temporada["season"].isin(seasons)
+            ].dropna(subset=[x, y])
+            selecao = selecao.merge(load_players()[["player_api_id", "player_name"]], on="player_api_id")
+            fig = px.scatter(
+                selecao,
+                x=x,
+                y=y,
+                color="league_name",
+                hover_name="player_name",
+                hover_data=["season"],
+                opacity=0.6,
+                render_mode="webgl",
+                labels={"league_name": "Liga", "season": "Temporada"},
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+
+if league_ids and seasons:
+    histogramas()
+    densidade()
+else:
+    st.info("Selecione ao menos uma liga e uma temporada.")
+
+end_page()
@@ -1,41 +1,148 @@
 import streamlit as st
 import pandas as pd
-from sqlalchemy import create_engine
 import plotly.express as px
 
+from dashboard.data import (
+    load_attribute_timeline,
+    load_latest_attributes,
+    load_player_index,
+    load_similarity_index,
+)
+from dashboard.metrics import end_page, fragment, stage, start_page
+from dashboard.schema import PLAYER_ATTRIBUTE_COLUMNS
+
 st.set_page_config(layout="wide")
+start_page("Raio-X de jogadores")
 st.title("⚽ Análise de Jogadores")
 
 # -------------------------------
-# 🔹 Conexão com o banco SQLite
+# 🔹 Dados compartilhados (cache por processo)
+# -------------------------------
+# Só o índice de nomes na abertura; o índice de semelhança é montado na seção de semelhantes
+player_index = load_player_index()
+
+# Atributos do radar: nome exibido → coluna de Player_Attributes
+RADAR = {
+    "Passe": "short_passing",
+    "Chute": "finishing",
+    "Drible": "dribbling",
+    "Defesa": "marking",
+    "Físico": "strength",
+    "Velocidade": "sprint_speed",
+}
+
+# Limites dos filtros de idade e overall dos semelhantes
+FAIXA_IDADE = (15, 45)
+FAIXA_OVERALL = (0, 100)
+
+
+# -------------------------------
+# 🔹 Jogadores semelhantes
 # -------------------------------
-engine = create_engine("sqlite:///data/database.sqlite")
-
-# Carregar tabelas
-players = pd.read_sql("""
-SELECT 
-    player_api_id,
-    player_name,
-    birthday,
-    height,
-    weight
-FROM Player
-""", engine)
-
-player_attributes = pd.read_sql("""
-SELECT 
-    player_api_id,
-    date,
-    overall_rating,
-    potential,
-    crossing, finishing, heading_accuracy, short_passing, volleys,
-    dribbling, curve, free_kick_accuracy, long_passing, ball_control,
-    acceleration, sprint_speed, agility, reactions, balance,
-    shot_power, jumping, stamina, strength, long_shots,
-    aggression, interceptions, positioning, vision, penalties, marking,
-    standing_tackle, sliding_tackle, gk_diving, gk_handling, gk_kicking, gk_positioning, gk_reflexes
-FROM Player_Attributes
-""", engine)
+# Fragmento: mudar os filtros reexecuta só esta seção
+@fragment("jogadores semelhantes")
+def jogadores_semelhantes(player_id, selected_player, atributos):
+    st.subheader(f"👥 Jogadores semelhantes a {selected_player}")
+    st.caption("Distância entre os atributos técnicos mais recentes (padronizados).")
+
+    col1, col2, col3 = st.columns(3)
+    k = col1.slider("Quantidade", 3, 20, 5)
+    idade = col2.slider("Idade", *FAIXA_IDADE, FAIXA_IDADE)
+    overall = col3.slider("Overall", *FAIXA_OVERALL, FAIXA_OVERALL)
+    # Faixa inteira = sem filtro: jogadores sem idade ou overall continuam na lista
+    idade = None if idade == FAIXA_IDADE else idade
+    overall = None if overall == FAIXA_OVERALL else overall
+
+    # Matriz de todos os jogadores montada uma vez; cada consulta é um produto matriz-vetor
+    with stage("vizinhos mais próximos"):
+        semelhantes = load_similarity_index().similar(player_id, k=k, age=idade, overall=overall)
+    if semelhantes.empty:
+        st.info("Nenhum jogador dentro dos filtros.")
+        return
+
+    st.dataframe(
+        semelhantes.rename(columns={
+            "player_name": "Jogador", "age": "Idade", "overall_rating": "Overall", "distance": "Distância",
+        })[["Jogador", "Idade", "Overall", "Distância"]].round({"Distância": 2}),
+        hide_index=True,
+    )
+
+    # Radar do jogador com os três mais próximos sobrepostos
+    perfis = [(selected_player, atributos)]
+    for outro_id, nome in semelhantes[["player_api_id", "player_name"]].head(3).itertuples(index=False):
+        outro = load_latest_attributes(outro_id)
+        if outro is not None:
+            perfis.append((nome, {rotulo: outro[coluna] for rotulo, coluna in RADAR.items()}))
+    radar_df = pd.DataFrame([
+        {"Jogador": nome, "Atributo": rotulo, "Valor": valor}
+        for nome, valores in perfis for rotulo, valor in valores.items()
+    ])
+    with stage("gráfico radar (semelhantes)"):
+        fig = px.line_polar(
+            radar_df,
+            r="Valor",
+            theta="Atributo",
+            color="Jogador",
+            line_close=True,
+            title=f"🎯 {selected_player} e os jogadores mais semelhantes",
+            range_r=[0, 100],
+        )
+        fig.update_traces(fill="toself", opacity=0.6)
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# -------------------------------
+# 🔹 Evolução dos atributos
+# -------------------------------
+# Fragmento: atributos e jogadores comparados só redesenham esta seção
+@fragment("evolução dos atributos")
+def evolucao_dos_atributos(player_id, selected_player):
+    st.subheader(f"📈 Evolução de {selected_player}")
+
+    col1, col2 = st.columns(2)
+    colunas = col1.multiselect(
+        "Atributos", PLAYER_ATTRIBUTE_COLUMNS, default=["overall_rating", "potential"], key="evolucao_atributos"
+    )
+
+    # Jogadores para sobrepor: a busca acrescenta opções sem perder os já escolhidos
+    busca = col2.text_input("Comparar com (nome do jogador):", key="evolucao_busca")
+    nomes = st.session_state.setdefault("evolucao_nomes", {})
+    if busca:
+        with stage("busca por nome (comparação)"):
+            encontrados = player_index.search(busca).head(20)
+        nomes.update(zip(encontrados["player_api_id"].tolist(), encontrados["player_name"]))
+    comparados = st.multiselect("Jogadores comparados", list(nomes), format_func=nomes.get, key="evolucao_jogadores")
+    outros = [pid for pid in comparados if pid != player_id]
+
+    if not colunas:
+        st.info("Selecione ao menos um atributo.")
+        return
+
+    # Cada jogador é lido e reduzido (média mensal + LTTB) separadamente, sob demanda
+    series = []
+    for pid, nome in [(player_id, selected_player), *((pid, nomes[pid]) for pid in outros)]:
+        serie = load_attribute_timeline(pid, colunas)
+        series.append(serie.assign(Jogador=nome))
+    evolucao = pd.concat(series, ignore_index=True)
+    if evolucao.empty:
+        st.info("Sem histórico de atributos.")
+        return
+
+    with stage("gráfico de evolução"):
+        fig = px.line(
+            evolucao,
+            x="date",
+            y="Valor",
+            color="Jogador",
+            facet_col="Atributo",
+            facet_col_wrap=2,
+            markers=True,
+            labels={"date": "Data"},
+            range_y=[0, 100],
+        )
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+        st.plotly_chart(fig, use_container_width=True)
+
 
 # -------------------------------
 # 🔹 Busca por nome do jogador
@@ -43,27 +150,23 @@ FROM Player_Attributes
 player_name = st.text_input("Digite o nome do jogador:")
 
 if player_name:
-    results = players[players["player_name"].str.contains(player_name, case=False, na=False)]
+    # Prefixo, substring e busca aproximada, sem diferenciar acentos
+    with stage("busca por nome"):
+        results = player_index.search(player_name)
     
     if results.empty:
         st.warning("⚠️ Nenhum jogador encontrado com esse nome.")
     else:
-        selected_player = st.selectbox("Selecione o jogador:", results["player_name"].unique())
-        player_id = results[results["player_name"] == selected_player]["player_api_id"].values[0]
+        nomes = dict(zip(results["player_api_id"], results["player_name"]))
+        player_id = st.selectbox("Selecione o jogador:", list(nomes), format_func=nomes.get)
+        selected_player = nomes[player_id]
 
-        player_data = player_attributes[player_attributes["player_api_id"] == player_id]
-        if not player_data.empty:
-            latest = player_data.sort_values("date", ascending=False).iloc[0]
+        # Só o snapshot mais recente do jogador selecionado é lido do banco
+        latest = load_latest_attributes(player_id)
+        if latest is not None:
 
             # Selecionar atributos principais
-            atributos = {
-                "Passe": latest["short_passing"],
-                "Chute": latest["finishing"],
-                "Drible": latest["dribbling"],
-                "Defesa": latest["marking"],
-                "Físico": latest["strength"],
-                "Velocidade": latest["sprint_speed"]
-            }
+            atributos = {nome: latest[coluna] for nome, coluna in RADAR.items()}
 
             # -------------------------------
             # 🔹 Exibir atributos e radar
@@ -76,16 +179,17 @@ if player_name:
                 "Valor": list(atributos.values())
             })
 
-            fig_radar = px.line_polar(
-                radar_df,
-                r="Valor",
-                theta="Atributo",
-                line_close=True,
-                title=f"🎯 Perfil Técnico de {selected_player}",
-                range_r=[0, 100]
-            )
-            fig_radar.update_traces(fill="toself")
-            st.plotly_chart(fig_radar, use_container_width=True)
+            with stage("gráfico radar"):
+                fig_radar = px.line_polar(
+                    radar_df,
+                    r="Valor",
+                    theta="Atributo",
+                    line_close=True,
+                    title=f"🎯 Perfil Técnico de {selected_player}",
+                    range_r=[0, 100]
+                )
+                fig_radar.update_traces(fill="toself")
+                st.plotly_chart(fig_radar, use_container_width=True)
 
             # -------------------------------
             # 🔹 Storytelling sobre o estilo de jogo
@@ -111,6 +215,11 @@ if player_name:
                 estilo = "um jogador versátil, que contribui em várias fases do jogo."
 
             st.markdown(f"**Análise Tática:** {selected_player} é {estilo}")
+
+            jogadores_semelhantes(player_id, selected_player, atributos)
+            evolucao_dos_atributos(player_id, selected_player)
 		
 else:
     st.warning("⚠️ Nenhum atributo disponível para esse jogador.")
+
+end_page()
@@ -0,0 +1,126 @@
+"""
+Download do banco (``dashboard.bootstrap``) contra um servidor HTTP local.
+
+O servidor entrega o mesmo conteúdo em três caminhos: ``/db`` respeita o
+cabeçalho Range (206, ou 416 quando o pedaço local já é o arquivo inteiro),
+``/sem-range`` ignora o Range e sempre responde 200 e ``/texto`` entrega algo
+que não é um banco SQLite.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from dashboard.bootstrap import SQLITE_HEADER, DownloadError, download, ensure_database
+
+CONTEUDO = SQLITE_HEADER + bytes(range(256)) * 1200
+SHA256 = hashlib.sha256(CONTEUDO).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.pedidos.append((self.path, self.headers.get("Range")))
+        corpo = b"<html>login</html>" if self.path == "/texto" else CONTEUDO
+        intervalo = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+
+        if self.path == "/db" and intervalo:
+            inicio = int(intervalo.group(1))
+            if inicio >= len(corpo):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(corpo)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {inicio}-{len(corpo) - 1}/{len(corpo)}")
+            corpo = corpo[inicio:]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def servidor():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    srv.pedidos = []
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def url(servidor):
+    servidor.pedidos.clear()
+    return lambda caminho: f"http://127.0.0.1:{servidor.server_address[1]}{caminho}"
+
+
+def _ler(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download_novo(tmp_path, url, servidor):
+    path = str(tmp_path / "database.sqlite")
+    chamadas = []
+    assert ensure_database(path, url("/db"), SHA256, progress=lambda b, t: chamadas.append((b, t)))
+    assert _ler(path) == CONTEUDO
+    assert not os.path.exists(f"{path}.part")
+    assert servidor.pedidos == [("/db", None)]
+    assert chamadas[-1] == (len(CONTEUDO), len(CONTEUDO))
+    # Já existe: nada é baixado de novo
+    assert not ensure_database(path, url("/db"), SHA256)
+    assert len(servidor.pedidos) == 1
+
+
+def test_retoma_do_part(tmp_path, url, servidor):
+    path = str(tmp_path / "database.sqlite")
+    with open(f"{path}.part", "wb") as f:
+        f.write(CONTEUDO[:1000])
+    assert ensure_database(path, url("/db"), SHA256)
+    assert _ler(path) == CONTEUDO
+    assert servidor.pedidos == [("/db", "bytes=1000-")]
+
+
+def test_416_com_part_completo(tmp_path, url, servidor):
+    path = str(tmp_path / "database.sqlite")
+    with open(f"{path}.part", "wb") as f:
+        f.write(CONTEUDO)
+    assert ensure_database(path, url("/db"), SHA256)
+    assert _ler(path) == CONTEUDO
+    assert servidor.pedidos == [("/db", f"bytes={len(CONTEUDO)}-")]
+
+
+def test_servidor_sem_range_recomeca(tmp_path, url, servidor):
+    parcial = str(tmp_path / "database.sqlite.part")
+    with open(parcial, "wb") as f:
+        f.write(b"lixo de um download anterior")
+    download(url("/sem-range"), parcial)
+    assert _ler(parcial) == CONTEUDO
+    assert servidor.pedidos[0][1] is not None
+
+
+def test_sha256_diferente(tmp_path, url):
+    path = str(tmp_path / "database.sqlite")
+    with pytest.raises(DownloadError, match="SHA-256"):
+        ensure_database(path, url("/db"), "0" * 64)
+    assert not os.path.exists(path)
+    assert not os.path.exists(f"{path}.part")
+
+
+def test_corpo_que_nao_e_sqlite(tmp_path, url):
+    path = str(tmp_path / "database.sqlite")
+    with pytest.raises(DownloadError, match="não é um banco SQLite"):
+        ensure_database(path, url("/texto"))
+    assert not os.path.exists(path)
+    assert not os.path.exists(f"{path}.part")
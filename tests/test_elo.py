@@ -0,0 +1,62 @@
+"""
+Elo incremental (``dashboard.elo.incremental``) contra o recálculo completo.
+"""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dashboard.elo import elo_ratings, incremental
+
+
+@pytest.fixture
+def matches():
+    """240 partidas entre 8 times, várias no mesmo dia, em ordem aleatória de linha."""
+    rng = np.random.default_rng(11)
+    n = 240
+    casa = rng.integers(0, 8, size=n)
+    fora = (casa + rng.integers(1, 8, size=n)) % 8
+    partidas = pd.DataFrame({
+        "match_api_id": np.arange(5000, 5000 + n),
+        "date": pd.Timestamp("2010-08-01") + pd.to_timedelta(np.sort(rng.integers(0, 90, size=n)) * 7, unit="D"),
+        "home_team_api_id": casa + 100,
+        "away_team_api_id": fora + 100,
+        "home_team_goal": rng.integers(0, 5, size=n),
+        "away_team_goal": rng.integers(0, 4, size=n),
+    })
+    return partidas.sample(frac=1, random_state=0)
+
+
+def _combinado(matches, stored):
+    """Mesma junção de ``dashboard.data._elo_ratings``."""
+    inicio, novas = incremental(matches, stored)
+    if inicio is None:
+        return stored
+    return pd.concat([stored[stored["date"] < inicio], novas], ignore_index=True)
+
+
+def test_cauda_nova_igual_ao_recalculo(matches):
+    corte = matches["date"].quantile(0.7)
+    gravadas = elo_ratings(matches[matches["date"] < corte])
+    inicio, _ = incremental(matches, gravadas)
+    assert inicio == matches.loc[matches["date"] >= corte, "date"].min()
+    pdt.assert_frame_equal(_combinado(matches, gravadas), elo_ratings(matches))
+
+
+def test_partida_alterada_no_meio_igual_ao_recalculo(matches):
+    gravadas = elo_ratings(matches)
+    alterada = matches.sort_values("date").index[len(matches) // 2]
+    atuais = matches.copy()
+    atuais.loc[alterada, "home_team_goal"] += 3
+    inicio, _ = incremental(atuais, gravadas)
+    assert inicio == atuais.loc[alterada, "date"]
+    resultado = _combinado(atuais, gravadas)
+    pdt.assert_frame_equal(resultado, elo_ratings(atuais))
+    assert not np.allclose(resultado["home_elo_post"], gravadas["home_elo_post"])
+
+
+def test_sem_mudancas(matches):
+    gravadas = elo_ratings(matches)
+    inicio, novas = incremental(matches, gravadas)
+    assert inicio is None and novas.empty
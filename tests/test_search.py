@@ -0,0 +1,63 @@
+"""
+Busca de jogadores por nome (``dashboard.search.PlayerSearchIndex``).
+"""
+
+import pandas as pd
+import pytest
+
+from dashboard.search import EXACT, FUZZY, NAME_PREFIX, SUBSTRING, WORD_PREFIX, PlayerSearchIndex, normalize
+
+
+@pytest.fixture(scope="module")
+def index():
+    nomes = [
+        "Thomas Müller", "Gerd Müller", "Müller", "Muller Santos", "Lionel Messi", "Mesut Özil",
+        "Cristiano Ronaldo", "Ronaldo", "Ronaldo Guiaro", "Ronaldinho",
+        "Søren Larsen", "Jan Ødegaard", "Emmanuel Mullins",
+        *(f"Jogador {i}" for i in range(40)),
+    ]
+    return PlayerSearchIndex(pd.DataFrame({"player_api_id": range(1, len(nomes) + 1), "player_name": nomes}))
+
+
+def test_normalize():
+    assert normalize("  Thomas   MÜLLER ") == "thomas muller"
+    assert normalize("Søren-Ødegaard") == "soren odegaard"
+
+
+def test_busca_sem_acento_encontra_nome_acentuado(index):
+    resultado = index.search("Muller")
+    assert {"Müller", "Thomas Müller", "Gerd Müller", "Muller Santos"} <= set(resultado["player_name"])
+    assert index.search("odegaard")["player_name"].iloc[0] == "Jan Ødegaard"
+
+
+def test_nome_igual_primeiro(index):
+    resultado = index.search("ronaldo")
+    assert resultado["player_name"].iloc[0] == "Ronaldo"
+    assert resultado["match"].iloc[0] == EXACT
+    assert (resultado["match"].iloc[1:] > EXACT).all()
+    # Níveis em ordem: nome começa com, palavra começa com, ...
+    assert resultado["match"].is_monotonic_increasing
+    assert resultado.set_index("player_name").loc["Ronaldo Guiaro", "match"] == NAME_PREFIX
+    assert resultado.set_index("player_name").loc["Cristiano Ronaldo", "match"] == WORD_PREFIX
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10])
+def test_limite(index, limit):
+    assert len(index.search("jogador", limit=limit)) == limit
+    assert len(index.search("mul", limit=limit)) <= limit
+
+
+def test_busca_curta_sem_substring_nem_parecido(index):
+    # "ll" aparece no meio de vários nomes, mas com menos de 3 letras só valem os prefixos
+    assert index.search("ll").empty
+    resultado = index.search("mu")
+    assert len(resultado) > 0
+    assert not resultado["match"].isin([SUBSTRING, FUZZY]).any()
+
+
+def test_substring_e_parecido(index):
+    resultado = index.search("uller").set_index("player_name")
+    assert resultado.loc["Thomas Müller", "match"] == SUBSTRING
+    parecido = index.search("Mesi").set_index("player_name")
+    assert parecido.loc["Lionel Messi", "match"] == FUZZY
+    assert 0 < parecido.loc["Lionel Messi", "score"] < 1
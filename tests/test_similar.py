@@ -0,0 +1,69 @@
+"""
+``SimilarityIndex.similar`` (busca exata) contra as distâncias calculadas
+jogador a jogador, e os filtros de idade e overall.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.schema import PLAYER_ATTRIBUTE_COLUMNS
+from dashboard.similar import SIMILARITY_COLUMNS, SimilarityIndex
+
+
+@pytest.fixture(scope="module")
+def jogadores():
+    """300 jogadores com atributos aleatórios (alguns ausentes), idades de 18 a 37 anos."""
+    rng = np.random.default_rng(7)
+    n = 300
+    latest = pd.DataFrame(
+        rng.integers(30, 95, size=(n, len(PLAYER_ATTRIBUTE_COLUMNS))).astype("float64"),
+        columns=PLAYER_ATTRIBUTE_COLUMNS,
+    )
+    latest = latest.mask(rng.random(latest.shape) < 0.02)
+    latest.insert(0, "player_api_id", np.arange(1000, 1000 + n))
+    latest.insert(1, "date", pd.Timestamp("2016-01-01"))
+    idades = rng.integers(18, 38, size=n)
+    players = pd.DataFrame({
+        "player_api_id": latest["player_api_id"],
+        "player_name": [f"Jogador {i}" for i in range(n)],
+        "birthday": pd.Timestamp("2016-01-01") - pd.to_timedelta(idades * 365.25 + 100, unit="D"),
+    })
+    return latest, players
+
+
+def _forca_bruta(latest, player_api_id):
+    """Distância de ``player_api_id`` a cada outro jogador, atributo a atributo (float64)."""
+    valores = latest.set_index("player_api_id")[SIMILARITY_COLUMNS]
+    padronizados = ((valores - valores.mean()) / valores.std(ddof=0)).fillna(0)
+    distancias = np.sqrt(((padronizados - padronizados.loc[player_api_id]) ** 2).sum(axis=1))
+    return distancias.drop(player_api_id).sort_values()
+
+
+def test_busca_exata_igual_a_forca_bruta(jogadores):
+    latest, players = jogadores
+    index = SimilarityIndex(latest, players)
+    assert index.centroids is None
+    for player_api_id in latest["player_api_id"].iloc[[0, 57, 299]]:
+        resultado = index.similar(player_api_id, k=10)
+        esperado = _forca_bruta(latest, player_api_id).head(10)
+        assert resultado["player_api_id"].tolist() == esperado.index.tolist()
+        np.testing.assert_allclose(resultado["distance"], esperado.to_numpy(), rtol=1e-4)
+
+
+def test_filtros_de_idade_e_overall(jogadores):
+    latest, players = jogadores
+    index = SimilarityIndex(latest, players)
+    player_api_id = int(latest["player_api_id"].iloc[0])
+    resultado = index.similar(player_api_id, k=20, age=(22, 28), overall=(60, 80))
+
+    assert len(resultado) > 0
+    assert resultado["age"].between(22, 28).all()
+    assert resultado["overall_rating"].between(60, 80).all()
+
+    # Os mesmos vizinhos da força bruta restrita aos jogadores dentro dos intervalos
+    dentro = pd.Series(index.age, index=index.player_ids).between(22, 28)
+    dentro &= latest.set_index("player_api_id")["overall_rating"].between(60, 80)
+    esperado = _forca_bruta(latest, player_api_id)
+    esperado = esperado[dentro.reindex(esperado.index)].head(20)
+    assert resultado["player_api_id"].tolist() == esperado.index.tolist()
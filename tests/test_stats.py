@@ -0,0 +1,111 @@
+"""
+``team_stats`` (vetorizado) contra o cálculo antigo, um ``apply`` por time, e a
+evolução da classificação contra a tabela final.
+"""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dashboard.stats import standings_evolution, standings_table, team_stats
+
+
+def stats(df, team_name):
+    """Versão anterior de ``team_stats`` (página de comparativo), mantida como referência."""
+    df_team = df[
+        (df["team_home"] == team_name) | (df["team_away"] == team_name)
+    ]
+
+    gols_marcados = df_team.apply(
+        lambda row: row["home_team_goal"] if row["team_home"] == team_name else row["away_team_goal"],
+        axis=1,
+    ).sum()
+
+    gols_sofridos = df_team.apply(
+        lambda row: row["away_team_goal"] if row["team_home"] == team_name else row["home_team_goal"],
+        axis=1,
+    ).sum()
+
+    partidas = len(df_team)
+
+    vitorias = df_team.apply(
+        lambda row: 1 if
+        ((row["team_home"] == team_name and row["home_team_goal"] > row["away_team_goal"]) or
+         (row["team_away"] == team_name and row["away_team_goal"] > row["home_team_goal"])) else 0,
+        axis=1
+    ).sum()
+
+    empates = df_team.apply(
+        lambda row: 1 if row["home_team_goal"] == row["away_team_goal"] else 0,
+        axis=1
+    ).sum()
+
+    derrotas = partidas - vitorias - empates
+
+    return {
+        "Partidas": partidas,
+        "Gols Marcados": gols_marcados,
+        "Gols Sofridos": gols_sofridos,
+        "Vitórias": vitorias,
+        "Empates": empates,
+        "Derrotas": derrotas
+    }
+
+
+@pytest.fixture
+def matches():
+    """Seis partidas entre quatro times: vitórias de mandante e visitante, empates e um time sem vitórias."""
+    return pd.DataFrame({
+        "match_api_id": [1, 2, 3, 4, 5, 6],
+        "season": ["2014/2015"] * 3 + ["2015/2016"] * 3,
+        "stage": [1, 1, 2, 1, 1, 2],
+        "team_home": ["Benfica", "Porto", "Sporting", "Porto", "Braga", "Benfica"],
+        "team_away": ["Porto", "Braga", "Benfica", "Sporting", "Benfica", "Braga"],
+        "home_team_goal": [2, 1, 0, 3, 2, 0],
+        "away_team_goal": [1, 1, 4, 3, 2, 1],
+    })
+
+
+def _baseline(matches):
+    times = sorted(set(matches["team_home"]) | set(matches["team_away"]))
+    return pd.DataFrame([stats(matches, time) for time in times], index=times).astype("int64")
+
+
+def test_team_stats_matches_baseline(matches):
+    pdt.assert_frame_equal(team_stats(matches), _baseline(matches))
+
+
+def test_team_stats_with_categorical_names(matches):
+    # Nomes como categoria compartilhada, como em ``load_matches``
+    tipo = pd.CategoricalDtype(sorted(set(matches["team_home"]) | set(matches["team_away"])))
+    categoricas = matches.astype({"team_home": tipo, "team_away": tipo})
+    resultado = team_stats(categoricas)
+    pdt.assert_frame_equal(resultado.set_axis(resultado.index.astype(str)), _baseline(matches))
+
+
+@pytest.fixture
+def temporada():
+    """Turno e returno entre seis times em rodadas aleatórias (um time folga na última rodada)."""
+    rng = np.random.default_rng(4)
+    times = ["Benfica", "Porto", "Sporting", "Braga", "Guimarães", "Boavista"]
+    confrontos = [(casa, fora) for casa in times for fora in times if casa != fora]
+    partidas = pd.DataFrame(confrontos, columns=["team_home", "team_away"])
+    partidas["stage"] = rng.integers(1, 10, size=len(partidas))
+    partidas.loc[(partidas["team_home"] == "Porto") | (partidas["team_away"] == "Porto"), "stage"] = np.minimum(
+        partidas["stage"], 8
+    )
+    partidas["match_api_id"] = np.arange(len(partidas))
+    partidas["season"] = "2015/2016"
+    partidas["home_team_goal"] = rng.integers(0, 4, size=len(partidas))
+    partidas["away_team_goal"] = rng.integers(0, 3, size=len(partidas))
+    return partidas
+
+
+def test_ultima_rodada_da_evolucao_igual_a_tabela(temporada):
+    # standings_evolution repete a linha de quem não joga numa rodada (Porto, na última)
+    evolucao = standings_evolution(temporada)
+    ultima = evolucao[evolucao["stage"] == evolucao["stage"].max()]
+    assert ultima["Posição"].tolist() == list(range(1, 7))
+    tabela = standings_table(temporada)
+    pdt.assert_frame_equal(ultima.drop(columns=["stage", "Posição"]).reset_index(drop=True), tabela)
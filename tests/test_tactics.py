@@ -0,0 +1,87 @@
+"""
+As-of join de ``TeamAttributeIndex`` contra ``pd.merge_asof`` (para trás, por time).
+"""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from dashboard.schema import TEAM_ATTRIBUTE_COLUMNS
+from dashboard.tactics import TeamAttributeIndex
+
+
+@pytest.fixture
+def team_attributes():
+    """Snapshots anuais de 6 times a partir de 2010 (o time 105 só a partir de 2013)."""
+    rng = np.random.default_rng(5)
+    linhas = [
+        (time, pd.Timestamp(f"{ano}-02-{10 + time % 10}"))
+        for time in range(100, 106)
+        for ano in range(2013 if time == 105 else 2010, 2016)
+    ]
+    snapshots = pd.DataFrame(linhas, columns=["team_api_id", "date"])
+    valores = rng.integers(20, 80, size=(len(snapshots), len(TEAM_ATTRIBUTE_COLUMNS))).astype("float64")
+    snapshots[TEAM_ATTRIBUTE_COLUMNS] = valores
+    return snapshots.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+@pytest.fixture
+def matches():
+    """Partidas de 2009 a 2016 entre os mesmos times (e um time sem snapshot), fora de ordem."""
+    rng = np.random.default_rng(6)
+    n = 400
+    casa = rng.integers(100, 107, size=n)
+    return pd.DataFrame({
+        "match_api_id": np.arange(n),
+        "date": pd.Timestamp("2009-06-01") + pd.to_timedelta(rng.integers(0, 7 * 365, size=n), unit="D"),
+        "home_team_api_id": casa,
+        "away_team_api_id": np.where(casa == 100, 101, 100),
+    })
+
+
+def _merge_asof(matches, team_attributes, lado):
+    """Snapshot de cada partida para ``lado`` via ``merge_asof``, na ordem original de ``matches``."""
+    esquerda = matches[["match_api_id", "date", f"{lado}_team_api_id"]].rename(
+        columns={f"{lado}_team_api_id": "team_api_id"}
+    )
+    direita = team_attributes.rename(columns={"date": "attributes_date"})
+    unidas = pd.merge_asof(
+        esquerda.sort_values("date"), direita.sort_values("attributes_date"),
+        left_on="date", right_on="attributes_date", by="team_api_id", direction="backward",
+    )
+    return unidas.set_index("match_api_id").loc[matches["match_api_id"]]
+
+
+@pytest.mark.parametrize("lado", ["home", "away"])
+def test_attach_igual_a_merge_asof(team_attributes, matches, lado):
+    resultado = TeamAttributeIndex(team_attributes).attach(matches)
+    esperado = _merge_asof(matches, team_attributes, lado)
+
+    colunas = [f"{lado}_{col}" for col in TEAM_ATTRIBUTE_COLUMNS]
+    pdt.assert_frame_equal(
+        resultado[colunas].reset_index(drop=True),
+        esperado[TEAM_ATTRIBUTE_COLUMNS].astype("float32").set_axis(colunas, axis=1).reset_index(drop=True),
+    )
+    np.testing.assert_array_equal(
+        resultado[f"{lado}_attributes_date"].to_numpy(), esperado["attributes_date"].to_numpy(),
+    )
+
+
+def test_antes_do_primeiro_snapshot(team_attributes):
+    index = TeamAttributeIndex(team_attributes)
+    primeiro = team_attributes.loc[team_attributes["team_api_id"] == 105, "date"].min()
+    datas = pd.Series([primeiro - pd.Timedelta(days=1), primeiro, pd.NaT])
+    np.testing.assert_array_equal(index.lookup([105, 105, 105], datas) >= 0, [False, True, False])
+    # Time sem nenhum snapshot
+    assert index.lookup([999], [primeiro])[0] == -1
+
+    partidas = pd.DataFrame({
+        "date": [primeiro - pd.Timedelta(days=1)],
+        "home_team_api_id": [105],
+        "away_team_api_id": [100],
+    })
+    unidas = index.attach(partidas)
+    assert unidas[[f"home_{col}" for col in TEAM_ATTRIBUTE_COLUMNS]].isna().all(axis=None)
+    assert pd.isna(unidas.loc[0, "home_attributes_date"])
+    assert unidas[[f"away_{col}" for col in TEAM_ATTRIBUTE_COLUMNS]].notna().all(axis=None)
@@ -0,0 +1,56 @@
+"""
+Redução das séries do histórico (``dashboard.timeseries``): LTTB e o formato
+longo por atributo.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.timeseries import MAX_POINTS, downsample_history, lttb
+
+
+@pytest.fixture
+def serie():
+    """500 pontos em intervalos irregulares, com um pico isolado no meio."""
+    rng = np.random.default_rng(3)
+    x = np.cumsum(rng.integers(1, 30, size=500)).astype("float64")
+    y = 70 + rng.normal(0, 1, size=500)
+    y[250] = 95
+    return x, y
+
+
+@pytest.mark.parametrize("n", [3, 10, MAX_POINTS, 499])
+def test_lttb_mantem_extremos_e_limite(serie, n):
+    x, y = serie
+    posicoes = lttb(x, y, n)
+    assert len(posicoes) <= n
+    assert posicoes[0] == 0 and posicoes[-1] == len(x) - 1
+    assert (np.diff(posicoes) > 0).all()
+
+
+def test_lttb_mantem_pico(serie):
+    x, y = serie
+    assert 250 in lttb(x, y, MAX_POINTS)
+
+
+@pytest.mark.parametrize("tamanho", [1, 2, 30, MAX_POINTS])
+def test_lttb_serie_curta_inalterada(tamanho):
+    x = np.arange(tamanho, dtype="float64")
+    y = np.sin(x)
+    np.testing.assert_array_equal(lttb(x, y, MAX_POINTS), np.arange(tamanho))
+
+
+def test_downsample_history_por_atributo():
+    datas = pd.date_range("2007-01-01", "2016-06-01", freq="7D")
+    history = pd.DataFrame({
+        "date": datas,
+        "overall_rating": np.linspace(60, 85, len(datas)),
+        "potential": np.r_[np.full(len(datas) - 10, np.nan), np.full(10, 88.0)],
+    })
+    longo = downsample_history(history, ["overall_rating", "potential"], max_points=20)
+    contagem = longo.groupby("Atributo").size()
+    assert contagem["overall_rating"] == 20
+    # Só os meses com valor entram na série, curta demais para ser reduzida
+    assert contagem["potential"] == history.loc[history["potential"].notna(), "date"].dt.to_period("M").nunique()
+    assert longo.loc[longo["Atributo"] == "overall_rating", "date"].iloc[-1] == pd.Timestamp("2016-05-01")